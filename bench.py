@@ -0,0 +1,282 @@
+"""Набор замеров производительности без GUI.
+
+Для лабиринтов из репозитория и сгенерированных карт (с фиксированным
+зерном) замеряет загрузку и сохранение в обоих форматах, поиск (время,
+раскрытые узлы в секунду, пиковая память) и полную перерисовку карты
+в offscreen-режиме Qt. Результат пишется в JSON, чтобы сравнивать
+коммиты между собой:
+
+    python bench.py --output before.json
+    python bench.py --output after.json --compare before.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from maze import (
+    BINARY_SUFFIX,
+    ENGINES,
+    GENERATORS,
+    GridModel,
+    generate,
+    read_maze,
+    solve,
+    write_maze,
+)
+
+BUNDLED_MAZES = ("labirint.txt", "labirint_66x66.txt", "maze.txt")
+DEFAULT_SIZES = (100, 500, 1000, 2000, 4000)
+# Ширина карты в пикселях при замере перерисовки (размер клетки подбирается)
+REPAINT_WIDTH = 2048
+
+
+def best_of(repeat, func):
+    """Минимальное время из repeat запусков и результат последнего"""
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+# --- ЗАМЕРЫ ---
+def bench_io(grid, workdir, repeat):
+    """Сохранение и загрузка в текстовом и двоичном форматах"""
+    record = {}
+    for fmt, suffix in (("text", ".txt"), ("binary", BINARY_SUFFIX)):
+        path = os.path.join(workdir, "bench" + suffix)
+        save, _ = best_of(repeat, lambda: write_maze(grid, path))
+        load, _ = best_of(repeat, lambda: read_maze(path))
+        record[f"save_{fmt}_ms"] = ms(save)
+        record[f"load_{fmt}_ms"] = ms(load)
+        record[f"{fmt}_bytes"] = os.path.getsize(path)
+    return record
+
+
+def bench_solve(grid, algorithm, diagonal, repeat):
+    """Поиск от сброса сетки до результата; память - отдельным запуском"""
+
+    def run():
+        grid.reset_search()
+        return solve(grid, algorithm, diagonal=diagonal)
+
+    elapsed, result = best_of(repeat, run)
+
+    # tracemalloc замедляет поиск, поэтому пик памяти меряем отдельно
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "found": result.found,
+        "length": result.length,
+        "expanded": result.expanded,
+        "solve_ms": ms(elapsed),
+        "search_ms": ms(result.elapsed),
+        "prep_ms": ms(result.prep_time),
+        "expansions_per_sec": round(result.expanded / elapsed) if elapsed else 0,
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+class Repainter:
+    """Полная перерисовка карты виджетом из main.py на offscreen-платформе"""
+
+    def __init__(self):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt6.QtGui import QImage
+        from PyQt6.QtWidgets import QApplication
+
+        import main
+
+        self.app = QApplication.instance() or QApplication([])
+        self.QImage = QImage
+        self.main = main
+
+    def bench(self, grid, repeat):
+        cell_size = max(1, min(8, REPAINT_WIDTH // max(grid.rows, grid.cols)))
+        widget = self.main.GridMapWidget(grid, cell_size)
+        image = self.QImage(widget.size(), self.QImage.Format.Format_RGB32)
+
+        def repaint():
+            widget.refresh()
+            widget.render(image)
+
+        elapsed, _ = best_of(repeat, repaint)
+        return {"cell_size": cell_size, "repaint_ms": ms(elapsed)}
+
+
+# --- НАБОР КАРТ ---
+def iter_mazes(args):
+    """(имя, GridModel) для лабиринтов из репозитория и сгенерированных карт"""
+    if not args.no_bundled:
+        for maze_file in BUNDLED_MAZES:
+            yield maze_file, read_maze(maze_file)
+    for size in args.sizes:
+        grid = GridModel(size, size)
+        t0 = time.perf_counter()
+        generate(grid, args.generator, args.seed)
+        print(
+            f"  сгенерировано {args.generator} {size}x{size} "
+            f"за {time.perf_counter() - t0:.2f} с",
+            file=sys.stderr,
+        )
+        yield f"{args.generator}-{size}-seed{args.seed}", grid
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(args):
+    try:
+        repainter = None if args.no_repaint else Repainter()
+    except ImportError as e:
+        print(f"Перерисовка не замеряется: {e}", file=sys.stderr)
+        repainter = None
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, grid in iter_mazes(args):
+            print(f"{name} ({grid.rows}x{grid.cols})", file=sys.stderr)
+            base = {"maze": name, "rows": grid.rows, "cols": grid.cols}
+            results.append({**base, "case": "io", **bench_io(grid, workdir, 3)})
+            for algorithm in args.algorithms:
+                record = bench_solve(grid, algorithm, args.diagonal, args.repeat)
+                results.append(
+                    {**base, "case": "solve", "algorithm": algorithm, **record}
+                )
+            if repainter is not None:
+                record = repainter.bench(grid, args.repeat)
+                results.append({**base, "case": "repaint", **record})
+
+    return {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "diagonal": args.diagonal,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+
+# --- ВЫВОД ---
+# Главная метрика каждого вида замера (для сравнения с прошлым прогоном)
+KEY_METRICS = {
+    "io": "load_binary_ms",
+    "solve": "solve_ms",
+    "repaint": "repaint_ms",
+}
+
+
+def case_key(record):
+    return record["case"], record["maze"], record.get("algorithm")
+
+
+def print_report(report, baseline=None):
+    old = {}
+    if baseline is not None:
+        old = {case_key(r): r for r in baseline["results"]}
+
+    for record in report["results"]:
+        metric = KEY_METRICS[record["case"]]
+        value = record[metric]
+        label = record.get("algorithm") or record["case"]
+        line = f"{record['maze']:28} {label:14} {metric:16} {value:>10.2f}"
+        if record["case"] == "solve":
+            line += (
+                f"  {record['expansions_per_sec']:>9} узл/с {record['peak_kb']:>9} КБ"
+            )
+        prev = old.get(case_key(record))
+        if prev is not None and prev.get(metric):
+            line += f"  ({value / prev[metric]:.2f}x к прошлому)"
+        print(line)
+
+
+def parse_sizes(text):
+    return [int(part) for part in text.split(",") if part.strip()]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Замеры производительности")
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="JSON с результатами (по умолчанию bench-<коммит>.json)",
+    )
+    parser.add_argument("--compare", help="JSON прошлого прогона для сравнения")
+    parser.add_argument(
+        "--sizes",
+        type=parse_sizes,
+        default=list(DEFAULT_SIZES),
+        help="стороны сгенерированных карт через запятую",
+    )
+    parser.add_argument(
+        "--generator", choices=list(GENERATORS), default="prim", help="генератор карт"
+    )
+    parser.add_argument("--seed", type=int, default=1, help="зерно генератора")
+    parser.add_argument(
+        "--algorithm",
+        dest="algorithms",
+        action="append",
+        choices=sorted(ENGINES),
+        help="алгоритм (можно несколько раз, по умолчанию - astar)",
+    )
+    parser.add_argument(
+        "--diagonal", action="store_true", help="разрешить ходы по диагонали"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="повторов замера")
+    parser.add_argument(
+        "--no-bundled", action="store_true", help="без лабиринтов из репозитория"
+    )
+    parser.add_argument(
+        "--no-repaint", action="store_true", help="не замерять перерисовку"
+    )
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.algorithms = args.algorithms or ["astar"]
+
+    report = run_suite(args)
+    output = args.output or f"bench-{report['meta']['revision'] or 'local'}.json"
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    print(f"Результаты записаны в {output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,29 +1,92 @@
-import heapq
 import json
 import os
-import random
 import sys
+import threading
+import time
+from array import array
 
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
-from PyQt6.QtGui import QColor, QPainter, QPen
+from PyQt6.QtCore import QObject, QRect, QSize, Qt, QThread, QTimer, pyqtSignal
+from PyQt6.QtGui import QColor, QImage, QPainter, QPen, QPixmap
 from PyQt6.QtWidgets import (
     QApplication,
+    QCheckBox,
+    QComboBox,
     QFileDialog,
     QHBoxLayout,
     QLabel,
+    QLineEdit,
     QMainWindow,
     QMessageBox,
     QPushButton,
+    QScrollArea,
+    QSlider,
     QVBoxLayout,
     QWidget,
 )
 
+from maze import (
+    BACKTRACKER_MAX_CELLS,
+    BINARY_SUFFIX,
+    CLOSED,
+    CLOSED_REV,
+    EMPTY,
+    END,
+    ENGINE_TITLES,
+    GENERATOR_TITLES,
+    OPEN,
+    OPEN_REV,
+    PATH,
+    START,
+    STATE_NAMES,
+    WALL,
+    TRACE_SUFFIX,
+    ComponentIndex,
+    DistanceField,
+    GridModel,
+    HPAGraph,
+    LandmarkTable,
+    LPAStar,
+    PathCache,
+    RemoteSolver,
+    SearchStats,
+    SearchTrace,
+    TracePlayer,
+    WallHash,
+    generate,
+    landmarks_path,
+    profile_call,
+    read_maze,
+    solve,
+    write_maze,
+)
+
 # --- ЗАГРУЗКА КОНФИГУРАЦИИ ---
 CONFIG_FILE = "config.json"
 
 DEFAULT_CONFIG = {
-    "grid": {"rows": 100, "cols": 100, "cell_size": 8},
-    "simulation": {"delay_ms": 1, "wall_density": 0.3},
+    "grid": {
+        "rows": 100,
+        "cols": 100,
+        "cell_size": 8,
+        "grid_lines_min_cell_size": 4,
+    },
+    "simulation": {
+        "delay_ms": 1,
+        "wall_density": 0.3,
+        "frame_rate": 60,
+        "cells_per_frame": 50,
+    },
+    "search": {
+        "algorithm": "astar",
+        "diagonal": False,
+        "cluster_size": 16,
+        "process": False,
+        "landmarks": 8,
+        "landmark_placement": "farthest",
+    },
+    "generator": {"algorithm": "noise", "seed": None},
+    "cache": {"enabled": True, "max_entries": 64, "max_path_cells": 1000000},
+    "stats": {"log_file": None, "profile_file": "profile.txt"},
     "colors": {
         "empty": [255, 255, 255],
         "wall": [33, 33, 33],
@@ -32,6 +95,8 @@ DEFAULT_CONFIG = {
         "open": [165, 214, 167],
         "closed": [239, 154, 154],
         "path": [156, 39, 176],
+        "open_rev": [144, 202, 249],
+        "closed_rev": [100, 181, 246],
     },
 }
 
@@ -56,261 +121,679 @@ cfg = load_config()
 DEFAULT_ROWS = cfg["grid"]["rows"]
 DEFAULT_COLS = cfg["grid"]["cols"]
 CELL_SIZE = cfg["grid"]["cell_size"]
+# Линии сетки не рисуем, если клетка меньше этого размера в пикселях
+GRID_LINES_MIN_CELL = cfg["grid"].get("grid_lines_min_cell_size", 4)
 DELAY_MS = cfg["simulation"]["delay_ms"]
 WALL_DENSITY = cfg["simulation"]["wall_density"]
+# Частота кадров воспроизведения трассы и скорость анимации
+FRAME_RATE = cfg["simulation"].get("frame_rate", 60)
+CELLS_PER_FRAME = cfg["simulation"].get("cells_per_frame", 50)
+# Скорость воспроизведения при x1: событий поиска и клеток пути в секунду
+PLAYBACK_RATE = FRAME_RATE * CELLS_PER_FRAME
+PATH_RATE = 1000 / max(1, DELAY_MS * 5)
+PLAYBACK_SPEEDS = (0.25, 1, 4, 16, 100)
+# Алгоритм поиска по умолчанию (ключ из maze.ENGINES) и 8-связность
+SEARCH_CFG = cfg.get("search", DEFAULT_CONFIG["search"])
+ALGORITHM = SEARCH_CFG.get("algorithm", "astar")
+DIAGONAL = SEARCH_CFG.get("diagonal", False)
+# Размер кластера HPA* в клетках
+CLUSTER_SIZE = SEARCH_CFG.get("cluster_size", 16)
+# Искать в отдельном процессе (иначе - в потоке QThread)
+SEARCH_PROCESS = SEARCH_CFG.get("process", False)
+# Число ориентиров ALT и их расстановка (farthest или border)
+LANDMARKS = SEARCH_CFG.get("landmarks", 8)
+LANDMARK_PLACEMENT = SEARCH_CFG.get("landmark_placement", "farthest")
+# Генератор карты (ключ из maze.GENERATORS) и зерно (None - случайное)
+GENERATOR_CFG = {**DEFAULT_CONFIG["generator"], **cfg.get("generator", {})}
+# Журнал статистики запусков (JSONL, None - не писать) и файл отчета cProfile
+STATS_CFG = {**DEFAULT_CONFIG["stats"], **cfg.get("stats", {})}
+# Кэш найденных путей: число записей и суммарная длина хранимых путей
+CACHE_CFG = {**DEFAULT_CONFIG["cache"], **cfg.get("cache", {})}
 
 # Преобразуем списки цветов [R, G, B] в объекты QColor
+# (цвета, которых нет в config.json, берутся из настроек по умолчанию)
 COLORS = {}
-for key, val in cfg["colors"].items():
+for key, val in {**DEFAULT_CONFIG["colors"], **cfg["colors"]}.items():
     COLORS[key] = QColor(*val)
 
+# Цвет по коду состояния клетки (индексы совпадают со STATE_NAMES)
+STATE_COLORS = [COLORS.get(name, COLORS["empty"]) for name in STATE_NAMES]
 
-# --- МОДЕЛЬ ДАННЫХ (NODE) ---
-class Node:
-    def __init__(self, row, col):
-        self.row = row
-        self.col = col
-        self.is_wall = False
-        self.state = "empty"  # empty, open, closed, path, start, end
-        self.g_cost = float("inf")
-        self.h_cost = 0
-        self.parent = None
+
+# Фильтр диалогов открытия и сохранения (формат выбирается по расширению)
+MAZE_FILE_FILTER = (
+    f"Лабиринты (*.txt *{BINARY_SUFFIX});;Text Files (*.txt);;"
+    f"Двоичные лабиринты (*{BINARY_SUFFIX});;All Files (*)"
+)
+TRACE_FILE_FILTER = f"Трассы поиска (*{TRACE_SUFFIX});;All Files (*)"
+
+
+# --- РЕНДЕРЕР КАРТЫ ---
+# Масштабы карты (пикселей экрана на клетку). Меньше 1 - в один пиксель
+# сводится блок клеток (уровень детализации)
+ZOOM_LEVELS = (1 / 32, 1 / 16, 1 / 8, 1 / 4, 1 / 2, 1, 2, 3, 4, 6, 8, 12, 16, 24, 32)
+# Сторона плитки изображения (в пикселях изображения) для ленивого обновления
+RENDER_TILE = 64
+
+# При сведении блока клеток в пиксель каждому состоянию сопоставлен бит:
+# OR битов блока и старший бит результата дают самое заметное состояние
+# (путь и концы пути важнее фронта поиска, фронт - закрытых клеток и стен)
+_LOD_ORDER = (WALL, CLOSED, CLOSED_REV, OPEN, OPEN_REV, PATH, START, END)
+_STATE_BITS = bytes(
+    1 << _LOD_ORDER.index(code) if code in _LOD_ORDER else 0 for code in range(256)
+)
+_BITS_STATE = bytes(_LOD_ORDER[b.bit_length() - 1] if b else EMPTY for b in range(256))
+
+# Палитра тепловой карты: 0 - прозрачно, 1..255 - от красного (у цели) к синему
+HEAT_COLORS = [0] + [
+    QColor.fromHsv(round(240 * (k - 1) / 254), 255, 255, 150).rgba()
+    for k in range(1, 256)
+]
+
+
+class GridRenderer:
+    """Копия состояний клеток в палитровом QImage.
+
+    При масштабе от 1 пикселя на клетку пиксель изображения - одна клетка,
+    при меньшем - блок factor x factor клеток. Изображение обновляется
+    лениво, плитками RENDER_TILE x RENDER_TILE: изменения клеток только
+    помечают пиксели, а пересчитываются они при отрисовке видимой плитки,
+    так что изменения за пределами экрана ждут, пока их не прокрутят в
+    поле зрения. Карта рисуется одним масштабированным drawImage, линии
+    сетки - закэшированной плиткой поверх него.
+    """
+
+    def __init__(self, grid, zoom):
+        self.grid = grid
+        # Слой тепловой карты поверх клеток (QImage, 1 пиксель = 1 клетка)
+        self.overlay = None
+        self.set_zoom(zoom)
+
+    @staticmethod
+    def make_grid_tile(cell_size):
+        """Плитка с линиями сетки для одной клетки (None - сетку не рисуем)"""
+        if cell_size < GRID_LINES_MIN_CELL:
+            return None
+        tile = QPixmap(cell_size, cell_size)
+        tile.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(tile)
+        painter.setPen(QPen(QColor(220, 220, 220), 1))
+        painter.drawLine(0, 0, cell_size - 1, 0)
+        painter.drawLine(0, 0, 0, cell_size - 1)
+        painter.end()
+        return tile
+
+    def set_zoom(self, zoom):
+        self.zoom = zoom
+        # Клеток на пиксель изображения и экранных пикселей на пиксель изображения
+        self.factor = max(1, round(1 / zoom))
+        self.cell_size = max(1, round(zoom))
+        # При сведении клеток линии сетки не рисуем
+        self.grid_tile = (
+            self.make_grid_tile(self.cell_size) if self.factor == 1 else None
+        )
+        self._allocate()
 
     @property
-    def f_cost(self):
-        return self.g_cost + self.h_cost
+    def scale(self):
+        """Экранных пикселей на клетку"""
+        return self.cell_size / self.factor
+
+    def set_grid(self, grid):
+        self.grid = grid
+        self.overlay = None
+        self._allocate()
+
+    def _allocate(self):
+        """Изображение и плитки под текущие карту и масштаб"""
+        grid = self.grid
+        f = self.factor
+        self.width = -(-grid.cols // f)
+        self.height = -(-grid.rows // f)
+        self.image = QImage(self.width, self.height, QImage.Format.Format_Indexed8)
+        self.image.setColorTable([color.rgb() for color in STATE_COLORS])
+        self.tiles_x = -(-self.width // RENDER_TILE)
+        self.tiles_y = -(-self.height // RENDER_TILE)
+        self.rebuild()
+
+    def pixel_size(self):
+        """Размер карты на экране в пикселях (ширина, высота)"""
+        return self.width * self.cell_size, self.height * self.cell_size
+
+    def pixels(self):
+        """Буфер пикселей изображения (байт на пиксель, строки выровнены)"""
+        return self._image_buffer(self.image)
+
+    @staticmethod
+    def _image_buffer(image):
+        ptr = image.bits()
+        ptr.setsize(image.sizeInBytes())
+        return memoryview(ptr)
+
+    def set_overlay(self, levels):
+        """Тепловая карта: байт на клетку (индекс HEAT_COLORS), None - убрать"""
+        if levels is None:
+            self.overlay = None
+            return
+        grid = self.grid
+        self.overlay = QImage(grid.cols, grid.rows, QImage.Format.Format_Indexed8)
+        self.overlay.setColorTable(HEAT_COLORS)
+        buf = self._image_buffer(self.overlay)
+        stride = self.overlay.bytesPerLine()
+        cols = grid.cols
+        for r in range(grid.rows):
+            buf[r * stride : r * stride + cols] = levels[r * cols : (r + 1) * cols]
+
+    def set_overlay_cells(self, indices, levels):
+        """Переписывает уровни тепловой карты для клеток indices"""
+        if self.overlay is None:
+            return
+        buf = self._image_buffer(self.overlay)
+        stride = self.overlay.bytesPerLine()
+        cols = self.grid.cols
+        for i, level in zip(indices, levels):
+            r, c = divmod(i, cols)
+            buf[r * stride + c] = level
+
+    def rebuild(self):
+        """Помечает все изображение устаревшим (после массового изменения grid.state)"""
+        self.stale = set(range(self.tiles_x * self.tiles_y))
+        # Плитка -> множество устаревших пикселей (y * width + x)
+        self.dirty = {}
+
+    def set_cells(self, indices):
+        """Помечает пиксели изменившихся клеток для пересчета при отрисовке"""
+        if len(indices) > self.width * self.height // 4:
+            self.rebuild()
+            return
+        cols, f, width = self.grid.cols, self.factor, self.width
+        tiles_x, stale, dirty = self.tiles_x, self.stale, self.dirty
+        for i in indices:
+            r, c = divmod(i, cols)
+            y, x = r // f, c // f
+            t = (y // RENDER_TILE) * tiles_x + x // RENDER_TILE
+            if t not in stale:
+                pending = dirty.get(t)
+                if pending is None:
+                    pending = dirty[t] = set()
+                pending.add(y * width + x)
+
+    def _fill(self, buf, stride, y, x0, x1):
+        """Пересчитывает пиксели [x0, x1) строки y изображения из grid.state"""
+        grid = self.grid
+        cols, f = grid.cols, self.factor
+        state = grid.state
+        if f == 1:
+            buf[y * stride + x0 : y * stride + x1] = state[
+                y * cols + x0 : y * cols + x1
+            ]
+            return
+        c0, c1 = x0 * f, min(x1 * f, cols)
+        # Сначала OR по строкам блока, затем по столбцам (срезы с шагом f)
+        bits = 0
+        for r in range(y * f, min((y + 1) * f, grid.rows)):
+            row = state[r * cols + c0 : r * cols + c1]
+            bits |= int.from_bytes(row.translate(_STATE_BITS), "little")
+        row = bits.to_bytes(c1 - c0, "little")
+        bits = 0
+        for k in range(f):
+            bits |= int.from_bytes(row[k::f], "little")
+        out = bits.to_bytes(x1 - x0, "little").translate(_BITS_STATE)
+        buf[y * stride + x0 : y * stride + x1] = out
+
+    def _update_tile(self, t, buf, stride):
+        ty, tx = divmod(t, self.tiles_x)
+        if t in self.stale:
+            self.stale.discard(t)
+            self.dirty.pop(t, None)
+            x0 = tx * RENDER_TILE
+            x1 = min(x0 + RENDER_TILE, self.width)
+            y0 = ty * RENDER_TILE
+            for y in range(y0, min(y0 + RENDER_TILE, self.height)):
+                self._fill(buf, stride, y, x0, x1)
+            return
+        for p in self.dirty.pop(t, ()):
+            y, x = divmod(p, self.width)
+            self._fill(buf, stride, y, x, x + 1)
+
+    def draw(self, painter, rect):
+        """Рисует клетки, попадающие в rect (в пикселях виджета)"""
+        size = self.cell_size
+        start_y = max(0, rect.top() // size)
+        end_y = min(self.height, rect.bottom() // size + 1)
+        start_x = max(0, rect.left() // size)
+        end_x = min(self.width, rect.right() // size + 1)
+        if start_y >= end_y or start_x >= end_x:
+            return
 
-    def __lt__(self, other):
-        if self.f_cost == other.f_cost:
-            return self.h_cost < other.h_cost
-        return self.f_cost < other.f_cost
+        # Досчитываем только видимые плитки
+        if self.stale or self.dirty:
+            buf = self.pixels()
+            stride = self.image.bytesPerLine()
+            for ty in range(start_y // RENDER_TILE, (end_y - 1) // RENDER_TILE + 1):
+                for tx in range(start_x // RENDER_TILE, (end_x - 1) // RENDER_TILE + 1):
+                    t = ty * self.tiles_x + tx
+                    if t in self.stale or t in self.dirty:
+                        self._update_tile(t, buf, stride)
+
+        w, h = end_x - start_x, end_y - start_y
+        target = QRect(start_x * size, start_y * size, w * size, h * size)
+        painter.drawImage(target, self.image, QRect(start_x, start_y, w, h))
+        if self.overlay is not None:
+            # Слой хранится по клеткам: при сведении клеток Qt его просто уменьшает
+            f, grid = self.factor, self.grid
+            cw = min(w * f, grid.cols - start_x * f)
+            ch = min(h * f, grid.rows - start_y * f)
+            painter.drawImage(
+                QRect(target.x(), target.y(), cw * size // f, ch * size // f),
+                self.overlay,
+                QRect(start_x * f, start_y * f, cw, ch),
+            )
+        if self.grid_tile is not None:
+            painter.drawTiledPixmap(target, self.grid_tile)
+
+    def cells_rect(self, top, left, bottom, right):
+        """Прямоугольник виджета, покрывающий клетки в строках top..bottom, столбцах left..right"""
+        f, size = self.factor, self.cell_size
+        x0, y0 = left // f, top // f
+        return QRect(
+            x0 * size,
+            y0 * size,
+            (right // f - x0 + 1) * size,
+            (bottom // f - y0 + 1) * size,
+        )
 
-    def reset_calc(self):
-        self.g_cost = float("inf")
-        self.h_cost = 0
-        self.parent = None
-        # Не сбрасываем стены, старт и финиш при очистке пути
-        if self.state in ["open", "closed", "path"]:
-            self.state = "empty"
+    def cell_at(self, x, y):
+        """Клетка (r, c) под точкой виджета (левая верхняя клетка блока)"""
+        return (y // self.cell_size) * self.factor, (x // self.cell_size) * self.factor
 
 
 # --- ВИДЖЕТ ОТРИСОВКИ КАРТЫ (ОПТИМИЗИРОВАННЫЙ) ---
 class GridMapWidget(QWidget):
     # Сигналы для кликов (если нужно будет расширять логику)
     node_clicked = pyqtSignal(int, int)
+    # Индекс клетки, у которой изменилась стена (для инкрементальных индексов)
+    walls_edited = pyqtSignal(int)
 
-    def __init__(self, rows, cols, cell_size, nodes):
+    def __init__(self, grid, zoom):
         super().__init__()
-        self.cell_size = cell_size
-        self.update_grid_data(rows, cols, nodes)
+        self.renderer = GridRenderer(grid, zoom)
+        self.update_grid_data(grid)
 
         # Для отслеживания рисования мышью
         self.drawing_wall_mode = True
         self.last_drag_pos = None
 
-    def update_grid_data(self, rows, cols, nodes):
+    @property
+    def zoom(self):
+        return self.renderer.zoom
+
+    def set_zoom(self, zoom):
+        self.renderer.set_zoom(zoom)
+        self.resize_to_map()
+
+    def update_grid_data(self, grid):
         """Обновление размеров и ссылки на данные (для загрузки новых карт)"""
-        self.rows = rows
-        self.cols = cols
-        self.nodes = nodes
+        self.grid = grid
+        self.rows = grid.rows
+        self.cols = grid.cols
+        self.renderer.set_grid(grid)
+        self.resize_to_map()
+
+    def resize_to_map(self):
+        self.setFixedSize(*self.renderer.pixel_size())
+        self.update()
+
+    def set_overlay(self, levels):
+        """Показывает (или убирает при None) тепловую карту поверх клеток"""
+        self.renderer.set_overlay(levels)
+        self.update()
 
-        width = cols * self.cell_size
-        height = rows * self.cell_size
-        self.setFixedSize(width, height)
+    def update_overlay(self, indices, levels):
+        self.renderer.set_overlay_cells(indices, levels)
+        self.update()
+
+    def refresh(self):
+        """Полная перерисовка после массового изменения grid.state"""
+        self.renderer.rebuild()
         self.update()
 
     def paintEvent(self, event):
         painter = QPainter(self)
-        # Оптимизация: не используем антиалиасинг для четких квадратов
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
-
-        # Получаем область, которую нужно перерисовать (оптимизация partial update)
-        rect = event.rect()
-
-        # Вычисляем диапазоны индексов, попадающих в rect
-        start_r = max(0, rect.top() // self.cell_size)
-        end_r = min(self.rows, (rect.bottom() // self.cell_size) + 1)
-        start_c = max(0, rect.left() // self.cell_size)
-        end_c = min(self.cols, (rect.right() // self.cell_size) + 1)
-
-        # Рисуем только то, что изменилось или видно
-        for r in range(start_r, end_r):
-            for c in range(start_c, end_c):
-                node = self.nodes.get((r, c))
-                if node:
-                    # Выбираем цвет
-                    if node.is_wall:
-                        c_color = COLORS["wall"]
-                    elif node.state in COLORS:
-                        c_color = COLORS[node.state]
-                    else:
-                        c_color = COLORS["empty"]
-
-                    painter.fillRect(
-                        c * self.cell_size,
-                        r * self.cell_size,
-                        self.cell_size,
-                        self.cell_size,
-                        c_color,
-                    )
-
-                    # Рисуем легкую сетку (опционально, можно убрать для скорости на огромных картах)
-                    painter.setPen(QPen(QColor(220, 220, 220), 1))
-                    painter.drawRect(
-                        c * self.cell_size,
-                        r * self.cell_size,
-                        self.cell_size,
-                        self.cell_size,
-                    )
+        # Рисуем только видимую часть (в окне прокрутки - только ее и просят)
+        self.renderer.draw(painter, event.rect())
 
     def update_node(self, r, c):
         """Обновляет только конкретную клетку"""
-        self.update(
-            c * self.cell_size, r * self.cell_size, self.cell_size, self.cell_size
-        )
+        self.renderer.set_cells((self.grid.index(r, c),))
+        self.update(self.renderer.cells_rect(r, c, r, c))
+
+    def apply_batch(self, indices, states):
+        """Применяет пакет изменений и перерисовывает их одной областью"""
+        if not indices:
+            return
+        state = self.grid.state
+        for i, code in zip(indices, states):
+            state[i] = code
+        self.grid.touch(indices)
+        self.repaint_cells(indices)
+
+    def repaint_cells(self, indices):
+        """Перерисовывает клетки, состояние которых уже изменено в grid.state"""
+        if not indices:
+            return
+        self.renderer.set_cells(indices)
+
+        cols = self.cols
+        top = min(indices) // cols
+        bottom = max(indices) // cols
+        if top == bottom:
+            left = min(indices) % cols
+            right = max(indices) % cols
+        else:
+            columns = [i % cols for i in indices]
+            left, right = min(columns), max(columns)
+
+        # Qt сам отбрасывает часть области за пределами окна прокрутки
+        self.update(self.renderer.cells_rect(top, left, bottom, right))
 
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
-            r = event.pos().y() // self.cell_size
-            c = event.pos().x() // self.cell_size
-
-            if 0 <= r < self.rows and 0 <= c < self.cols:
-                node = self.nodes.get((r, c))
-                if node:
-                    # Не рисуем поверх старта и финиша
-                    if node.state in ["start", "end"]:
-                        return
-
-                    # Запоминаем режим (ставим стену или стираем)
-                    self.drawing_wall_mode = not node.is_wall
-                    self.apply_wall(r, c)
-                    self.last_drag_pos = (r, c)
+            r, c = self.renderer.cell_at(event.pos().x(), event.pos().y())
+
+            if self.grid.in_bounds(r, c):
+                i = self.grid.index(r, c)
+                # Не рисуем поверх старта и финиша
+                if self.grid.is_endpoint(i):
+                    return
+
+                # Запоминаем режим (ставим стену или стираем)
+                self.drawing_wall_mode = not self.grid.walls[i]
+                self.apply_wall(r, c)
+                self.last_drag_pos = (r, c)
 
     def mouseMoveEvent(self, event):
         if event.buttons() & Qt.MouseButton.LeftButton:
-            r = event.pos().y() // self.cell_size
-            c = event.pos().x() // self.cell_size
+            r, c = self.renderer.cell_at(event.pos().x(), event.pos().y())
 
-            if 0 <= r < self.rows and 0 <= c < self.cols:
+            if self.grid.in_bounds(r, c):
                 if (r, c) != self.last_drag_pos:
-                    node = self.nodes.get((r, c))
-                    if node and node.state not in ["start", "end"]:
+                    if not self.grid.is_endpoint(self.grid.index(r, c)):
                         self.apply_wall(r, c)
                     self.last_drag_pos = (r, c)
 
     def apply_wall(self, r, c):
-        node = self.nodes.get((r, c))
-        if node:
-            node.is_wall = self.drawing_wall_mode
-            self.update_node(r, c)
-
-
-# --- РАБОЧИЙ ПОТОК (A*) ---
-class AStarWorker(QThread):
-    # Сигнал теперь передает: row, col, state_key
-    cell_updated = pyqtSignal(int, int, str)
-    finished_signal = pyqtSignal(str)
-
-    def __init__(self, nodes, start_pos, end_pos):
-        super().__init__()
-        self.nodes = nodes
-        self.start_pos = start_pos
-        self.end_pos = end_pos
-        self.is_running = True
-
-    def run(self):
-        start_node = self.nodes.get(self.start_pos)
-        end_node = self.nodes.get(self.end_pos)
-
-        if not start_node or not end_node:
-            self.finished_signal.emit("Ошибка: нет старта или финиша!")
+        i = self.grid.index(r, c)
+        if self.grid.walls[i] == self.drawing_wall_mode:
             return
+        self.grid.set_wall(i, self.drawing_wall_mode)
+        self.update_node(r, c)
+        self.walls_edited.emit(i)
 
-        open_set = []
-        heapq.heappush(open_set, start_node)
-        open_set_hash = {start_node}
-        closed_set = set()
 
-        start_node.g_cost = 0
-        start_node.h_cost = self.heuristic(start_node, end_node)
+# --- ОКНО ПРОСМОТРА КАРТЫ ---
+class MapView(QScrollArea):
+    """Прокручиваемая область с картой; Ctrl + колесо мыши меняет масштаб"""
 
-        while open_set:
-            if not self.is_running:
-                return
-
-            current = heapq.heappop(open_set)
-            if current in open_set_hash:
-                open_set_hash.remove(current)
-
-            closed_set.add(current)
+    zoom_changed = pyqtSignal(float)
 
-            # Визуализация closed
-            if (current.row, current.col) != self.start_pos and (
-                current.row,
-                current.col,
-            ) != self.end_pos:
-                self.cell_updated.emit(current.row, current.col, "closed")
-                # Чем меньше задержка, тем плавнее на больших картах
-                if len(closed_set) % 5 == 0:  # Оптимизация: sleep не каждый шаг
-                    self.msleep(1)
+    def __init__(self, map_widget):
+        super().__init__()
+        self.map_widget = map_widget
+        self.setWidget(map_widget)
+        self.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+    def sizeHint(self):
+        # Небольшая карта видна целиком, большая - не шире 80% экрана
+        frame = 2 * self.frameWidth()
+        size = self.map_widget.size() + QSize(frame, frame)
+        screen = self.screen().availableGeometry()
+        return size.boundedTo(
+            QSize(int(screen.width() * 0.8), int(screen.height() * 0.7))
+        )
 
-            if current == end_node:
-                self.reconstruct_path(end_node)
-                return
+    def wheelEvent(self, event):
+        if event.modifiers() & Qt.KeyboardModifier.ControlModifier:
+            steps = 1 if event.angleDelta().y() > 0 else -1
+            self.zoom_by(steps, event.position().toPoint())
+            event.accept()
+            return
+        super().wheelEvent(event)
+
+    def zoom_by(self, steps, anchor=None):
+        """Сдвиг на steps ступеней ZOOM_LEVELS"""
+        zoom = self.map_widget.zoom
+        k = min(range(len(ZOOM_LEVELS)), key=lambda n: abs(ZOOM_LEVELS[n] - zoom))
+        k = max(0, min(len(ZOOM_LEVELS) - 1, k + steps))
+        self.set_zoom(ZOOM_LEVELS[k], anchor)
+
+    def set_zoom(self, zoom, anchor=None):
+        """Меняет масштаб; клетка под точкой anchor окна просмотра остается на месте"""
+        if anchor is None:
+            anchor = self.viewport().rect().center()
+        widget = self.map_widget
+        old_scale = widget.renderer.scale
+        point = widget.mapFrom(self.viewport(), anchor)
+        cell_x, cell_y = point.x() / old_scale, point.y() / old_scale
+
+        widget.set_zoom(zoom)
+        scale = widget.renderer.scale
+        self.horizontalScrollBar().setValue(round(cell_x * scale - anchor.x()))
+        self.verticalScrollBar().setValue(round(cell_y * scale - anchor.y()))
+        self.zoom_changed.emit(zoom)
+
+    def fit(self):
+        """Наибольший масштаб, при котором карта помещается в окно целиком"""
+        view = self.viewport().size()
+        grid = self.map_widget.grid
+        fitting = [
+            z
+            for z in ZOOM_LEVELS
+            if grid.cols * z <= view.width() and grid.rows * z <= view.height()
+        ]
+        self.set_zoom(fitting[-1] if fitting else ZOOM_LEVELS[0])
+
+    def fit_if_larger(self):
+        """Вписывает карту в окно, если при текущем масштабе она не помещается"""
+        view = self.viewport().size()
+        w, h = self.map_widget.renderer.pixel_size()
+        if w > view.width() or h > view.height():
+            self.fit()
 
-            for neighbor in self.get_neighbors(current):
-                if neighbor in closed_set:
-                    continue
 
-                temp_g = current.g_cost + 1  # Вес ребра = 1
+# --- РАБОЧИЙ ПОТОК (A*) ---
+class AStarWorker(QThread):
+    """Запускает выбранный алгоритм из maze в отдельном потоке.
 
-                if temp_g < neighbor.g_cost:
-                    neighbor.parent = current
-                    neighbor.g_cost = temp_g
-                    neighbor.h_cost = self.heuristic(neighbor, end_node)
+    Поиск идет на полной скорости: события клеток только записываются
+    в SearchTrace, а анимацию потом проигрывает TracePlayer в GUI.
+    """
 
-                    if neighbor not in open_set_hash:
-                        heapq.heappush(open_set, neighbor)
-                        open_set_hash.add(neighbor)
+    finished_signal = pyqtSignal(str)
+    # Итоговый SearchResult (статистика для строки состояния)
+    result_ready = pyqtSignal(object)
+    # Записанная трасса поиска (события клеток и путь)
+    trace_ready = pyqtSignal(object)
+    # SearchStats запуска
+    stats_ready = pyqtSignal(object)
+
+    def __init__(
+        self,
+        grid,
+        algorithm="astar",
+        diagonal=False,
+        max_speed=False,
+        hierarchy=None,
+        profile=False,
+        landmarks=None,
+    ):
+        super().__init__()
+        self.grid = grid
+        self.algorithm = algorithm
+        self.diagonal = diagonal
+        self.max_speed = max_speed
+        # Готовый HPAGraph: кластеры, построенные прошлыми запусками, не строятся заново
+        self.hierarchy = hierarchy
+        # Таблицы ориентиров ALT для этой карты (None - построить в потоке)
+        self.landmarks = landmarks
+        # Один запуск под cProfile (отчет пишется в stats.profile_file)
+        self.profile = profile
+        # Отмена: cancel() из GUI, движок проверяет should_stop()
+        self.cancelled = threading.Event()
+        self.trace = SearchTrace.for_grid(grid)
 
-                        # Визуализация open
-                        if (neighbor.row, neighbor.col) != self.end_pos:
-                            self.cell_updated.emit(neighbor.row, neighbor.col, "open")
+    def run(self):
+        # В режиме максимальной скорости записываем только итоговый путь
+        listener = None if self.max_speed else self.trace
+        report = None
+        if self.profile:
+            result, report = profile_call(self.search, listener)
+        else:
+            result = self.search(listener)
+        if result is not None:
+            publish_result(self, result, report)
+
+    def search(self, listener):
+        if self.hierarchy is not None:
+            return self.hierarchy.search(listener, self.should_stop)
+        if self.algorithm == "alt":
+            return self.search_landmarks(listener)
+        return solve(
+            self.grid, self.algorithm, listener, self.should_stop, self.diagonal
+        )
 
-        self.finished_signal.emit("Путь не найден!")
+    def search_landmarks(self, listener):
+        prep_time = 0.0
+        if self.landmarks is None:
+            self.landmarks = LandmarkTable.build(
+                self.grid, LANDMARKS, self.diagonal, LANDMARK_PLACEMENT
+            )
+            prep_time = self.landmarks.build_time
+        result = self.landmarks.search(self.grid, listener, self.should_stop)
+        if result is not None:
+            result.prep_time = prep_time
+        return result
 
-    def heuristic(self, node_a, node_b):
-        # Манхэттенское расстояние
-        return abs(node_a.row - node_b.row) + abs(node_a.col - node_b.col)
+    def should_stop(self):
+        return self.cancelled.is_set()
 
-    def get_neighbors(self, node):
-        neighbors = []
-        for dr, dc in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-            r, c = node.row + dr, node.col + dc
-            if (r, c) in self.nodes:
-                n = self.nodes[(r, c)]
-                if not n.is_wall:
-                    neighbors.append(n)
-        return neighbors
+    def cancel(self):
+        self.cancelled.set()
 
-    def reconstruct_path(self, end_node):
-        path_nodes = []
-        curr = end_node
-        while curr:
-            path_nodes.append(curr)
-            curr = curr.parent
-        path_nodes.reverse()
 
-        steps = max(0, len(path_nodes) - 1)
+class ProcessWorker(QObject):
+    """Тот же интерфейс, что у AStarWorker, но поиск идет в отдельном процессе.
 
-        for node in path_nodes:
-            if not self.is_running:
-                break
-            if (node.row, node.col) not in [self.start_pos, self.end_pos]:
-                self.cell_updated.emit(node.row, node.col, "path")
-                self.msleep(DELAY_MS * 5)
+    Дочерний процесс (maze.RemoteSolver) не делит GIL с GUI: поток GUI
+    только забирает по таймеру готовые пачки событий из канала, поэтому
+    отрисовка идет с полной частотой кадров при поиске любой длины.
+    Пачки дописываются в трассу, и с первой же пачки она отдается
+    сигналом trace_ready (как у AStarWorker по окончании): GUI проигрывает
+    поиск, пока тот еще идет.
+    """
 
-        self.finished_signal.emit(f"Готово! Путь: {steps} шагов")
+    finished_signal = pyqtSignal(str)
+    result_ready = pyqtSignal(object)
+    trace_ready = pyqtSignal(object)
+    stats_ready = pyqtSignal(object)
+    # Число событий, полученных от дочернего процесса
+    progress = pyqtSignal(int)
+
+    def __init__(
+        self,
+        solver,
+        grid,
+        algorithm="astar",
+        diagonal=False,
+        max_speed=False,
+        profile=False,
+        walls_key=None,
+    ):
+        super().__init__()
+        self.solver = solver
+        self.grid = grid
+        self.algorithm = algorithm
+        self.diagonal = diagonal
+        self.max_speed = max_speed
+        self.profile = profile
+        self.walls_key = walls_key
+        self.trace = SearchTrace.for_grid(grid)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(max(1, round(1000 / FRAME_RATE)))
+        self.timer.timeout.connect(self.receive)
+
+    def start(self):
+        self.solver.submit(
+            self.grid,
+            self.algorithm,
+            self.diagonal,
+            record=not self.max_speed,
+            profile=self.profile,
+            cluster_size=CLUSTER_SIZE,
+            walls_key=self.walls_key,
+            landmarks=LANDMARKS,
+            placement=LANDMARK_PLACEMENT,
+        )
+        self.timer.start()
+
+    def isRunning(self):
+        return self.timer.isActive()
+
+    def cancel(self):
+        self.solver.cancel()
+
+    def wait(self, timeout=5.0):
+        """Дожидается ответа дочернего процесса (после cancel - подтверждения).
+
+        Если ответа нет и за timeout секунд, процесс решателя завершается:
+        следующий запуск создаст новый (см. AStarApp.start_thread).
+        """
+        deadline = time.perf_counter() + timeout
+        while self.isRunning() and time.perf_counter() < deadline:
+            self.receive(0.05)
+        if self.isRunning():
+            self.timer.stop()
+            self.solver.close(timeout=0)
+
+    def receive(self, timeout=0.0):
+        for message in self.solver.poll(timeout):
+            kind = message[0]
+            if kind == "events":
+                trace = self.trace
+                live = not len(trace)
+                trace.cells.frombytes(message[1])
+                trace.states.extend(message[2])
+                # Пути пока нет: все полученные события - ход поиска
+                trace.path_start = len(trace)
+                if live:
+                    self.trace_ready.emit(trace)
+                self.progress.emit(len(trace))
+                continue
+            self.timer.stop()
+            if kind == "done":
+                publish_result(self, message[1], message[2])
+            elif kind == "error":
+                self.finished_signal.emit(f"Ошибка поиска: {message[1]}")
+
+
+def publish_result(worker, result, report=None):
+    """Общий конец запуска для AStarWorker и ProcessWorker: трасса, сигналы, статистика"""
+    if report is not None:
+        with open(STATS_CFG["profile_file"], "w", encoding="utf-8") as f:
+            f.write(report)
+    worker.trace.add_path(result.path)
+    stats = SearchStats.from_result(
+        result, worker.grid, worker.algorithm, worker.diagonal
+    )
+
+    worker.result_ready.emit(result)
+    worker.trace_ready.emit(worker.trace)
+    if result.found:
+        worker.finished_signal.emit(f"Готово! Путь: {result.length} шагов")
+    else:
+        worker.finished_signal.emit("Путь не найден!")
+    worker.stats_ready.emit(stats)
 
 
 # --- ГЛАВНОЕ ОКНО ---
@@ -319,16 +802,40 @@ class AStarApp(QMainWindow):
         super().__init__()
         self.setWindowTitle("A* Maze Solver (Optimized)")
 
-        self.grid_nodes = {}
-        # Используем локальные переменные размеров, чтобы можно было их менять при загрузке файла
-        self.current_rows = DEFAULT_ROWS
-        self.current_cols = DEFAULT_COLS
-        self.start_pos = (0, 0)
-        self.end_pos = (self.current_rows - 1, self.current_cols - 1)
+        self.grid = None
         self.worker = None
+        # Инкрементальный планировщик (LPA*) и показанный им путь
+        self.planner = None
+        self.shown_path = []
+        # Граф кластеров HPA* (строится лениво, живет до смены карты)
+        self.hierarchy = None
+        # Таблицы ориентиров ALT (подходят, пока хеш стен равен их walls_key)
+        self.landmarks = None
+        # Результат последнего запуска каждого алгоритма на текущей карте
+        self.run_results = {}
+        # Кэш путей (LRU) и ключ запущенного, но еще не законченного поиска
+        self.path_cache = PathCache(
+            CACHE_CFG["max_entries"] if CACHE_CFG["enabled"] else 0,
+            CACHE_CFG["max_path_cells"],
+        )
+        self.pending_key = None
+        # Дочерний процесс-решатель (создается при первом поиске в процессе)
+        self.remote = None
+        # Поле расстояний до финиша (DistanceField, пока включен флажок)
+        self.field = None
+        # Трасса последнего поиска и ее проигрыватель (None - нечего проигрывать)
+        self.trace = None
+        self.player = None
+        self.play_clock = 0.0
+        # Время и число перерисованных клеток при показе трассы и статистика
+        # запуска, которая ждет конца показа (replay_ms, render_ms и
+        # cells_repainted)
+        self.render_time = 0.0
+        self.render_cells = 0
+        self.run_stats = None
 
         # Инициализация данных
-        self.init_data(self.current_rows, self.current_cols)
+        self.init_data(DEFAULT_ROWS, DEFAULT_COLS)
 
         # UI
         central_widget = QWidget()
@@ -336,29 +843,40 @@ class AStarApp(QMainWindow):
         main_layout = QVBoxLayout(central_widget)
 
         # 1. Виджет карты
-        self.map_widget = GridMapWidget(
-            self.current_rows, self.current_cols, CELL_SIZE, self.grid_nodes
-        )
+        self.map_widget = GridMapWidget(self.grid, CELL_SIZE)
+        self.map_widget.walls_edited.connect(self.on_walls_edited)
 
-        # Центрируем карту
-        h_layout_map = QHBoxLayout()
-        h_layout_map.addStretch()
-        h_layout_map.addWidget(self.map_widget)
-        h_layout_map.addStretch()
-        main_layout.addLayout(h_layout_map)
+        # Карта в прокручиваемом окне (небольшая карта - по центру)
+        self.map_view = MapView(self.map_widget)
+        self.map_view.zoom_changed.connect(self.on_zoom_changed)
+        main_layout.addWidget(self.map_view, 1)
 
         # 2. Панель управления
         controls = QHBoxLayout()
 
-        btn_run = QPushButton("Запустить A*")
+        btn_run = QPushButton("Запустить")
         btn_run.setStyleSheet(
             "background-color: #4CAF50; color: white; font-weight: bold;"
         )
         btn_run.clicked.connect(self.start_thread)
 
-        btn_random = QPushButton("🎲 Случайные стены")
+        btn_random = QPushButton("🎲 Сгенерировать")
         btn_random.clicked.connect(self.generate_random_walls)
 
+        self.cmb_generator = QComboBox()
+        for name, title in GENERATOR_TITLES.items():
+            self.cmb_generator.addItem(title, name)
+        self.cmb_generator.setCurrentIndex(
+            max(0, self.cmb_generator.findData(GENERATOR_CFG["algorithm"]))
+        )
+
+        self.edit_seed = QLineEdit()
+        self.edit_seed.setPlaceholderText("зерно")
+        self.edit_seed.setToolTip("Зерно генератора (пусто - случайное)")
+        self.edit_seed.setFixedWidth(90)
+        if GENERATOR_CFG["seed"] is not None:
+            self.edit_seed.setText(str(GENERATOR_CFG["seed"]))
+
         btn_load = QPushButton("📂 Загрузить")
         btn_load.clicked.connect(self.load_maze_from_file)
 
@@ -368,161 +886,243 @@ class AStarApp(QMainWindow):
         btn_reset = QPushButton("Очистить")
         btn_reset.clicked.connect(self.reset_grid)
 
+        self.cmb_algorithm = QComboBox()
+        for name, title in ENGINE_TITLES.items():
+            self.cmb_algorithm.addItem(title, name)
+        self.cmb_algorithm.setCurrentIndex(
+            max(0, self.cmb_algorithm.findData(ALGORITHM))
+        )
+
+        self.chk_diagonal = QCheckBox("Диагонали")
+        self.chk_diagonal.setChecked(DIAGONAL)
+        self.chk_diagonal.toggled.connect(self.on_diagonal_toggled)
+
+        self.chk_field = QCheckBox("Поле расстояний")
+        self.chk_field.setToolTip(
+            "Расстояния до финиша от всех клеток: путь от любого старта без "
+            "поиска, тепловая карта поверх лабиринта"
+        )
+        self.chk_field.toggled.connect(self.refresh_field)
+
+        self.chk_incremental = QCheckBox("Инкрементально (LPA*)")
+        self.chk_incremental.setToolTip(
+            "Сохранять состояние поиска и пересчитывать путь при рисовании стен"
+        )
+
+        self.chk_process = QCheckBox("Отдельный процесс")
+        self.chk_process.setChecked(SEARCH_PROCESS)
+        self.chk_process.setToolTip(
+            "Искать в дочернем процессе: GUI не делит с поиском GIL"
+        )
+
+        self.chk_profile = QCheckBox("Профилировать")
+        self.chk_profile.setToolTip(
+            f"Следующий запуск выполнить под cProfile "
+            f"(отчет в {STATS_CFG['profile_file']})"
+        )
+
+        self.chk_max_speed = QCheckBox("⚡ Макс. скорость")
+        self.chk_max_speed.setToolTip(
+            "Не анимировать поиск, показать только итоговый путь"
+        )
+
         self.lbl_info = QLabel("ЛКМ: рисовать стены")
         self.lbl_info.setStyleSheet("font-weight: bold; margin-left: 10px;")
 
+        controls.addWidget(self.cmb_algorithm)
+        controls.addWidget(self.chk_diagonal)
         controls.addWidget(btn_run)
+        controls.addWidget(self.cmb_generator)
+        controls.addWidget(self.edit_seed)
         controls.addWidget(btn_random)
         controls.addWidget(btn_load)
         controls.addWidget(btn_save)
         controls.addWidget(btn_reset)
+        controls.addWidget(self.chk_max_speed)
+        controls.addWidget(self.chk_field)
+        controls.addWidget(self.chk_incremental)
+        controls.addWidget(self.chk_process)
+        controls.addWidget(self.chk_profile)
         controls.addWidget(self.lbl_info)
 
         main_layout.addLayout(controls)
 
+        # 3. Воспроизведение трассы поиска
+        playback = QHBoxLayout()
+
+        self.btn_play = QPushButton("▶")
+        self.btn_play.setFixedWidth(40)
+        self.btn_play.setToolTip("Пауза / продолжить воспроизведение поиска")
+        self.btn_play.clicked.connect(self.toggle_playback)
+
+        self.slider_trace = QSlider(Qt.Orientation.Horizontal)
+        self.slider_trace.sliderPressed.connect(self.pause_playback)
+        self.slider_trace.valueChanged.connect(self.on_slider_moved)
+
+        self.cmb_speed = QComboBox()
+        for speed in PLAYBACK_SPEEDS:
+            self.cmb_speed.addItem(f"x{speed:g}", speed)
+        self.cmb_speed.setCurrentIndex(PLAYBACK_SPEEDS.index(1))
+        self.cmb_speed.setToolTip("Скорость воспроизведения")
+        self.cmb_speed.currentIndexChanged.connect(self.on_speed_changed)
+
+        self.lbl_trace = QLabel("")
+        self.lbl_trace.setMinimumWidth(110)
+
+        btn_open_trace = QPushButton("Открыть трассу")
+        btn_open_trace.clicked.connect(self.load_trace_from_file)
+
+        self.btn_save_trace = QPushButton("Сохранить трассу")
+        self.btn_save_trace.clicked.connect(self.save_trace_to_file)
+
+        playback.addWidget(self.btn_play)
+        playback.addWidget(self.slider_trace, 1)
+        playback.addWidget(self.lbl_trace)
+        playback.addWidget(self.cmb_speed)
+        playback.addWidget(btn_open_trace)
+        playback.addWidget(self.btn_save_trace)
+
+        # Масштаб карты (также Ctrl + колесо мыши)
+        btn_zoom_out = QPushButton("−")
+        btn_zoom_out.setFixedWidth(30)
+        btn_zoom_out.clicked.connect(lambda: self.map_view.zoom_by(-1))
+        btn_zoom_in = QPushButton("+")
+        btn_zoom_in.setFixedWidth(30)
+        btn_zoom_in.clicked.connect(lambda: self.map_view.zoom_by(1))
+        btn_zoom_fit = QPushButton("Вписать")
+        btn_zoom_fit.clicked.connect(self.map_view.fit)
+        self.lbl_zoom = QLabel("")
+
+        playback.addSpacing(20)
+        playback.addWidget(btn_zoom_out)
+        playback.addWidget(btn_zoom_in)
+        playback.addWidget(btn_zoom_fit)
+        playback.addWidget(self.lbl_zoom)
+
+        main_layout.addLayout(playback)
+
+        self.play_timer = QTimer(self)
+        self.play_timer.setInterval(max(1, round(1000 / FRAME_RATE)))
+        self.play_timer.timeout.connect(self.on_play_tick)
+        self.update_playback_controls()
+        self.on_zoom_changed(self.map_widget.zoom)
+
+        # Краткая статистика последнего запуска
+        self.lbl_stats = QLabel("")
+        self.lbl_stats.setStyleSheet("color: #555; margin-left: 10px;")
+        main_layout.addWidget(self.lbl_stats)
+
         # Генерация стен при запуске
         self.generate_random_walls()
 
     def init_data(self, rows, cols):
         """Создает логическую структуру данных с нуля"""
-        self.grid_nodes = {}
-        for r in range(rows):
-            for c in range(cols):
-                node = Node(r, c)
-                if (r, c) == self.start_pos:
-                    node.state = "start"
-                elif (r, c) == self.end_pos:
-                    node.state = "end"
-                self.grid_nodes[(r, c)] = node
+        self.grid = GridModel(rows, cols)
+        self.components = ComponentIndex(self.grid)
+        self.wall_hash = WallHash(self.grid)
 
     def generate_random_walls(self):
-        """Случайная генерация лабиринта для текущих размеров"""
+        """Генерация карты выбранным генератором для текущих размеров"""
         if self.worker and self.worker.isRunning():
             return
 
-        self.reset_data(keep_walls=False)
+        seed_text = self.edit_seed.text().strip()
+        try:
+            seed = int(seed_text) if seed_text else None
+        except ValueError:
+            QMessageBox.warning(self, "Ошибка", "Зерно должно быть целым числом.")
+            return
 
-        for pos, node in self.grid_nodes.items():
-            if pos == self.start_pos or pos == self.end_pos:
-                continue
-            if random.random() < WALL_DENSITY:
-                node.is_wall = True
-            else:
-                node.is_wall = False
+        kind = self.cmb_generator.currentData()
+        if kind == "backtracker" and self.grid.size > BACKTRACKER_MAX_CELLS:
+            QMessageBox.warning(
+                self,
+                "Ошибка",
+                f"{GENERATOR_TITLES[kind]} строит карты до "
+                f"{BACKTRACKER_MAX_CELLS} клеток. Выберите другой генератор.",
+            )
+            return
 
-        self.map_widget.update()
-        self.lbl_info.setText("Сгенерированы случайные стены")
+        self.reset_data(keep_walls=False)
+        seed = generate(self.grid, kind, seed, WALL_DENSITY)
+        self.components.rebuild()
+        self.wall_hash.rebuild()
+        self.hierarchy = None
+        self.landmarks = None
+
+        self.map_widget.refresh()
+        self.lbl_info.setText(f"{GENERATOR_TITLES[kind]}, зерно {seed}")
+        self.refresh_field()
 
     def load_maze_from_file(self):
         """Загрузка лабиринта из текстового файла"""
         file_path, _ = QFileDialog.getOpenFileName(
-            self, "Открыть лабиринт", "", "Text Files (*.txt);;All Files (*)"
+            self, "Открыть лабиринт", "", MAZE_FILE_FILTER
         )
 
         if not file_path:
             return
 
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                lines = [line.strip() for line in f.readlines() if line.strip()]
-
-            if not lines:
-                return
-
-            rows = len(lines)
-            cols = len(lines[0])
-
-            # Проверка, что все строки одинаковой длины
-            if any(len(line) != cols for line in lines):
-                QMessageBox.warning(
-                    self,
-                    "Ошибка",
-                    "Лабиринт должен быть прямоугольным (все строки одинаковой длины).",
-                )
+            try:
+                grid = read_maze(file_path)
+            except ValueError as e:
+                QMessageBox.warning(self, "Ошибка", str(e))
                 return
 
-            # Останавливаем поток, если запущен
-            if self.worker and self.worker.isRunning():
-                self.worker.is_running = False
-                self.worker.wait()
-
-            # Обновляем размеры
-            self.current_rows = rows
-            self.current_cols = cols
-
-            # Новая структура данных
-            new_nodes = {}
-            new_start = None
-            new_end = None
-
-            for r, line in enumerate(lines):
-                for c, char in enumerate(line):
-                    node = Node(r, c)
-                    if char == "S":
-                        node.state = "start"
-                        new_start = (r, c)
-                    elif char == "E":
-                        node.state = "end"
-                        new_end = (r, c)
-                    elif char == "#":
-                        node.is_wall = True
-                    # Остальное считается пустым местом
-                    new_nodes[(r, c)] = node
-
-            # Если старт или финиш не найдены в файле, ставим по умолчанию
-            if not new_start:
-                new_start = (0, 0)
-                new_nodes[new_start].state = "start"
-                new_nodes[new_start].is_wall = False
-
-            if not new_end:
-                new_end = (rows - 1, cols - 1)
-                new_nodes[new_end].state = "end"
-                new_nodes[new_end].is_wall = False
-
-            self.grid_nodes = new_nodes
-            self.start_pos = new_start
-            self.end_pos = new_end
-
-            # Обновляем виджет карты
-            self.map_widget.update_grid_data(rows, cols, self.grid_nodes)
-
-            self.lbl_info.setText(f"Загружен лабиринт: {rows}x{cols}")
+            self.replace_grid(grid)
+            self.landmarks = self.load_landmarks(file_path)
+            note = " (ориентиры ALT из файла)" if self.landmarks else ""
+            self.lbl_info.setText(f"Загружен лабиринт: {grid.rows}x{grid.cols}{note}")
 
         except Exception as e:
             QMessageBox.critical(
                 self, "Ошибка", f"Не удалось загрузить файл:\n{str(e)}"
             )
 
+    def replace_grid(self, grid):
+        """Переходит на другую карту (загруженную из файла)"""
+        # Останавливаем поток, если запущен
+        if self.worker and self.worker.isRunning():
+            self.worker.cancel()
+            self.worker.wait()
+        self.stop_playback()
+
+        self.grid = grid
+        self.components = ComponentIndex(grid)
+        self.wall_hash = WallHash(grid)
+        self.hierarchy = None
+        self.landmarks = None
+        self.planner = None
+        self.shown_path = []
+        self.run_results.clear()
+
+        # Обновляем виджет карты; большую карту сразу вписываем в окно
+        self.map_widget.update_grid_data(self.grid)
+        self.map_view.fit_if_larger()
+        self.refresh_field()
+
     def save_maze_to_file(self):
         """Сохранение текущего лабиринта в текстовый файл"""
-        if not self.grid_nodes:
+        if not self.grid:
             QMessageBox.warning(self, "Ошибка", "Нет данных для сохранения.")
             return
 
         file_path, _ = QFileDialog.getSaveFileName(
-            self, "Сохранить лабиринт", "maze.txt", "Text Files (*.txt);;All Files (*)"
+            self, "Сохранить лабиринт", "maze.txt", MAZE_FILE_FILTER
         )
 
         if not file_path:
             return
 
         try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                for r in range(self.current_rows):
-                    line = ""
-                    for c in range(self.current_cols):
-                        node = self.grid_nodes.get((r, c))
-                        char = "."
-                        if node:
-                            if node.state == "start":
-                                char = "S"
-                            elif node.state == "end":
-                                char = "E"
-                            elif node.is_wall:
-                                char = "#"
-                        line += char
-                    f.write(line + "\n")
+            write_maze(self.grid, file_path)
+            # Ориентиры этой карты - рядом, чтобы не строить их после загрузки
+            if (
+                self.landmarks is not None
+                and self.landmarks.walls_key == self.wall_hash.value
+            ):
+                self.landmarks.save(landmarks_path(file_path))
 
             QMessageBox.information(self, "Успех", "Лабиринт успешно сохранен!")
             self.lbl_info.setText(f"Сохранено в {os.path.basename(file_path)}")
@@ -532,56 +1132,440 @@ class AStarApp(QMainWindow):
                 self, "Ошибка", f"Не удалось сохранить файл:\n{str(e)}"
             )
 
+    def load_landmarks(self, maze_path):
+        """Таблицы ориентиров рядом с файлом лабиринта, если они к нему подходят"""
+        path = landmarks_path(maze_path)
+        if not os.path.exists(path):
+            return None
+        try:
+            table = LandmarkTable.load(path)
+        except (OSError, ValueError):
+            return None
+        if not table.matches(self.grid, self.wall_hash.value, table.diagonal):
+            return None
+        return table
+
     def reset_grid(self):
         if self.worker and self.worker.isRunning():
-            self.worker.is_running = False
+            self.worker.cancel()
             self.worker.wait()
 
         self.reset_data(keep_walls=False)
-        self.map_widget.update()
+        self.map_widget.refresh()
         self.lbl_info.setText("Поле полностью очищено")
+        self.refresh_field()
 
     def reset_data(self, keep_walls=True):
-        """Сброс данных узлов"""
-        for pos, node in self.grid_nodes.items():
-            node.reset_calc()
-
-            if pos == self.start_pos:
-                node.state = "start"
-            elif pos == self.end_pos:
-                node.state = "end"
-            else:
-                if not keep_walls:
-                    node.is_wall = False
-                if not node.is_wall:
-                    node.state = "empty"
+        """Сброс данных поиска (и стен, если keep_walls=False).
+
+        Возвращает клетки, восстановленные сбросом (None - все).
+        """
+        self.stop_playback()
+        cells = self.grid.reset_search(keep_walls)
+        self.planner = None
+        self.shown_path = []
+        if not keep_walls:
+            self.components.rebuild()
+            self.wall_hash.rebuild()
+            self.hierarchy = None
+            self.landmarks = None
+            self.run_results.clear()
+            self.field = None
+            self.map_widget.set_overlay(None)
+        return cells
 
     def start_thread(self):
         if self.worker and self.worker.isRunning():
             return
 
-        self.reset_data(keep_walls=True)
-        self.map_widget.update()
+        # Стираем только то, что нарисовал прошлый поиск
+        cells = self.reset_data(keep_walls=True)
+        if cells is None:
+            self.map_widget.refresh()
+        else:
+            self.map_widget.repaint_cells(cells)
+
+        # Старт и финиш в разных областях - ответ без запуска поиска
+        if not self.components.connected(self.grid.start, self.grid.end):
+            self.lbl_info.setText("Путь не найден! (старт и финиш в разных областях)")
+            # Планировщик нужен и без пути: правка, открывшая проход, его найдет
+            if self.field is None and self.chk_incremental.isChecked():
+                self.planner = LPAStar(self.grid, self.chk_diagonal.isChecked())
+            return
+
+        if self.field is not None:
+            self.show_field_path()
+            return
+
+        if self.chk_incremental.isChecked():
+            self.start_incremental()
+            return
+
+        self.trace = None
+        algorithm = self.cmb_algorithm.currentData()
+        diagonal = self.chk_diagonal.isChecked()
+        key = PathCache.make_key(self.grid, self.wall_hash, algorithm, diagonal)
+        cached = self.path_cache.get(key)
+        if cached is not None:
+            self.show_cached_result(algorithm, cached)
+            return
+        self.pending_key = key
+
         self.lbl_info.setText("Поиск пути...")
 
-        self.worker = AStarWorker(self.grid_nodes, self.start_pos, self.end_pos)
-        self.worker.cell_updated.connect(self.on_cell_updated)
+        max_speed = self.chk_max_speed.isChecked()
+        profile = self.chk_profile.isChecked()
+        if self.chk_process.isChecked():
+            if self.remote is not None and not self.remote.alive:
+                self.remote.close()
+                self.remote = None
+            if self.remote is None:
+                self.remote = RemoteSolver()
+            # Кластеры HPA* дочерний процесс хранит сам, по хешу стен
+            self.worker = ProcessWorker(
+                self.remote,
+                self.grid,
+                algorithm,
+                diagonal,
+                max_speed,
+                profile,
+                self.wall_hash.value,
+            )
+            self.worker.progress.connect(self.on_progress)
+        else:
+            hierarchy = None
+            if algorithm == "hpa":
+                if self.hierarchy is None or self.hierarchy.diagonal != diagonal:
+                    self.hierarchy = HPAGraph(self.grid, CLUSTER_SIZE, diagonal)
+                hierarchy = self.hierarchy
+            landmarks = self.landmarks
+            if landmarks is not None and not landmarks.matches(
+                self.grid, self.wall_hash.value, diagonal
+            ):
+                landmarks = None
+            self.worker = AStarWorker(
+                self.grid, algorithm, diagonal, max_speed, hierarchy, profile, landmarks
+            )
+        # Профилирование - только для одного запуска
+        self.chk_profile.setChecked(False)
+        self.worker.result_ready.connect(self.on_result)
+        self.worker.trace_ready.connect(self.on_trace)
         self.worker.finished_signal.connect(self.on_finished)
-        self.worker.start()
+        self.worker.stats_ready.connect(self.on_stats)
+        try:
+            self.worker.start()
+        except (RuntimeError, OSError) as e:
+            # Решатель занят или недоступен: следующий запуск пересоздаст его
+            if self.remote is not None and not self.remote.alive:
+                self.remote.close(timeout=0)
+                self.remote = None
+            self.lbl_info.setText(f"Поиск в процессе не запущен: {e}")
+
+    def on_progress(self, events):
+        self.lbl_info.setText(f"Поиск пути... (получено событий: {events})")
+
+    def show_cached_result(self, algorithm, result):
+        """Рисует путь из кэша без запуска поиска"""
+        path = [i for i in result.path if not self.grid.is_endpoint(i)]
+        self.map_widget.apply_batch(array("i", path), bytes([PATH]) * len(path))
+        self.run_results[algorithm] = result
+        # Сводка - того запуска, который положил путь в кэш; в журнал не пишется
+        stats = SearchStats.from_result(
+            result, self.grid, algorithm, self.chk_diagonal.isChecked()
+        )
+        stats.cells_repainted = len(path)
+        self.lbl_stats.setText(f"{stats.summary()} (из кэша)")
+        if result.found:
+            self.on_finished(f"Готово! Путь: {result.length} шагов (из кэша)")
+        else:
+            self.on_finished("Путь не найден! (из кэша)")
+
+    def start_incremental(self):
+        """Первый полный расчет LPA*; дальше путь чинится при правке стен"""
+        self.planner = LPAStar(self.grid, self.chk_diagonal.isChecked())
+        self.show_incremental_result(self.planner.compute())
+
+    def show_incremental_result(self, result):
+        """Заменяет показанный путь новым одной пакетной перерисовкой"""
+        grid = self.grid
+        new_path = [i for i in result.path if not grid.is_endpoint(i)]
+        keep = set(new_path)
+        cells = array("i", [i for i in self.shown_path if i not in keep])
+        states = bytearray(WALL if grid.walls[i] else EMPTY for i in cells)
+        cells.extend(new_path)
+        states.extend(bytes([PATH]) * len(new_path))
+        self.map_widget.apply_batch(cells, states)
+        self.shown_path = new_path
+
+        if result.found:
+            msg = f"LPA*: путь {result.length} шагов"
+        else:
+            msg = "LPA*: путь не найден"
+        self.lbl_info.setText(
+            f"{msg}, пересчитано {result.expanded} клеток "
+            f"за {result.elapsed * 1000:.1f} мс"
+        )
+
+    def refresh_field(self):
+        """Строит поле расстояний заново (или убирает, если флажок снят)"""
+        if not self.chk_field.isChecked():
+            self.field = None
+            self.map_widget.set_overlay(None)
+            return
+        self.field = DistanceField(self.grid, self.chk_diagonal.isChecked())
+        self.map_widget.set_overlay(self.field.levels())
+        self.lbl_info.setText(
+            f"Поле расстояний построено за {self.field.build_time * 1000:.0f} мс"
+        )
 
-    def on_cell_updated(self, r, c, state):
-        if (r, c) in self.grid_nodes:
-            node = self.grid_nodes[(r, c)]
-            node.state = state
-            self.map_widget.update_node(r, c)
+    def show_field_path(self):
+        """Путь от старта по полю расстояний - без поиска, за O(длины пути)"""
+        result = self.field.search()
+        path = [i for i in result.path if not self.grid.is_endpoint(i)]
+        self.map_widget.apply_batch(array("i", path), bytes([PATH]) * len(path))
+        if result.found:
+            msg = f"Поле расстояний: путь {result.length} шагов"
+        else:
+            msg = "Поле расстояний: путь не найден"
+        self.lbl_info.setText(
+            f"{msg} за {result.elapsed * 1000:.2f} мс "
+            f"(поле построено за {result.prep_time * 1000:.0f} мс)"
+        )
+
+    def on_diagonal_toggled(self):
+        self.run_results.clear()
+        self.planner = None
+        self.refresh_field()
+
+    def on_walls_edited(self, i):
+        # Правка стены меняет клетки под трассой - перемотка по ней больше невозможна
+        self.stop_playback()
+        # Карта больше не та, что дал генератор с записанным зерном
+        self.grid.meta = {}
+        self.components.on_wall_changed(i)
+        self.wall_hash.toggle(i)
+        if self.hierarchy is not None:
+            self.hierarchy.on_wall_changed(i)
+        if self.field is not None:
+            changed = self.field.on_wall_changed(i)
+            self.map_widget.update_overlay(changed, self.field.levels(changed))
+        # Инкрементальный режим: чиним только затронутую часть поиска
+        if self.planner is not None and self.chk_incremental.isChecked():
+            if not (self.worker and self.worker.isRunning()):
+                self.planner.update_cell(i)
+                self.show_incremental_result(self.planner.compute())
+
+    def on_result(self, result):
+        self.run_results[self.worker.algorithm] = result
+        # Построенные в потоке ориентиры остаются для следующих запусков
+        landmarks = getattr(self.worker, "landmarks", None)
+        if landmarks is not None and landmarks.walls_key == self.wall_hash.value:
+            self.landmarks = landmarks
+        # Стены могли поменяться во время поиска - тогда результат не кэшируем
+        if self.pending_key is not None and self.pending_key[0] == self.wall_hash.value:
+            self.path_cache.put(self.pending_key, result)
+        self.pending_key = None
 
     def on_finished(self, msg):
+        # Раскрытые узлы и время всех алгоритмов, запускавшихся на этой карте
+        if self.run_results:
+            counts = ", ".join(
+                self.describe_run(name, res) for name, res in self.run_results.items()
+            )
+            msg = f"{msg} | раскрыто: {counts}"
+        cache = self.path_cache
+        if cache.max_entries > 0:
+            msg = f"{msg} | кэш: {cache.hits} попад., {cache.misses} промах."
         self.lbl_info.setText(msg)
 
+    # --- Воспроизведение трассы ---
+    def on_trace(self, trace):
+        # Трасса поиска в процессе уже проигрывается с первой пачки событий
+        if self.player is not None and self.player.trace is trace:
+            self.update_playback_controls()
+            return
+        self.start_playback(trace, play=not self.worker.max_speed)
+
+    def start_playback(self, trace, play=True):
+        """Проигрывает трассу поверх текущего grid.state (play=False - сразу итог)"""
+        self.trace = trace
+        self.player = TracePlayer(trace, self.grid.state, PLAYBACK_RATE, PATH_RATE)
+        self.player.speed = self.cmb_speed.currentData()
+        self.render_time = 0.0
+        self.render_cells = 0
+        if play:
+            self.play_clock = time.perf_counter()
+            self.play_timer.start()
+        else:
+            self.show_changes(self.player.seek(len(trace)))
+        self.update_playback_controls()
+
+    def stop_playback(self):
+        """Забывает проигрыватель; клетки остаются в показанном состоянии"""
+        self.play_timer.stop()
+        # Показ прерван - статистика запуска уходит с тем, что успели показать
+        self.finish_run_stats()
+        self.player = None
+        self.update_playback_controls()
+
+    def pause_playback(self):
+        self.play_timer.stop()
+        self.update_playback_controls()
+
+    def toggle_playback(self):
+        if self.player is None:
+            return
+        if self.play_timer.isActive():
+            self.pause_playback()
+            return
+        if self.player.at_end:
+            self.show_changes(self.player.seek(0))
+        self.play_clock = time.perf_counter()
+        self.play_timer.start()
+        self.update_playback_controls()
+
+    def on_play_tick(self):
+        # Продвигаемся на реально прошедшее время: если кадр запоздал,
+        # пропущенные события просто попадут в этот кадр
+        now = time.perf_counter()
+        self.show_changes(self.player.step(now - self.play_clock))
+        self.play_clock = now
+        # Пока поиск идет, трасса еще растет - ждем следующих пачек
+        if self.player.at_end and not (self.worker and self.worker.isRunning()):
+            self.play_timer.stop()
+            self.finish_run_stats()
+        self.update_playback_controls()
+
+    def on_slider_moved(self, value):
+        if self.player is not None and value != self.player.pos:
+            self.show_changes(self.player.seek(value))
+            self.update_playback_controls()
+
+    def on_speed_changed(self):
+        if self.player is not None:
+            self.player.speed = self.cmb_speed.currentData()
+
+    def show_changes(self, cells):
+        """Перерисовка клеток, измененных проигрывателем"""
+        t0 = time.perf_counter()
+        self.grid.touch(cells)
+        # Большой скачок по трассе дешевле перерисовать целиком
+        if len(cells) > self.grid.size // 8:
+            self.map_widget.refresh()
+            self.render_cells += self.grid.size
+        else:
+            # Клетка, открытая и закрытая в одном кадре, рисуется один раз
+            cells = array("i", dict.fromkeys(cells))
+            self.map_widget.repaint_cells(cells)
+            self.render_cells += len(cells)
+        self.render_time += time.perf_counter() - t0
+
+    def update_playback_controls(self):
+        player = self.player
+        self.btn_play.setEnabled(player is not None)
+        self.btn_play.setText("⏸" if self.play_timer.isActive() else "▶")
+        self.slider_trace.setEnabled(player is not None)
+        self.btn_save_trace.setEnabled(self.trace is not None)
+        # Позицию ставим без сигнала valueChanged (иначе - лишний seek)
+        self.slider_trace.blockSignals(True)
+        self.slider_trace.setRange(0, len(player) if player else 0)
+        self.slider_trace.setValue(player.pos if player else 0)
+        self.slider_trace.blockSignals(False)
+        self.lbl_trace.setText(f"{player.pos} / {len(player)}" if player else "")
+
+    def load_trace_from_file(self):
+        """Открывает сохраненную трассу вместе с ее картой"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Открыть трассу", "", TRACE_FILE_FILTER
+        )
+        if not file_path:
+            return
+        try:
+            trace = SearchTrace.load(file_path)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Ошибка", f"Не удалось открыть трассу:\n{e}")
+            return
+
+        self.replace_grid(trace.make_grid())
+        self.start_playback(trace)
+        self.lbl_info.setText(
+            f"Трасса: {trace.rows}x{trace.cols}, {len(trace)} событий"
+        )
+
+    def save_trace_to_file(self):
+        if self.trace is None:
+            return
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Сохранить трассу", f"trace{TRACE_SUFFIX}", TRACE_FILE_FILTER
+        )
+        if not file_path:
+            return
+        try:
+            self.trace.save(file_path)
+        except OSError as e:
+            QMessageBox.critical(self, "Ошибка", f"Не удалось сохранить трассу:\n{e}")
+            return
+        self.lbl_info.setText(f"Трасса сохранена в {os.path.basename(file_path)}")
+
+    def on_zoom_changed(self, zoom):
+        renderer = self.map_widget.renderer
+        if renderer.factor > 1:
+            text = f"1 пикс. = {renderer.factor}x{renderer.factor} клеток"
+        else:
+            text = f"клетка {renderer.cell_size} пикс."
+        self.lbl_zoom.setText(text)
+
+    def on_stats(self, stats):
+        """Сводка сразу; в журнал - когда показ трассы дойдет до конца"""
+        self.finish_run_stats()
+        self.run_stats = stats
+        self.show_stats(stats)
+        if self.player is None or (
+            self.player.at_end and not self.play_timer.isActive()
+        ):
+            self.finish_run_stats()
+
+    def show_stats(self, stats):
+        summary = stats.summary()
+        if self.worker is not None and self.worker.profile:
+            summary += f" | профиль: {STATS_CFG['profile_file']}"
+        self.lbl_stats.setText(summary)
+
+    def finish_run_stats(self):
+        """Дописывает время показа в статистику запуска и пишет ее в журнал"""
+        stats, self.run_stats = self.run_stats, None
+        if stats is None:
+            return
+        if self.player is not None:
+            stats.replay_ms = round(self.player.elapsed * 1000, 3)
+            stats.render_ms = round(self.render_time * 1000, 3)
+            stats.cells_repainted = self.render_cells
+            self.show_stats(stats)
+        if STATS_CFG["log_file"]:
+            try:
+                stats.append_to(STATS_CFG["log_file"])
+            except OSError as e:
+                print(f"Не удалось записать статистику: {e}")
+
+    @staticmethod
+    def describe_run(name, res):
+        """Раскрытые узлы и время одного запуска (с предобработкой, если была)"""
+        text = f"{ENGINE_TITLES[name]} {res.expanded} ({res.elapsed * 1000:.0f} мс"
+        if res.prep_time:
+            text += (
+                f" + подготовка {res.prep_time * 1000:.0f} мс, "
+                f"{res.prep_bytes // 1024} КБ"
+            )
+        return text + ")"
+
     def closeEvent(self, event):
+        self.play_timer.stop()
+        self.finish_run_stats()
         if self.worker:
-            self.worker.is_running = False
-            self.worker.quit()
+            self.worker.cancel()
+            self.worker.wait()
+        if self.remote is not None:
+            self.remote.close()
         event.accept()
 
 
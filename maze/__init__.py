@@ -0,0 +1,38 @@
+"""Ядро поиска пути без зависимости от Qt."""
+
+from .grid import (
+    CLOSED,
+    CLOSED_REV,
+    EMPTY,
+    END,
+    OPEN,
+    OPEN_REV,
+    PATH,
+    START,
+    STATE_CODES,
+    STATE_NAMES,
+    WALL,
+    GridModel,
+    Node,
+)
+from .fileio import (
+    BINARY_SUFFIX,
+    read_binary,
+    read_maze,
+    read_text,
+    write_binary,
+    write_maze,
+    write_text,
+)
+from .astar import SearchResult, astar
+from .engines import APPROXIMATE, ENGINE_TITLES, ENGINES, solve
+from .cache import PathCache, WallHash
+from .components import ComponentIndex
+from .lpastar import LPAStar
+from .hpa import HPAGraph
+from .generators import BACKTRACKER_MAX_CELLS, GENERATOR_TITLES, GENERATORS, generate
+from .stats import SearchStats, profile_call
+from .trace import TRACE_SUFFIX, SearchTrace, TracePlayer
+from .remote import RemoteSolver
+from .flowfield import DistanceField
+from .landmarks import LANDMARKS_SUFFIX, LandmarkTable, landmarks_path
@@ -0,0 +1,187 @@
+"""Поиск A* по GridModel без зависимости от Qt."""
+
+import math
+import time
+
+from .grid import CLOSED, OPEN
+from .openset import OpenSet
+
+SQRT2 = math.sqrt(2)
+# Поправка октильной эвристики: dr + dc + (sqrt(2) - 2) * min(dr, dc)
+DIAGONAL_EXTRA = SQRT2 - 2
+
+
+class SearchResult:
+    """Итог одного поиска: путь (индексы клеток от старта к финишу) и статистика"""
+
+    def __init__(
+        self,
+        path,
+        expanded,
+        elapsed,
+        cost=None,
+        prep_time=0.0,
+        prep_bytes=0,
+        path_time=0.0,
+        heap_stats=None,
+    ):
+        self.path = path
+        self.expanded = expanded
+        self.elapsed = elapsed
+        # Стоимость пути; без диагоналей совпадает с числом шагов
+        self.cost = cost if cost is not None else self.length
+        # Предобработка иерархических алгоритмов (в elapsed не входит)
+        self.prep_time = prep_time
+        self.prep_bytes = prep_bytes
+        # Часть elapsed, ушедшая на восстановление пути
+        self.path_time = path_time
+        # Счетчики открытого списка (см. OpenSet.stats)
+        self.heap_stats = heap_stats or {}
+
+    @property
+    def found(self):
+        return bool(self.path)
+
+    @property
+    def length(self):
+        """Длина пути в шагах (ребрах), -1 если пути нет"""
+        return len(self.path) - 1 if self.path else -1
+
+
+def heuristic(grid, a, b, diagonal=False):
+    # Манхэттенское расстояние (октильное при движении по диагонали)
+    ar, ac = divmod(a, grid.cols)
+    br, bc = divmod(b, grid.cols)
+    dr, dc = abs(ar - br), abs(ac - bc)
+    if diagonal:
+        return dr + dc + DIAGONAL_EXTRA * min(dr, dc)
+    return dr + dc
+
+
+def get_neighbors(grid, i, diagonal=False):
+    """Проходимые соседи клетки по 4 (или 8) направлениям.
+
+    По диагонали ходим только если обе соседние прямые клетки свободны
+    (не срезаем углы стен).
+    """
+    cols = grid.cols
+    r, c = divmod(i, cols)
+    walls = grid.walls
+    right = c + 1 < cols and not walls[i + 1]
+    left = c > 0 and not walls[i - 1]
+    down = r + 1 < grid.rows and not walls[i + cols]
+    up = r > 0 and not walls[i - cols]
+    neighbors = []
+    if right:
+        neighbors.append(i + 1)
+    if left:
+        neighbors.append(i - 1)
+    if down:
+        neighbors.append(i + cols)
+    if up:
+        neighbors.append(i - cols)
+    if diagonal:
+        if down and right and not walls[i + cols + 1]:
+            neighbors.append(i + cols + 1)
+        if down and left and not walls[i + cols - 1]:
+            neighbors.append(i + cols - 1)
+        if up and right and not walls[i - cols + 1]:
+            neighbors.append(i - cols + 1)
+        if up and left and not walls[i - cols - 1]:
+            neighbors.append(i - cols - 1)
+    return neighbors
+
+
+def reconstruct_path(parent, end):
+    """Восстанавливает путь по ссылкам parent от финиша к старту"""
+    path = []
+    curr = end
+    while curr >= 0:
+        path.append(curr)
+        curr = parent[curr]
+    path.reverse()
+    return path
+
+
+def astar(grid, listener=None, should_stop=None, diagonal=False, estimate=None):
+    """A* от grid.start до grid.end.
+
+    listener(index, state) вызывается при открытии и закрытии клеток
+    (кроме старта и финиша), should_stop() позволяет прервать поиск -
+    тогда возвращается None. diagonal включает 8-связность с весом
+    диагонального шага sqrt(2). estimate(i) заменяет встроенную эвристику
+    (она должна быть согласованной, например оценка по ориентирам ALT).
+    """
+    t0 = time.perf_counter()
+    start, end = grid.start, grid.end
+    # g/parent клетки действительны, только если stamp[i] == gen
+    gen = grid.begin_search()
+    g, parent, stamp = grid.g, grid.parent, grid.stamp
+    end_r, end_c = divmod(end, grid.cols)
+    cols = grid.cols
+
+    open_set = OpenSet(grid.size)
+    closed = open_set.closed
+    g[start] = 0
+    parent[start] = -1
+    stamp[start] = gen
+    h = heuristic(grid, start, end, diagonal) if estimate is None else estimate(start)
+    open_set.push(h, h, start)
+    expanded = 0
+
+    while open_set:
+        if should_stop is not None and should_stop():
+            return None
+
+        current = open_set.pop()
+        if current < 0:
+            break
+        expanded += 1
+
+        if listener is not None and current != start and current != end:
+            listener(current, CLOSED)
+
+        if current == end:
+            t1 = time.perf_counter()
+            path = reconstruct_path(parent, end)
+            t2 = time.perf_counter()
+            return SearchResult(
+                path,
+                expanded,
+                t2 - t0,
+                g[end],
+                path_time=t2 - t1,
+                heap_stats=open_set.stats(),
+            )
+
+        cur_r, cur_c = divmod(current, cols)
+        for neighbor in get_neighbors(grid, current, diagonal):
+            r, c = divmod(neighbor, cols)
+            # Вес ребра = 1, по диагонали - sqrt(2)
+            if r != cur_r and c != cur_c:
+                temp_g = g[current] + SQRT2
+            else:
+                temp_g = g[current] + 1
+            if closed[neighbor] or (stamp[neighbor] == gen and temp_g >= g[neighbor]):
+                continue
+
+            # Новая запись в куче вместо изменения старой (ленивое удаление)
+            first_visit = stamp[neighbor] != gen
+            stamp[neighbor] = gen
+            parent[neighbor] = current
+            g[neighbor] = temp_g
+            if estimate is not None:
+                h = estimate(neighbor)
+            else:
+                dr, dc = abs(r - end_r), abs(c - end_c)
+                h = dr + dc
+                if diagonal:
+                    h += DIAGONAL_EXTRA * min(dr, dc)
+            open_set.push(temp_g + h, h, neighbor)
+
+            if listener is not None and first_visit and neighbor != end:
+                listener(neighbor, OPEN)
+
+    return SearchResult(
+        [], expanded, time.perf_counter() - t0, heap_stats=open_set.stats()
+    )
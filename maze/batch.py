@@ -0,0 +1,151 @@
+"""Пакетное решение множества запросов старт/финиш на одном лабиринте.
+
+Запросы раздаются пулу процессов; каждый процесс загружает лабиринт
+и строит разметку связных областей один раз при старте, а затем решает
+свою долю запросов. Таблицы ориентиров ALT процесс строит при первом
+таком запросе и использует для всех следующих. Результаты возвращаются
+в порядке запросов.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .components import ComponentIndex
+from .engines import solve
+from .fileio import read_maze
+from .landmarks import LandmarkTable
+
+# Состояние рабочего процесса (заполняется в _init_worker)
+_GRID = None
+_COMPONENTS = None
+_OPTIONS = None
+_LANDMARKS = None
+
+
+def _init_worker(maze_path, options):
+    global _GRID, _COMPONENTS, _OPTIONS, _LANDMARKS
+    _GRID = read_maze(maze_path)
+    _COMPONENTS = ComponentIndex(_GRID)
+    _OPTIONS = options
+    _LANDMARKS = {}
+
+
+def _cell(grid, value, name):
+    """Индекс клетки из пары [r, c] с проверкой границ и стен"""
+    try:
+        r, c = value
+        r, c = int(r), int(c)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name}: ожидается пара [строка, столбец]") from None
+    if not grid.in_bounds(r, c):
+        raise ValueError(f"{name}: клетка ({r}, {c}) вне лабиринта")
+    i = grid.index(r, c)
+    if grid.walls[i]:
+        raise ValueError(f"{name}: клетка ({r}, {c}) - стена")
+    return i
+
+
+def solve_query(
+    grid, query, components=None, algorithm="astar", diagonal=False, landmarks=None
+):
+    """Решает один запрос {"start": [r, c], "end": [r, c], ...} на grid.
+
+    В запросе можно переопределить "algorithm" и "diagonal"; поле "id"
+    копируется в ответ. Ошибка в запросе возвращается полем "error".
+    landmarks - словарь diagonal -> LandmarkTable для запросов alt:
+    недостающие таблицы строятся и добавляются в него, так что на одной
+    карте они строятся один раз, а не на каждый запрос. Ориентиры стоят
+    в каждой связной области, поэтому таблицы подходят запросам в любой.
+    """
+    report = {"id": query["id"]} if "id" in query else {}
+    try:
+        start = _cell(grid, query.get("start"), "start")
+        end = _cell(grid, query.get("end"), "end")
+    except ValueError as e:
+        report["error"] = str(e)
+        return report
+
+    algorithm = query.get("algorithm", algorithm)
+    diagonal = bool(query.get("diagonal", diagonal))
+    grid.set_endpoints(start, end)
+    grid.reset_search()
+    options = {}
+    if algorithm == "alt" and landmarks is not None:
+        if diagonal not in landmarks:
+            landmarks[diagonal] = LandmarkTable.build(grid, diagonal=diagonal)
+        options["landmarks"] = landmarks[diagonal]
+    try:
+        result = solve(
+            grid, algorithm, diagonal=diagonal, components=components, **options
+        )
+    except ValueError as e:
+        report["error"] = str(e)
+        return report
+
+    report.update(
+        start=list(grid.pos(start)),
+        end=list(grid.pos(end)),
+        algorithm=algorithm,
+        diagonal=diagonal,
+        found=result.found,
+        length=result.length,
+        cost=round(result.cost, 6),
+        expanded=result.expanded,
+        solve_ms=round(result.elapsed * 1000, 3),
+    )
+    if query.get("path", False):
+        report["path"] = [list(grid.pos(i)) for i in result.path]
+    return report
+
+
+def _solve_chunk(queries):
+    algorithm, diagonal, with_path = _OPTIONS
+    results = []
+    for query in queries:
+        if with_path:
+            query = {"path": True, **query}
+        results.append(
+            solve_query(_GRID, query, _COMPONENTS, algorithm, diagonal, _LANDMARKS)
+        )
+    return results
+
+
+def _chunks(queries, size):
+    chunk = []
+    for query in queries:
+        chunk.append(query)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def solve_batch(
+    maze_path,
+    queries,
+    algorithm="astar",
+    diagonal=False,
+    with_path=False,
+    workers=None,
+    chunk_size=64,
+):
+    """Генератор ответов на запросы в исходном порядке.
+
+    queries читается лениво: в работе одновременно не больше
+    2 * workers пачек по chunk_size запросов, поэтому входной поток
+    может быть сколь угодно длинным.
+    """
+    workers = workers or os.cpu_count() or 1
+    options = (algorithm, diagonal, with_path)
+    with ProcessPoolExecutor(
+        workers, initializer=_init_worker, initargs=(maze_path, options)
+    ) as pool:
+        pending = deque()
+        for chunk in _chunks(queries, chunk_size):
+            pending.append(pool.submit(_solve_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
@@ -0,0 +1,32 @@
+"""Поиск в ширину: эталонная длина кратчайшего пути для проверки A*."""
+
+import time
+from array import array
+from collections import deque
+
+from .astar import SearchResult, get_neighbors, reconstruct_path
+
+
+def bfs(grid):
+    """BFS от grid.start до grid.end (все ребра имеют вес 1)"""
+    t0 = time.perf_counter()
+    start, end = grid.start, grid.end
+    parent = array("i", [-1]) * grid.size
+    seen = bytearray(grid.size)
+    seen[start] = 1
+    queue = deque([start])
+    expanded = 0
+
+    while queue:
+        current = queue.popleft()
+        expanded += 1
+        if current == end:
+            path = reconstruct_path(parent, end)
+            return SearchResult(path, expanded, time.perf_counter() - t0)
+        for neighbor in get_neighbors(grid, current):
+            if not seen[neighbor]:
+                seen[neighbor] = 1
+                parent[neighbor] = current
+                queue.append(neighbor)
+
+    return SearchResult([], expanded, time.perf_counter() - t0)
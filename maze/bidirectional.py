@@ -0,0 +1,116 @@
+"""Двунаправленный A*: поиск одновременно от старта и от финиша.
+
+На длинных коридорных лабиринтах два фронта встречаются посередине и
+вместе раскрывают заметно меньше клеток, чем один поиск от старта.
+"""
+
+import time
+from array import array
+
+from .astar import SQRT2, SearchResult, get_neighbors, heuristic, reconstruct_path
+from .grid import CLOSED, CLOSED_REV, INF, OPEN, OPEN_REV
+from .openset import OpenSet
+
+
+def bidirectional_astar(grid, listener=None, should_stop=None, diagonal=False):
+    """Двунаправленный A* от grid.start до grid.end; интерфейс как у astar().
+
+    Оба фронта хранят g/parent в собственных массивах. Лучшая найденная длина mu обновляется при каждой встрече
+    фронтов; поиск заканчивается, когда минимальное f одного из фронтов
+    не меньше mu - более короткого пути уже быть не может. Клетки
+    обратного фронта сообщаются listener как OPEN_REV/CLOSED_REV.
+    """
+    t0 = time.perf_counter()
+    start, end = grid.start, grid.end
+    cols = grid.cols
+
+    # Оценки другой стороны читаются напрямую (g < INF - клетка достигнута),
+    # поэтому массивы с отметками поиска из grid здесь не подходят
+    g_fwd = array("d", [INF]) * grid.size
+    parent_fwd = array("i", [-1]) * grid.size
+    g_bwd = array("d", [INF]) * grid.size
+    parent_bwd = array("i", [-1]) * grid.size
+
+    # Для каждого направления: (куча, g, parent, g другой стороны, цель, состояния)
+    forward = (OpenSet(grid.size), g_fwd, parent_fwd, g_bwd, end, OPEN, CLOSED)
+    backward = (
+        OpenSet(grid.size),
+        g_bwd,
+        parent_bwd,
+        g_fwd,
+        start,
+        OPEN_REV,
+        CLOSED_REV,
+    )
+
+    for open_set, g, _, _, target, _, _ in (forward, backward):
+        source = start if target == end else end
+        g[source] = 0
+        h = heuristic(grid, source, target, diagonal)
+        open_set.push(h, h, source)
+
+    best = INF if start != end else 0
+    meet = start if start == end else -1
+    expanded = 0
+
+    while forward[0] and backward[0]:
+        if should_stop is not None and should_stop():
+            return None
+
+        # Условие остановки: ни один фронт уже не даст путь короче best
+        if forward[0].min_f() >= best or backward[0].min_f() >= best:
+            break
+
+        # Раскрываем фронт с меньшим открытым списком
+        side = forward if len(forward[0]) <= len(backward[0]) else backward
+        open_set, g, parent, g_other, target, open_state, closed_state = side
+
+        current = open_set.pop()
+        if current < 0:
+            continue
+        expanded += 1
+
+        if listener is not None and current != start and current != end:
+            listener(current, closed_state)
+
+        cur_r, cur_c = divmod(current, cols)
+        for neighbor in get_neighbors(grid, current, diagonal):
+            r, c = divmod(neighbor, cols)
+            step = SQRT2 if r != cur_r and c != cur_c else 1
+            temp_g = g[current] + step
+            if open_set.is_closed(neighbor) or temp_g >= g[neighbor]:
+                continue
+
+            first_visit = g[neighbor] == INF
+            parent[neighbor] = current
+            g[neighbor] = temp_g
+            h = heuristic(grid, neighbor, target, diagonal)
+            open_set.push(temp_g + h, h, neighbor)
+
+            # Встреча фронтов: клетка уже достигнута с другой стороны
+            if g_other[neighbor] < INF and temp_g + g_other[neighbor] < best:
+                best = temp_g + g_other[neighbor]
+                meet = neighbor
+
+            if listener is not None and first_visit and neighbor != target:
+                if g_other[neighbor] == INF:
+                    listener(neighbor, open_state)
+
+    # Счетчики обеих очередей (пик - сумма пиков, оценка сверху)
+    fwd_stats, bwd_stats = forward[0].stats(), backward[0].stats()
+    heap_stats = {key: fwd_stats[key] + bwd_stats[key] for key in fwd_stats}
+
+    t1 = time.perf_counter()
+    if meet < 0:
+        return SearchResult([], expanded, t1 - t0, heap_stats=heap_stats)
+
+    # Склейка: старт -> meet по прямым родителям, meet -> финиш по обратным
+    path = reconstruct_path(parent_fwd, meet)
+    curr = parent_bwd[meet]
+    while curr >= 0:
+        path.append(curr)
+        curr = parent_bwd[curr]
+    t2 = time.perf_counter()
+    return SearchResult(
+        path, expanded, t2 - t0, best, path_time=t2 - t1, heap_stats=heap_stats
+    )
@@ -0,0 +1,134 @@
+"""Кэш найденных путей с ключом по содержимому лабиринта.
+
+Расположение стен хешируется по схеме Зобриста: хеш - XOR случайных
+64-битных ключей всех стен, поэтому изменение одной стены обновляет его
+за O(1). Ключ клетки не хранится в таблице, а вычисляется из ее индекса
+перемешиванием splitmix64; полный пересчет с NumPy считает ключи всех
+стен сразу в uint64 (умножение в NumPy тоже идет по модулю 2**64).
+"""
+
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:  # NumPy необязателен
+    np = None
+
+_MASK = (1 << 64) - 1
+
+
+def cell_key(i):
+    """Псевдослучайный 64-битный ключ клетки i (splitmix64)"""
+    z = (i * 0x9E3779B97F4A7C15 + 0x9E3779B97F4A7C15) & _MASK
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK
+    return z ^ (z >> 31)
+
+
+def _xor_keys(walls, size):
+    """XOR ключей cell_key всех стен, splitmix64 над массивом индексов"""
+    i = np.flatnonzero(np.frombuffer(walls, dtype=np.uint8, count=size))
+    if not i.size:
+        return 0
+    z = i.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+    z += np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    z ^= z >> np.uint64(31)
+    return int(np.bitwise_xor.reduce(z))
+
+
+class WallHash:
+    """Хеш Зобриста для стен GridModel с обновлением за O(1)"""
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.rebuild()
+
+    def rebuild(self):
+        """Полный пересчет за O(rows * cols) (после загрузки или генерации)"""
+        grid = self.grid
+        if np is not None:
+            self.value = _xor_keys(grid.walls, grid.size)
+            return
+        value = 0
+        for i, wall in enumerate(grid.walls):
+            if wall:
+                value ^= cell_key(i)
+        self.value = value
+
+    def toggle(self, i):
+        """Вызывается после изменения grid.walls[i]"""
+        self.value ^= cell_key(i)
+
+
+class PathCache:
+    """LRU-кэш результатов поиска (SearchResult) ограниченного размера.
+
+    max_entries ограничивает число записей, max_cells - суммарную длину
+    хранимых путей (основной расход памяти). При превышении любого из
+    пределов вытесняются записи, которые дольше всего не использовались.
+    """
+
+    def __init__(self, max_entries=64, max_cells=1_000_000):
+        self.max_entries = max_entries
+        self.max_cells = max_cells
+        self.entries = OrderedDict()
+        self.cells = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(grid, wall_hash, algorithm, diagonal):
+        """Ключ: хеш стен, размеры, старт, финиш и настройки поиска"""
+        return (
+            wall_hash.value,
+            grid.rows,
+            grid.cols,
+            grid.start,
+            grid.end,
+            algorithm,
+            bool(diagonal),
+        )
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        result = self.entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key, result):
+        if self.max_entries <= 0 or len(result.path) > self.max_cells:
+            return
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.cells -= len(old.path)
+        self.entries[key] = result
+        self.cells += len(result.path)
+        while len(self.entries) > self.max_entries or self.cells > self.max_cells:
+            _, evicted = self.entries.popitem(last=False)
+            self.cells -= len(evicted.path)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.cells = 0
+
+    def stats(self):
+        """Счетчики попаданий и промахов"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "cells": self.cells,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,429 @@
+"""Командная строка для решения лабиринтов без GUI.
+
+Пример: python -m maze solve maze.txt --json
+"""
+
+import argparse
+import functools
+import json
+import math
+import sys
+import time
+
+
+from .batch import _cell, solve_batch
+from .bfs import bfs
+from .engines import APPROXIMATE, ENGINES, solve
+from .fileio import read_maze, write_maze
+from .flowfield import DistanceField
+from .generators import GENERATORS, generate
+from .grid import GridModel
+from .landmarks import DEFAULT_LANDMARKS, PLACEMENTS, LandmarkTable, landmarks_path
+from .stats import SearchStats, profile_call
+from .trace import SearchTrace
+
+# Лабиринты из репозитория для проверки по умолчанию
+BUNDLED_MAZES = ("labirint.txt", "labirint_66x66.txt", "maze.txt")
+
+
+def cmd_solve(args):
+    t0 = time.perf_counter()
+    grid = read_maze(args.maze)
+    load_time = time.perf_counter() - t0
+
+    # Трасса для просмотра в GUI: события поиска и клетки пути (она же listener)
+    trace = SearchTrace.for_grid(grid) if args.trace else None
+    landmarks = None
+    if args.algorithm == "alt":
+        # Таблицы ориентиров берутся из файла рядом с лабиринтом, если подходят
+        landmarks, source = LandmarkTable.for_maze(
+            args.maze, grid, args.landmarks, args.diagonal, args.placement
+        )
+        run = functools.partial(landmarks.search, grid, trace)
+    else:
+        run = functools.partial(
+            solve, grid, args.algorithm, trace, diagonal=args.diagonal
+        )
+    if args.profile:
+        result, report = profile_call(run)
+        sys.stderr.write(report)
+    else:
+        result = run()
+    if landmarks is not None and source != "file":
+        result.prep_time = landmarks.build_time
+    if trace is not None:
+        trace.add_path(result.path)
+        trace.save(args.trace)
+    path = [list(grid.pos(i)) for i in result.path]
+    stats = SearchStats.from_result(result, grid, args.algorithm, args.diagonal)
+    if args.stats_log:
+        stats.append_to(args.stats_log)
+
+    if args.json:
+        report = {
+            "file": args.maze,
+            "rows": grid.rows,
+            "cols": grid.cols,
+            "start": list(grid.start_pos),
+            "end": list(grid.end_pos),
+            "algorithm": args.algorithm,
+            "diagonal": args.diagonal,
+            "found": result.found,
+            "length": result.length,
+            "cost": round(result.cost, 6),
+            "expanded": result.expanded,
+            "load_ms": round(load_time * 1000, 3),
+            "solve_ms": round(result.elapsed * 1000, 3),
+            "prep_ms": round(result.prep_time * 1000, 3),
+            "prep_kb": round(result.prep_bytes / 1024, 1),
+            "stats": stats.to_dict(),
+            "path": path,
+        }
+        json.dump(report, sys.stdout, ensure_ascii=False)
+        sys.stdout.write("\n")
+    else:
+        print(
+            f"Лабиринт: {args.maze} ({grid.rows}x{grid.cols}), алгоритм: {args.algorithm}"
+        )
+        if result.found:
+            print(f"Путь: {result.length} шагов, стоимость {result.cost:.3f}")
+        else:
+            print("Путь не найден!")
+        print(f"Статистика: {stats.summary()}")
+        print(
+            f"Загрузка: {load_time * 1000:.1f} мс, поиск: {result.elapsed * 1000:.1f} мс"
+        )
+        if result.prep_time:
+            print(
+                f"Предобработка: {result.prep_time * 1000:.1f} мс, "
+                f"~{result.prep_bytes / 1024:.0f} КБ"
+            )
+        if landmarks is not None:
+            action = {
+                "file": "загружены из",
+                "saved": "построены и сохранены в",
+                "memory": "построены, но не сохранены в",
+            }[source]
+            print(
+                f"Ориентиры ({len(landmarks.landmarks)}): {action} "
+                f"{landmarks_path(args.maze)}"
+            )
+    return 0 if result.found else 1
+
+
+def cmd_verify(args):
+    """Сверяет пути всех алгоритмов с эталоном.
+
+    Для 4-связности эталон - длина пути BFS, для 8-связности - стоимость
+    пути A* с диагоналями. Приближенные алгоритмы (APPROXIMATE) должны
+    найти путь не короче эталона.
+    """
+    failed = 0
+    for maze_file in args.mazes or BUNDLED_MAZES:
+        checks = [(False, bfs(read_maze(maze_file)).cost)]
+        checks.append((True, solve(read_maze(maze_file), "astar", diagonal=True).cost))
+        for diagonal, expected in checks:
+            for algorithm in ENGINES:
+                result = solve(read_maze(maze_file), algorithm, diagonal=diagonal)
+                if algorithm in APPROXIMATE:
+                    ok = (
+                        result.found == (expected >= 0)
+                        and result.cost >= expected - 1e-9
+                    )
+                else:
+                    ok = math.isclose(result.cost, expected)
+                failed += not ok
+                status = "OK" if ok else "ОШИБКА"
+                mode = "8" if diagonal else "4"
+                print(
+                    f"{status:6} {maze_file} [{algorithm}, {mode}-связн.]: "
+                    f"{result.cost:.3f} (эталон {expected:.3f}), "
+                    f"раскрыто {result.expanded}"
+                )
+    return 1 if failed else 0
+
+
+def cmd_compare(args):
+    """Таблица: длина пути, раскрытые узлы и время для каждого алгоритма"""
+    rows = []
+    for maze_file in args.mazes or BUNDLED_MAZES:
+        for algorithm in args.algorithms or list(ENGINES):
+            grid = read_maze(maze_file)
+            result = solve(grid, algorithm, diagonal=args.diagonal)
+            rows.append(
+                {
+                    "file": maze_file,
+                    "algorithm": algorithm,
+                    "length": result.length,
+                    "expanded": result.expanded,
+                    "solve_ms": round(result.elapsed * 1000, 3),
+                    "prep_ms": round(result.prep_time * 1000, 3),
+                }
+            )
+
+    if args.json:
+        for row in rows:
+            print(json.dumps(row, ensure_ascii=False))
+        return 0
+
+    print(f"{'лабиринт':24} {'алгоритм':14} {'длина':>6} {'раскрыто':>9} {'мс':>9}")
+    for row in rows:
+        print(
+            f"{row['file']:24} {row['algorithm']:14} {row['length']:>6} "
+            f"{row['expanded']:>9} {row['solve_ms']:>9.2f}"
+        )
+    return 0
+
+
+def read_queries(stream):
+    """Запросы из JSONL-потока (пустые строки пропускаются)"""
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            query = json.loads(line)
+        except json.JSONDecodeError as e:
+            print(f"Строка {number}: некорректный JSON ({e})", file=sys.stderr)
+            query = {}
+        yield query if isinstance(query, dict) else {}
+
+
+def cmd_batch(args):
+    """Решает поток запросов старт/финиш пулом процессов, ответы - JSONL"""
+    stream = sys.stdin if args.queries == "-" else open(args.queries, encoding="utf-8")
+    t0 = time.perf_counter()
+    count = failed = 0
+    with stream:
+        for report in solve_batch(
+            args.maze,
+            read_queries(stream),
+            algorithm=args.algorithm,
+            diagonal=args.diagonal,
+            with_path=args.path,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+        ):
+            sys.stdout.write(json.dumps(report, ensure_ascii=False) + "\n")
+            sys.stdout.flush()
+            count += 1
+            failed += "error" in report
+    elapsed = time.perf_counter() - t0
+    print(
+        f"Запросов: {count} (ошибок: {failed}) за {elapsed:.2f} с",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+def cmd_flow(args):
+    """Поле расстояний до финиша лабиринта и ответы для потока стартов (JSONL)"""
+    grid = read_maze(args.maze)
+    field = DistanceField(grid, args.diagonal)
+    print(
+        f"Поле расстояний {grid.rows}x{grid.cols} построено "
+        f"за {field.build_time * 1000:.1f} мс",
+        file=sys.stderr,
+    )
+    stream = sys.stdin if args.starts == "-" else open(args.starts, encoding="utf-8")
+    failed = 0
+    with stream:
+        for query in read_queries(stream):
+            report = {"id": query["id"]} if "id" in query else {}
+            try:
+                start = _cell(grid, query.get("start"), "start")
+            except ValueError as e:
+                report["error"] = str(e)
+                failed += 1
+            else:
+                dist = field.distance(start)
+                step = field.next_step(start)
+                report.update(
+                    start=list(grid.pos(start)),
+                    found=dist >= 0,
+                    cost=round(dist, 6),
+                    next=list(grid.pos(step)) if step >= 0 else None,
+                )
+                if args.path or query.get("path", False):
+                    report["path"] = [list(grid.pos(i)) for i in field.path(start)]
+            sys.stdout.write(json.dumps(report, ensure_ascii=False) + "\n")
+    return 1 if failed else 0
+
+
+def cmd_convert(args):
+    """Перевод лабиринта между текстовым и двоичным (.mazb) форматами"""
+    t0 = time.perf_counter()
+    try:
+        grid = read_maze(args.source)
+        t1 = time.perf_counter()
+        write_maze(grid, args.target)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    t2 = time.perf_counter()
+    print(
+        f"{args.source} -> {args.target} ({grid.rows}x{grid.cols}): "
+        f"чтение {(t1 - t0) * 1000:.1f} мс, запись {(t2 - t1) * 1000:.1f} мс"
+    )
+    return 0
+
+
+def cmd_generate(args):
+    """Генерирует лабиринт и сохраняет его (формат по расширению)"""
+    grid = GridModel(args.rows, args.cols)
+    t0 = time.perf_counter()
+    try:
+        seed = generate(grid, args.kind, args.seed, args.density)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - t0
+    write_maze(grid, args.target)
+    print(
+        f"{args.target}: {args.kind} {grid.rows}x{grid.cols}, зерно {seed}, "
+        f"генерация {elapsed * 1000:.1f} мс"
+    )
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m maze", description="Поиск пути в лабиринте без GUI"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_solve = sub.add_parser("solve", help="найти путь от S до E")
+    p_solve.add_argument(
+        "maze", help="файл лабиринта (S - старт, E - финиш, # - стена)"
+    )
+    p_solve.add_argument(
+        "--algorithm", choices=sorted(ENGINES), default="astar", help="алгоритм поиска"
+    )
+    p_solve.add_argument(
+        "--diagonal", action="store_true", help="разрешить ходы по диагонали"
+    )
+    p_solve.add_argument("--json", action="store_true", help="вывод в формате JSON")
+    p_solve.add_argument(
+        "--stats-log", metavar="FILE", help="дописать статистику запуска в JSONL"
+    )
+    p_solve.add_argument(
+        "--profile", action="store_true", help="выполнить поиск под cProfile"
+    )
+    p_solve.add_argument(
+        "--trace", metavar="FILE", help="записать трассу поиска (.mztr) для просмотра"
+    )
+    p_solve.add_argument(
+        "--landmarks",
+        type=int,
+        default=DEFAULT_LANDMARKS,
+        help="число ориентиров для --algorithm alt",
+    )
+    p_solve.add_argument(
+        "--placement",
+        choices=PLACEMENTS,
+        default="farthest",
+        help="расстановка ориентиров: самые далекие клетки или край карты",
+    )
+    p_solve.set_defaults(func=cmd_solve)
+
+    p_verify = sub.add_parser("verify", help="сверить пути всех алгоритмов с эталоном")
+    p_verify.add_argument(
+        "mazes", nargs="*", help="файлы лабиринтов (по умолчанию - из репозитория)"
+    )
+    p_verify.set_defaults(func=cmd_verify)
+
+    p_compare = sub.add_parser(
+        "compare", help="сравнить раскрытые узлы и время разных алгоритмов"
+    )
+    p_compare.add_argument(
+        "mazes", nargs="*", help="файлы лабиринтов (по умолчанию - из репозитория)"
+    )
+    p_compare.add_argument(
+        "--algorithm",
+        dest="algorithms",
+        action="append",
+        choices=sorted(ENGINES),
+        help="алгоритм (можно указать несколько раз, по умолчанию - все)",
+    )
+    p_compare.add_argument(
+        "--diagonal", action="store_true", help="разрешить ходы по диагонали"
+    )
+    p_compare.add_argument("--json", action="store_true", help="вывод в формате JSONL")
+    p_compare.set_defaults(func=cmd_compare)
+
+    p_batch = sub.add_parser(
+        "batch", help="решить поток запросов старт/финиш (JSONL) пулом процессов"
+    )
+    p_batch.add_argument("maze", help="файл лабиринта")
+    p_batch.add_argument(
+        "queries",
+        nargs="?",
+        default="-",
+        help='JSONL с запросами {"start": [r, c], "end": [r, c]} (по умолчанию stdin)',
+    )
+    p_batch.add_argument(
+        "--algorithm", choices=sorted(ENGINES), default="astar", help="алгоритм поиска"
+    )
+    p_batch.add_argument(
+        "--diagonal", action="store_true", help="разрешить ходы по диагонали"
+    )
+    p_batch.add_argument("--path", action="store_true", help="выводить сами пути")
+    p_batch.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="число процессов (по умолчанию - ядра)",
+    )
+    p_batch.add_argument(
+        "--chunk-size", type=int, default=64, help="запросов в одной задаче процесса"
+    )
+    p_batch.set_defaults(func=cmd_batch)
+
+    p_flow = sub.add_parser(
+        "flow", help="поле расстояний до финиша: ответы для множества стартов"
+    )
+    p_flow.add_argument("maze", help="файл лабиринта (цель - клетка E)")
+    p_flow.add_argument(
+        "starts",
+        nargs="?",
+        default="-",
+        help='JSONL со стартами {"start": [r, c]} (по умолчанию stdin)',
+    )
+    p_flow.add_argument(
+        "--diagonal", action="store_true", help="разрешить ходы по диагонали"
+    )
+    p_flow.add_argument("--path", action="store_true", help="выводить сами пути")
+    p_flow.set_defaults(func=cmd_flow)
+
+    p_convert = sub.add_parser(
+        "convert", help="перевести лабиринт между текстовым и двоичным форматами"
+    )
+    p_convert.add_argument("source", help="исходный файл")
+    p_convert.add_argument(
+        "target", help="файл результата (формат по расширению: .mazb - двоичный)"
+    )
+    p_convert.set_defaults(func=cmd_convert)
+
+    p_generate = sub.add_parser("generate", help="сгенерировать лабиринт")
+    p_generate.add_argument(
+        "target", help="файл результата (формат по расширению: .mazb - двоичный)"
+    )
+    p_generate.add_argument(
+        "--kind", choices=list(GENERATORS), default="backtracker", help="генератор"
+    )
+    p_generate.add_argument("--rows", type=int, default=101, help="число строк")
+    p_generate.add_argument("--cols", type=int, default=101, help="число столбцов")
+    p_generate.add_argument(
+        "--seed", type=int, default=None, help="зерно (по умолчанию - случайное)"
+    )
+    p_generate.add_argument(
+        "--density", type=float, default=0.3, help="плотность стен или комнат"
+    )
+    p_generate.set_defaults(func=cmd_generate)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,289 @@
+"""Разметка связных областей свободных клеток.
+
+После разметки вопрос "есть ли вообще путь от A до B" решается за O(1):
+клетки в разных областях не соединены. Диагональные ходы без срезания
+углов связность не меняют, поэтому достаточно 4-связной разметки.
+
+Полная разметка с NumPy идет по отрезкам строк: подряд идущие свободные
+клетки строки - один отрезок, отрезки соседних строк, касающиеся по
+вертикали, соединены ребром, и связные области графа отрезков ищутся
+раундами слияния (как в алгоритме Борувки) над всеми ребрами сразу.
+Без NumPy - обход в глубину по клеткам.
+"""
+
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy необязателен
+    np = None
+
+# Кольцо из 8 соседей по часовой стрелке: (dr, dc, прямой ли сосед)
+_RING = (
+    (-1, 0, True),
+    (-1, 1, False),
+    (0, 1, True),
+    (1, 1, False),
+    (1, 0, True),
+    (1, -1, False),
+    (0, -1, True),
+    (-1, -1, False),
+)
+
+
+class ComponentIndex:
+    """Метки связных областей с инкрементальным обновлением при правке стен.
+
+    labels[i] - номер области клетки (-1 для стены). Слияние областей
+    (убрали стену) - объединение меток через alias, как в union-find.
+    Разрез области (поставили стену) проверяется по кольцу соседей; если
+    разрез возможен, область помечается грязной и переразмечается заливкой
+    только при следующем запросе.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.rebuild()
+
+    def rebuild(self):
+        """Полная разметка за O(rows * cols)"""
+        grid = self.grid
+        self.dirty = {}  # метка -> клетки-затравки для переразметки
+        if np is not None:
+            labels, count = _label_runs(grid.walls, grid.rows, grid.cols)
+            self.labels = array("i", labels.tobytes())
+            self.alias = list(range(count))
+        else:
+            self._rebuild_dfs()
+
+    def _rebuild_dfs(self):
+        """Разметка обходом в глубину (без NumPy)"""
+        grid = self.grid
+        rows, cols = grid.rows, grid.cols
+        walls = grid.walls
+        labels = array("i", [-1]) * grid.size
+        self.labels = labels
+        self.alias = []
+
+        for seed in range(grid.size):
+            if walls[seed] or labels[seed] >= 0:
+                continue
+            label = len(self.alias)
+            self.alias.append(label)
+            labels[seed] = label
+            stack = [seed]
+            while stack:
+                i = stack.pop()
+                r, c = divmod(i, cols)
+                if c + 1 < cols and not walls[i + 1] and labels[i + 1] < 0:
+                    labels[i + 1] = label
+                    stack.append(i + 1)
+                if c > 0 and not walls[i - 1] and labels[i - 1] < 0:
+                    labels[i - 1] = label
+                    stack.append(i - 1)
+                if r + 1 < rows and not walls[i + cols] and labels[i + cols] < 0:
+                    labels[i + cols] = label
+                    stack.append(i + cols)
+                if r > 0 and not walls[i - cols] and labels[i - cols] < 0:
+                    labels[i - cols] = label
+                    stack.append(i - cols)
+
+    @property
+    def count(self):
+        """Число различных областей (полный проход по сетке, для отладки)"""
+        self.resolve()
+        return len({self.find(label) for label in set(self.labels) if label >= 0})
+
+    def find(self, label):
+        alias = self.alias
+        root = label
+        while alias[root] != root:
+            root = alias[root]
+        # Сжатие пути
+        while alias[label] != root:
+            alias[label], label = root, alias[label]
+        return root
+
+    def component(self, i):
+        """Номер области клетки i (-1 для стены)"""
+        label = self.labels[i]
+        if label < 0:
+            return -1
+        root = self.find(label)
+        if root in self.dirty:
+            self.resolve()
+            root = self.find(self.labels[i])
+        return root
+
+    def connected(self, a, b):
+        """Есть ли путь между клетками a и b"""
+        ca = self.component(a)
+        return ca >= 0 and ca == self.component(b)
+
+    # --- Инкрементальные обновления ---
+    def on_wall_changed(self, i):
+        """Вызывается после изменения grid.walls[i]"""
+        if self.grid.walls[i]:
+            self._add_wall(i)
+        else:
+            self._remove_wall(i)
+
+    def _free_neighbors(self, i):
+        grid = self.grid
+        r, c = divmod(i, grid.cols)
+        result = []
+        for dr, dc, straight in _RING:
+            if straight and grid.in_bounds(r + dr, c + dc):
+                j = i + dr * grid.cols + dc
+                if not grid.walls[j]:
+                    result.append(j)
+        return result
+
+    def _remove_wall(self, i):
+        """Клетка стала свободной: сливаем области всех соседей"""
+        if self.labels[i] >= 0:
+            return
+        roots = {self.find(self.labels[j]) for j in self._free_neighbors(i)}
+        if not roots:
+            label = len(self.alias)
+            self.alias.append(label)
+            self.labels[i] = label
+            return
+        target = min(roots)
+        for root in roots:
+            self.alias[root] = target
+            # Грязная область остается грязной и после слияния
+            if root in self.dirty and root != target:
+                self.dirty.setdefault(target, []).extend(self.dirty.pop(root))
+        self.labels[i] = target
+
+    def _add_wall(self, i):
+        """Клетка стала стеной: область может распасться на части"""
+        label = self.labels[i]
+        if label < 0:
+            return
+        self.labels[i] = -1
+        root = self.find(label)
+        neighbors = self._free_neighbors(i)
+        # В уже грязной области затравки нужны всегда: стена могла занять
+        # старую затравку одной из частей
+        if root in self.dirty or (len(neighbors) > 1 and self._may_split(i)):
+            self.dirty.setdefault(root, []).extend(neighbors)
+
+    def _may_split(self, i):
+        """Проверка по кольцу из 8 соседей: связаны ли прямые соседи в обход i.
+
+        Соседние клетки кольца смежны по стороне, поэтому прямые соседи
+        из одной непрерывной дуги свободных клеток точно связаны.
+        """
+        grid = self.grid
+        r, c = divmod(i, grid.cols)
+        free = [
+            grid.in_bounds(r + dr, c + dc) and not grid.walls[i + dr * grid.cols + dc]
+            for dr, dc, _ in _RING
+        ]
+        if all(free):
+            return False
+
+        arcs = 0
+        for k in range(8):
+            if free[k] and not free[k - 1]:
+                # Начало дуги: идем до первой занятой клетки
+                j, has_straight = k, False
+                while free[j % 8]:
+                    has_straight = has_straight or _RING[j % 8][2]
+                    j += 1
+                arcs += has_straight
+        return arcs > 1
+
+    def resolve(self):
+        """Переразмечает грязные области заливкой от сохраненных затравок"""
+        if not self.dirty:
+            return
+        grid = self.grid
+        rows, cols = grid.rows, grid.cols
+        walls = grid.walls
+        labels = self.labels
+        dirty, self.dirty = self.dirty, {}
+        for seeds in dirty.values():
+            fresh = set()
+            for seed in seeds:
+                if walls[seed] or labels[seed] in fresh:
+                    continue
+                label = len(self.alias)
+                self.alias.append(label)
+                fresh.add(label)
+                labels[seed] = label
+                stack = [seed]
+                while stack:
+                    j = stack.pop()
+                    r, c = divmod(j, cols)
+                    for k, ok in (
+                        (j + 1, c + 1 < cols),
+                        (j - 1, c > 0),
+                        (j + cols, r + 1 < rows),
+                        (j - cols, r > 0),
+                    ):
+                        if ok and not walls[k] and labels[k] not in fresh:
+                            labels[k] = label
+                            stack.append(k)
+
+
+def _label_runs(walls, rows, cols):
+    """Метки областей массивами NumPy: (int32-массив меток клеток, число меток).
+
+    Ребра графа отрезков нумеруются, и каждая область в раунде выбирает
+    ребро наружу с наименьшим номером: так циклов из выбранных ребер длиннее
+    двух не бывает, взаимный выбор решается в пользу меньшей метки, цепочки
+    сжимаются удвоением указателей. Каждая область с ребром наружу
+    сливается хотя бы с одной, поэтому раундов - O(log числа отрезков).
+    """
+    size = rows * cols
+    free = np.frombuffer(walls, dtype=np.uint8, count=size) == 0
+    starts = free.copy()
+    starts.reshape(rows, cols)[:, 1:] &= ~free.reshape(rows, cols)[:, :-1]
+    run = np.cumsum(starts, dtype=np.int32) - 1
+    count = int(run[-1]) + 1 if size else 0
+
+    # Вертикальные ребра между отрезками; одинаковые подряд - одно ребро
+    below = free[:-cols] & free[cols:]
+    u, v = run[:-cols][below], run[cols:][below]
+    if u.size:
+        keep = np.ones(u.size, dtype=bool)
+        keep[1:] = (u[1:] != u[:-1]) | (v[1:] != v[:-1])
+        u, v = u[keep], v[keep]
+
+    # comp - область отрезка, cu и cv - области концов ребер между областями
+    m = u.size
+    comp = np.arange(count, dtype=np.int32)
+    edges = np.arange(m, dtype=np.int32)
+    cu, cv = u, v
+    while edges.size:
+        best = np.full(count, m, dtype=np.int32)
+        np.minimum.at(best, cu, edges)
+        np.minimum.at(best, cv, edges)
+        labels = np.arange(count, dtype=np.int32)
+        parent = labels.copy()
+        joined = best < m
+        edge = best[joined]
+        a = comp[u[edge]]
+        parent[joined] = np.where(a == labels[joined], comp[v[edge]], a)
+        mutual = (parent[parent] == labels) & (labels < parent)
+        parent[mutual] = labels[mutual]
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+
+        roots = parent == labels
+        relabel = (np.cumsum(roots, dtype=np.int32) - 1)[parent]
+        count = int(np.count_nonzero(roots))
+        comp = relabel[comp]
+        cu, cv = relabel[cu], relabel[cv]
+        cross = cu != cv
+        edges, cu, cv = edges[cross], cu[cross], cv[cross]
+
+    labels = np.full(size, -1, dtype=np.int32)
+    labels[free] = comp[run[free]]
+    return labels, count
@@ -0,0 +1,66 @@
+"""Реестр алгоритмов поиска с общим интерфейсом.
+
+Каждый движок вызывается как engine(grid, listener, should_stop, diagonal=...)
+и возвращает SearchResult (или None, если поиск прерван). Некоторые движки
+принимают и свои параметры (alt - готовые таблицы landmarks), solve()
+передает их именованными аргументами.
+"""
+
+import time
+
+from .astar import SearchResult, astar
+from .bidirectional import bidirectional_astar
+from .hpa import hpa
+from .jps import jps
+from .landmarks import alt
+from .lpastar import lpa_star
+from .wavefront import wavefront
+
+ENGINES = {
+    "astar": astar,
+    "jps": jps,
+    "bidirectional": bidirectional_astar,
+    "lpa": lpa_star,
+    "hpa": hpa,
+    "alt": alt,
+    "wavefront": wavefront,
+}
+
+ENGINE_TITLES = {
+    "astar": "A*",
+    "jps": "JPS",
+    "bidirectional": "A* (2 стороны)",
+    "lpa": "LPA*",
+    "hpa": "HPA* (кластеры)",
+    "alt": "A* + ориентиры (ALT)",
+    "wavefront": "Волна (NumPy)",
+}
+
+# Алгоритмы, которые находят путь, но не обязательно кратчайший
+APPROXIMATE = {"hpa"}
+
+
+def solve(
+    grid,
+    algorithm="astar",
+    listener=None,
+    should_stop=None,
+    diagonal=False,
+    components=None,
+    **options,
+):
+    """Запускает выбранный алгоритм по имени из ENGINES.
+
+    Если передан ComponentIndex и старт с финишем в разных областях,
+    поиск не запускается вовсе - пустой результат возвращается за O(1).
+    options передаются движку как есть.
+    """
+    try:
+        engine = ENGINES[algorithm]
+    except KeyError:
+        raise ValueError(f"Неизвестный алгоритм: {algorithm}") from None
+    if components is not None:
+        t0 = time.perf_counter()
+        if not components.connected(grid.start, grid.end):
+            return SearchResult([], 0, time.perf_counter() - t0)
+    return engine(grid, listener, should_stop, diagonal=diagonal, **options)
@@ -0,0 +1,242 @@
+"""Чтение и запись лабиринтов.
+
+Текстовый формат: S - старт, E - финиш, # - стена. Двоичный (.mazb):
+заголовок и один бит на клетку. Оба формата хранят grid.meta (генератор,
+зерно, плотность) строкой "ключ=значение ...": в тексте - строкой
+комментария "; ..." перед картой, в .mazb (версия 2) - после заголовка.
+"""
+
+import mmap
+import os
+import struct
+
+from .grid import GridModel
+
+WALL_CHAR = ord("#")
+COMMENT_CHAR = b";"
+
+# Таблицы для bytes.translate: символ -> стена (0/1) и обратно
+_WALL_TABLE = bytes(1 if b == WALL_CHAR else 0 for b in range(256))
+_CHAR_TABLE = bytes(WALL_CHAR if b else ord(".") for b in range(256))
+
+
+def read_text(file_path):
+    """Загружает лабиринт из текстового файла в GridModel.
+
+    Файл читается построчно: стены каждой строки сразу дописываются
+    в общий bytearray, весь текст в памяти не собирается. Строки
+    комментария "; ..." допустимы только перед первой строкой карты.
+    """
+    walls = bytearray()
+    rows = cols = 0
+    start = end = -1
+    meta = {}
+    with open(file_path, "rb") as f:
+        for raw in f:
+            line = raw.strip()
+            if not line:
+                continue
+            if line.startswith(COMMENT_CHAR):
+                if rows:
+                    raise ValueError(
+                        f"Строка {rows + 1} карты: комментарий «;» "
+                        "допустим только перед картой."
+                    )
+                meta.update(_parse_meta(line[1:]))
+                continue
+            if not line.isascii():
+                # Многобайтовые символы: одна клетка на символ, а не на байт
+                text = line.decode("utf-8")
+                line = "".join(ch if ch in "#SE" else "." for ch in text).encode()
+            if rows == 0:
+                cols = len(line)
+            elif len(line) != cols:
+                raise ValueError(
+                    "Лабиринт должен быть прямоугольным (все строки одинаковой длины)."
+                )
+            # Если букв несколько, берется последняя
+            if (c := line.rfind(b"S")) >= 0:
+                start = rows * cols + c
+            if (c := line.rfind(b"E")) >= 0:
+                end = rows * cols + c
+            # Остальное (кроме '#') считается пустым местом
+            walls += line.translate(_WALL_TABLE)
+            rows += 1
+
+    if rows == 0:
+        raise ValueError("Файл не содержит лабиринта.")
+    # Если старт или финиш не найдены в файле, ставим по умолчанию
+    if start < 0:
+        start = 0
+    if end < 0:
+        end = rows * cols - 1
+    grid = _make_grid(rows, cols, start, end, walls)
+    grid.meta = meta
+    return grid
+
+
+def _make_grid(rows, cols, start, end, walls):
+    grid = GridModel(rows, cols, divmod(start, cols), divmod(end, cols))
+    # Массивы g/parent уже свежие, достаточно скопировать стены в состояния
+    grid.walls = walls
+    grid.state[:] = walls
+    grid.set_endpoints(start, end)
+    return grid
+
+
+def write_text(grid, file_path):
+    """Сохраняет GridModel в текстовый файл (строки пишутся пачкой).
+
+    Старт и финиш в одной клетке текст не передает (в клетке одна буква),
+    поэтому такая карта не сохраняется - ValueError.
+    """
+    if grid.start == grid.end:
+        raise ValueError(
+            "Старт и финиш в одной клетке нельзя сохранить в текстовый формат."
+        )
+    chars = bytearray(grid.walls.translate(_CHAR_TABLE))
+    chars[grid.start] = ord("S")
+    chars[grid.end] = ord("E")
+
+    cols = grid.cols
+    view = memoryview(chars)
+    with open(file_path, "wb") as f:
+        if grid.meta:
+            f.write(COMMENT_CHAR + b" " + _format_meta(grid.meta) + b"\n")
+        f.writelines(
+            part
+            for r in range(grid.rows)
+            for part in (view[r * cols : (r + 1) * cols], b"\n")
+        )
+
+
+def _format_meta(meta):
+    """grid.meta строкой "ключ=значение" через пробел (ASCII)"""
+    return " ".join(f"{key}={value}" for key, value in meta.items()).encode("ascii")
+
+
+def _parse_meta(text):
+    """Обратное к _format_meta: числа возвращаются числами"""
+    meta = {}
+    for item in text.decode("ascii", "replace").split():
+        key, sep, value = item.partition("=")
+        if not sep:
+            continue
+        for convert in (int, float):
+            try:
+                value = convert(value)
+                break
+            except ValueError:
+                pass
+        meta[key] = value
+    return meta
+
+
+# --- ДВОИЧНЫЙ ФОРМАТ ---
+# Заголовок: сигнатура, версия, rows, cols, индексы старта и финиша и
+# (с версии 2) длина строки grid.meta; дальше сама строка и по одному биту
+# на клетку (построчно, младший бит - первая клетка)
+BINARY_SUFFIX = ".mazb"
+BINARY_MAGIC = b"MAZB"
+BINARY_VERSION = 2
+_HEADER_V1 = struct.Struct("<4sB3xIIII")
+_HEADER = struct.Struct("<4sB3xIIIII")
+
+
+def _ones(n):
+    """Целое, в котором каждый из n байтов равен 1"""
+    return int.from_bytes(b"\x01" * n, "little")
+
+
+def pack_bits(flags):
+    """Упаковывает байты 0/1 по одному биту (младший бит - первый байт)"""
+    n = (len(flags) + 7) // 8
+    # Бит i числа bits - флаг i
+    bits = 0
+    for k in range(8):
+        bits |= int.from_bytes(flags[k::8], "little") << k
+    return bits.to_bytes(n, "little")
+
+
+def unpack_bits(buf, offset, size):
+    """Обратное к pack_bits: size байтов 0/1 из буфера начиная с offset.
+
+    Биты распаковываются операциями над длинным целым и срезами с шагом
+    (по одному срезу на позицию бита), без цикла по клеткам.
+    """
+    n = (size + 7) // 8
+    with memoryview(buf)[offset : offset + n] as payload:
+        bits = int.from_bytes(payload, "little")
+    flags = bytearray(size)
+    ones = _ones(n)
+    for k in range(8):
+        plane = ((bits >> k) & ones).to_bytes(n, "little")
+        flags[k::8] = plane[: len(range(k, size, 8))]
+    return flags
+
+
+def read_binary(file_path):
+    """Загружает лабиринт из двоичного файла через mmap"""
+    with open(file_path, "rb") as f, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mm:
+        if len(mm) < _HEADER_V1.size:
+            raise ValueError("Файл слишком короткий для двоичного лабиринта.")
+        magic, version = _HEADER_V1.unpack_from(mm)[:2]
+        if magic != BINARY_MAGIC or version not in (1, BINARY_VERSION):
+            raise ValueError("Неизвестный формат двоичного лабиринта.")
+        if version == 1:
+            _, _, rows, cols, start, end = _HEADER_V1.unpack_from(mm)
+            offset, meta = _HEADER_V1.size, b""
+        else:
+            if len(mm) < _HEADER.size:
+                raise ValueError("Файл слишком короткий для двоичного лабиринта.")
+            _, _, rows, cols, start, end, meta_len = _HEADER.unpack_from(mm)
+            offset = _HEADER.size + meta_len
+            meta = mm[_HEADER.size : offset]
+        size = rows * cols
+        n = (size + 7) // 8
+        if size == 0 or len(mm) < offset + n:
+            raise ValueError("Двоичный лабиринт поврежден или обрезан.")
+        if not (0 <= start < size and 0 <= end < size):
+            raise ValueError("Старт или финиш вне лабиринта.")
+        walls = unpack_bits(mm, offset, size)
+    grid = _make_grid(rows, cols, start, end, walls)
+    grid.meta = _parse_meta(meta)
+    return grid
+
+
+def write_binary(grid, file_path):
+    """Сохраняет GridModel в двоичный формат (1 бит на клетку)"""
+    meta = _format_meta(grid.meta)
+    header = _HEADER.pack(
+        BINARY_MAGIC,
+        BINARY_VERSION,
+        grid.rows,
+        grid.cols,
+        grid.start,
+        grid.end,
+        len(meta),
+    )
+    with open(file_path, "wb") as f:
+        f.write(header)
+        f.write(meta)
+        f.write(pack_bits(grid.walls))
+
+
+# --- ВЫБОР ФОРМАТА ПО РАСШИРЕНИЮ ---
+def is_binary(file_path):
+    return os.path.splitext(file_path)[1].lower() == BINARY_SUFFIX
+
+
+def read_maze(file_path):
+    """Загружает лабиринт в текстовом или двоичном (.mazb) формате"""
+    return read_binary(file_path) if is_binary(file_path) else read_text(file_path)
+
+
+def write_maze(grid, file_path):
+    """Сохраняет лабиринт в формате, заданном расширением файла"""
+    if is_binary(file_path):
+        write_binary(grid, file_path)
+    else:
+        write_text(grid, file_path)
@@ -0,0 +1,224 @@
+"""Поле расстояний до цели (flow field) для множества стартов.
+
+Один обратный обход от grid.end по всей сетке дает расстояние до цели
+для каждой клетки. После этого для любого старта длина пути и следующий
+шаг читаются за O(1), а весь путь - за O(длины пути): из клетки всегда
+идем в соседа, который ближе к цели. Правка стены пересчитывает только
+клетки, расстояние которых от нее зависит.
+"""
+
+import heapq
+import time
+from array import array
+from collections import deque
+
+from .astar import SQRT2, SearchResult, get_neighbors
+
+# Допуск сравнения расстояний с диагоналями (сумма весов sqrt(2))
+EPS = 1e-9
+
+
+class DistanceField:
+    """Расстояния до grid.end: dist[i] (-1 - стена или цель недостижима).
+
+    Без диагоналей поле - array('i') числа шагов (обход в ширину), с
+    диагоналями - array('d') стоимостей (Дейкстра, вес диагонали sqrt(2)).
+    Явно заданная goal закрепляет цель; без нее поле следует за grid.end.
+    """
+
+    def __init__(self, grid, diagonal=False, goal=None):
+        self.grid = grid
+        self.diagonal = diagonal
+        self.follow_end = goal is None
+        self.goal = grid.end if goal is None else goal
+        self.build_time = 0.0
+        self.build()
+
+    def build(self):
+        """Полный пересчет поля от текущей цели"""
+        t0 = time.perf_counter()
+        grid = self.grid
+        if self.follow_end:
+            self.goal = grid.end
+        if self.diagonal:
+            self.dist = array("d", [-1.0]) * grid.size
+            self.dist[self.goal] = 0.0
+            self._relax([(0.0, self.goal)])
+        else:
+            self.dist = array("i", [-1]) * grid.size
+            self._bfs()
+        # Масштаб тепловой карты: наибольшее расстояние на момент построения
+        self.scale = max(max(self.dist), 1)
+        self.build_time = time.perf_counter() - t0
+
+    def _bfs(self):
+        """Обход в ширину от цели без вызова функций на каждую клетку"""
+        grid = self.grid
+        rows, cols = grid.rows, grid.cols
+        walls, dist = grid.walls, self.dist
+        dist[self.goal] = 0
+        queue = deque([self.goal])
+        pop, push = queue.popleft, queue.append
+        while queue:
+            i = pop()
+            d = dist[i] + 1
+            r, c = divmod(i, cols)
+            if c + 1 < cols and not walls[i + 1] and dist[i + 1] < 0:
+                dist[i + 1] = d
+                push(i + 1)
+            if c > 0 and not walls[i - 1] and dist[i - 1] < 0:
+                dist[i - 1] = d
+                push(i - 1)
+            if r + 1 < rows and not walls[i + cols] and dist[i + cols] < 0:
+                dist[i + cols] = d
+                push(i + cols)
+            if r > 0 and not walls[i - cols] and dist[i - cols] < 0:
+                dist[i - cols] = d
+                push(i - cols)
+
+    def _cost(self, a, b):
+        cols = self.grid.cols
+        return SQRT2 if a % cols != b % cols and a // cols != b // cols else 1
+
+    def _relax(self, heap):
+        """Дейкстра от клеток heap = [(расстояние, клетка)].
+
+        Уменьшает расстояния, пока это возможно; возвращает измененные клетки.
+        """
+        grid, dist, diagonal = self.grid, self.dist, self.diagonal
+        heapq.heapify(heap)
+        changed = []
+        while heap:
+            d, i = heapq.heappop(heap)
+            if d > dist[i] + EPS:
+                continue
+            changed.append(i)
+            for j in get_neighbors(grid, i, diagonal):
+                nd = d + self._cost(i, j)
+                if dist[j] < 0 or nd < dist[j] - EPS:
+                    dist[j] = nd
+                    heapq.heappush(heap, (nd, j))
+        return changed
+
+    # --- Запросы ---
+    def distance(self, i):
+        """Стоимость пути от клетки i до цели (-1 - пути нет)"""
+        return self.dist[i]
+
+    def next_step(self, i):
+        """Следующая клетка пути к цели (-1 - i сама цель или пути нет)"""
+        dist = self.dist
+        d = dist[i]
+        if d <= 0:
+            return -1
+        for j in get_neighbors(self.grid, i, self.diagonal):
+            if dist[j] >= 0 and abs(dist[j] + self._cost(i, j) - d) < EPS:
+                return j
+        return -1
+
+    def path(self, start):
+        """Путь от start до цели: список индексов (пустой, если пути нет)"""
+        if self.dist[start] < 0:
+            return []
+        path = [start]
+        while path[-1] != self.goal:
+            path.append(self.next_step(path[-1]))
+        return path
+
+    def search(self, start=None):
+        """Путь от start (по умолчанию grid.start) как SearchResult"""
+        t0 = time.perf_counter()
+        path = self.path(self.grid.start if start is None else start)
+        cost = self.dist[path[0]] if path else None
+        return SearchResult(
+            path, len(path), time.perf_counter() - t0, cost, prep_time=self.build_time
+        )
+
+    # --- Изменения стен ---
+    def _around(self, i):
+        """Клетка i и ее соседи 3x3 (в них меняются ребра графа)"""
+        grid = self.grid
+        r, c = divmod(i, grid.cols)
+        return [
+            grid.index(rr, cc)
+            for rr in range(r - 1, r + 2)
+            for cc in range(c - 1, c + 2)
+            if grid.in_bounds(rr, cc)
+        ]
+
+    def on_wall_changed(self, i):
+        """Чинит поле после правки стены в клетке i; возвращает измененные клетки.
+
+        Сначала снимаются расстояния, которые больше ничем не подкреплены
+        (в порядке возрастания, как в обратном обходе), затем они и
+        окрестность правки заново досчитываются Дейкстрой от соседей.
+        """
+        if self.follow_end and self.grid.end != self.goal:
+            self.build()
+            return range(self.grid.size)
+
+        grid, dist = self.grid, self.dist
+        region = self._around(i)
+        if grid.walls[i]:
+            dist[i] = -1
+        affected = self._invalidate(region)
+
+        # Затравки - лучшие значения от подкрепленных соседей
+        heap = []
+        for v in set(affected) | set(region):
+            if grid.walls[v] or v == self.goal:
+                continue
+            best = dist[v]
+            for u in get_neighbors(grid, v, self.diagonal):
+                if dist[u] >= 0:
+                    nd = dist[u] + self._cost(u, v)
+                    if best < 0 or nd < best - EPS:
+                        best = nd
+            if best >= 0:
+                dist[v] = best
+                heap.append((best, v))
+        changed = self._relax(heap)
+        return [i] + affected + changed
+
+    def _invalidate(self, candidates):
+        """Сбрасывает в -1 клетки, расстояние которых больше не подкреплено.
+
+        Клетка подкреплена, если у нее есть сосед с расстоянием ровно на
+        вес ребра меньше. Кандидаты проверяются по возрастанию расстояния,
+        снятая клетка делает кандидатами своих соседей.
+        """
+        grid, dist, goal = self.grid, self.dist, self.goal
+        heap = [(dist[v], v) for v in candidates if dist[v] > 0 and v != goal]
+        heapq.heapify(heap)
+        affected = []
+        while heap:
+            d, v = heapq.heappop(heap)
+            if dist[v] != d:
+                continue
+            supported = False
+            for u in get_neighbors(grid, v, self.diagonal):
+                if dist[u] >= 0 and abs(dist[u] + self._cost(u, v) - d) < EPS:
+                    supported = True
+                    break
+            if supported:
+                continue
+            dist[v] = -1
+            affected.append(v)
+            for x in get_neighbors(grid, v, self.diagonal):
+                if dist[x] > 0 and x != goal:
+                    heapq.heappush(heap, (dist[x], x))
+        return affected
+
+    # --- Тепловая карта ---
+    def levels(self, cells=None):
+        """Уровни тепловой карты 1..255 (0 - стена или недостижимо).
+
+        Без cells - bytearray на всю сетку, иначе - байты для клеток cells.
+        """
+        dist, scale = self.dist, self.scale
+        if cells is None:
+            cells = range(len(dist))
+        return bytearray(
+            0 if dist[i] < 0 else 1 + min(254, int(dist[i] * 254 / scale))
+            for i in cells
+        )
@@ -0,0 +1,295 @@
+"""Генераторы лабиринтов с воспроизводимым зерном (seed).
+
+Каждый генератор заполняет grid.walls целиком и записывает в grid.meta,
+чем и с каким зерном построена карта: повторный вызов с тем же зерном
+дает ту же карту (NumPy и запасной путь без него дают разные карты).
+Шум и лабиринт Прима строятся массовыми операциями NumPy; без NumPy -
+random.randbytes + bytes.translate и плотные циклы по плоским bytearray.
+Поиск в глубину (backtracker) последователен по своей природе и
+векторизации не поддается, поэтому размер его карт ограничен.
+"""
+
+import itertools
+import random
+
+try:
+    import numpy as np
+except ImportError:  # NumPy необязателен
+    np = None
+
+# Наибольшее число клеток для backtracker: цикл Python по клеткам решетки
+# укладывается здесь примерно в 0.35 с (1000x1000), на 2000x2000 - уже 1.7 с
+BACKTRACKER_MAX_CELLS = 1_000_000
+
+
+def noise(grid, rng, density=0.3):
+    """Случайные стены с заданной плотностью"""
+    size = grid.size
+    if np is not None:
+        gen = np.random.default_rng(rng.getrandbits(64))
+        return bytearray((gen.random(size) < density).view(np.uint8).tobytes())
+    # Без NumPy: случайный байт < порога (плотность с шагом 1/256)
+    threshold = round(density * 256)
+    table = bytes(1 if b < threshold else 0 for b in range(256))
+    return bytearray(rng.randbytes(size).translate(table))
+
+
+def _lattice(grid):
+    """Решетка клеток-комнат в четных строках и столбцах.
+
+    Возвращает (метки, ширина строки меток, шаги, (h, w)): метки решетки
+    хранятся с рамкой из единиц, поэтому соседей не нужно проверять на
+    выход за границы. Шаг - пара (сдвиг в решетке, сдвиг в сетке).
+    """
+    h, w = (grid.rows + 1) // 2, (grid.cols + 1) // 2
+    stride = w + 2
+    marks = bytearray(b"\x01") * ((h + 2) * stride)
+    for r in range(1, h + 1):
+        marks[r * stride + 1 : r * stride + 1 + w] = bytes(w)
+    cols = grid.cols
+    steps = ((1, 2), (-1, -2), (stride, 2 * cols), (-stride, -2 * cols))
+    return marks, stride, steps, (h, w)
+
+
+def _cell_index(cell, stride, cols):
+    """Индекс клетки сетки для клетки решетки (с учетом рамки)"""
+    r, c = divmod(cell, stride)
+    return (r - 1) * 2 * cols + (c - 1) * 2
+
+
+def backtracker(grid, rng, density=None):
+    """Лабиринт поиском в глубину с возвратом (длинные извилистые коридоры)"""
+    visited, stride, steps, (h, w) = _lattice(grid)
+    cols = grid.cols
+    walls = bytearray(b"\x01") * grid.size
+    orders = list(itertools.permutations(steps))
+    rand = rng.random
+
+    r, c = divmod(rng.randrange(h * w), w)
+    cell = (r + 1) * stride + c + 1
+    gi = _cell_index(cell, stride, cols)
+    visited[cell] = 1
+    walls[gi] = 0
+    # Стек пар (клетка решетки, клетка сетки)
+    stack = [(cell, gi)]
+    while stack:
+        cell, gi = stack[-1]
+        # Соседей перебираем в случайном из 24 порядков до первого свободного
+        for d, gd in orders[int(rand() * 24)]:
+            if not visited[cell + d]:
+                break
+        else:
+            stack.pop()
+            continue
+        cell += d
+        visited[cell] = 1
+        walls[gi + gd // 2] = 0
+        walls[gi + gd] = 0
+        stack.append((cell, gi + gd))
+    return walls
+
+
+def prim(grid, rng, density=None):
+    """Лабиринт рандомизированным алгоритмом Прима (много коротких тупиков).
+
+    С NumPy строится то же дерево, что дал бы алгоритм Прима на случайных
+    весах ребер решетки (см. _spanning_tree), без NumPy - Прим со случайным
+    выбором клетки фронта.
+    """
+    if np is not None:
+        return _carve(grid, *_spanning_tree(grid, rng))
+    # 0 - не тронута, 1 - в рамке или во фронте, 2 - в лабиринте
+    mark, stride, steps, (h, w) = _lattice(grid)
+    cols = grid.cols
+    walls = bytearray(b"\x01") * grid.size
+    rand = rng.random
+
+    r, c = divmod(rng.randrange(h * w), w)
+    cell = (r + 1) * stride + c + 1
+    mark[cell] = 2
+    walls[_cell_index(cell, stride, cols)] = 0
+    frontier = []
+    for d, _ in steps:
+        if not mark[cell + d]:
+            mark[cell + d] = 1
+            frontier.append(cell + d)
+
+    while frontier:
+        # Случайный элемент фронта: меняем с последним и снимаем за O(1)
+        k = int(rand() * len(frontier))
+        frontier[k], frontier[-1] = frontier[-1], frontier[k]
+        cell = frontier.pop()
+        r, c = divmod(cell, stride)
+        gi = (r - 1) * 2 * cols + (c - 1) * 2
+        inside = [gd for d, gd in steps if mark[cell + d] == 2]
+        gd = inside[int(rand() * len(inside))] if len(inside) > 1 else inside[0]
+        walls[gi] = 0
+        walls[gi + gd // 2] = 0
+        mark[cell] = 2
+        for d, _ in steps:
+            if not mark[cell + d]:
+                mark[cell + d] = 1
+                frontier.append(cell + d)
+    return walls
+
+
+def _spanning_tree(grid, rng):
+    """Минимальное остовное дерево решетки со случайными весами ребер.
+
+    Веса различны, поэтому дерево единственно: его же дали бы Прим и
+    Краскал. Строится алгоритмом Борувки, где каждый раунд - несколько
+    операций NumPy над всеми ребрами: каждая компонента выбирает самое
+    легкое ребро наружу, компоненты сливаются по выбранным ребрам (взаимный
+    выбор - корень с меньшим номером, затем удвоение указателей), метки
+    сжимаются до 0..k-1. Компонент каждый раунд хотя бы вдвое меньше.
+    Возвращает (u, v) - концы ребер дерева, номера клеток решетки r * w + c.
+    """
+    h, w = (grid.rows + 1) // 2, (grid.cols + 1) // 2
+    ids = np.arange(h * w, dtype=np.int32).reshape(h, w)
+    horizontal = ids[:, :-1].ravel()
+    vertical = ids[:-1, :].ravel()
+    u = np.concatenate([horizontal, vertical])
+    v = np.concatenate([horizontal + 1, vertical + w])
+    m = u.size
+    weight = np.random.default_rng(rng.getrandbits(64)).permutation(m)
+    weight = weight.astype(np.int32)
+    edge_of = np.empty(m, dtype=np.int32)
+    edge_of[weight] = np.arange(m, dtype=np.int32)
+    in_tree = np.zeros(m, dtype=bool)
+
+    # comp - компонента клетки, cu и cv - компоненты концов ребер между
+    # разными компонентами (решетка связна, так что ребро наружу есть у всех)
+    comp = ids.ravel()
+    cu, cv = u, v
+    count = h * w
+    while weight.size:
+        best = np.full(count, m, dtype=np.int32)
+        np.minimum.at(best, cu, weight)
+        np.minimum.at(best, cv, weight)
+        edge = edge_of[best]
+        in_tree[edge] = True
+
+        labels = np.arange(count, dtype=np.int32)
+        a = comp[u[edge]]
+        parent = np.where(a == labels, comp[v[edge]], a)
+        mutual = (parent[parent] == labels) & (labels < parent)
+        parent[mutual] = labels[mutual]
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+
+        roots = parent == labels
+        relabel = (np.cumsum(roots, dtype=np.int32) - 1)[parent]
+        count = int(np.count_nonzero(roots))
+        comp = relabel[comp]
+        cu, cv = relabel[cu], relabel[cv]
+        cross = cu != cv
+        weight, cu, cv = weight[cross], cu[cross], cv[cross]
+    return u[in_tree], v[in_tree]
+
+
+def _carve(grid, u, v):
+    """Стены сетки по ребрам решетки: клетки решетки и середины ребер свободны"""
+    rows, cols = grid.rows, grid.cols
+    w = (cols + 1) // 2
+    walls = np.ones((rows, cols), dtype=np.uint8)
+    walls[::2, ::2] = 0
+    ur, uc = np.divmod(u, w)
+    vr, vc = np.divmod(v, w)
+    walls.ravel()[(ur + vr) * cols + uc + vc] = 0
+    return bytearray(walls.tobytes())
+
+
+def rooms(grid, rng, density=0.3):
+    """Прямоугольные комнаты, соединенные Г-образными коридорами.
+
+    density задает долю площади под комнатами. Комнаты и коридоры
+    вырезаются присваиванием срезов, без цикла по клеткам.
+    """
+    rows, cols = grid.rows, grid.cols
+    walls = bytearray(b"\x01") * grid.size
+    randint = rng.randint
+    max_side = max(3, min(rows, cols) // 6)
+
+    centers = [grid.start]
+    area = 0
+    target = density * grid.size
+    attempts = 0
+    while area < target and attempts < 10000:
+        attempts += 1
+        rh, rw = randint(2, max_side), randint(2, max_side)
+        if rh >= rows or rw >= cols:
+            break
+        r0, c0 = randint(0, rows - rh), randint(0, cols - rw)
+        zeros = bytes(rw)
+        for r in range(r0, r0 + rh):
+            walls[r * cols + c0 : r * cols + c0 + rw] = zeros
+        area += rh * rw
+        centers.append((r0 + rh // 2) * cols + c0 + rw // 2)
+    centers.append(grid.end)
+
+    # Коридоры между комнатами по порядку: сначала по строке, потом по столбцу
+    for a, b in zip(centers, centers[1:]):
+        ar, ac = divmod(a, cols)
+        br, bc = divmod(b, cols)
+        lo, hi = min(ac, bc), max(ac, bc)
+        walls[ar * cols + lo : ar * cols + hi + 1] = bytes(hi - lo + 1)
+        lo, hi = min(ar, br), max(ar, br)
+        walls[lo * cols + bc : hi * cols + bc + 1 : cols] = bytes(hi - lo + 1)
+    return walls
+
+
+GENERATORS = {
+    "noise": noise,
+    "backtracker": backtracker,
+    "prim": prim,
+    "rooms": rooms,
+}
+
+GENERATOR_TITLES = {
+    "noise": "Случайные стены",
+    "backtracker": "Лабиринт (DFS)",
+    "prim": "Лабиринт (Прим)",
+    "rooms": "Комнаты и коридоры",
+}
+
+
+def _connect(walls, cols, i):
+    """Соединяет клетку с ближайшей клеткой решетки (четные строка и столбец)"""
+    r, c = divmod(i, cols)
+    for j in (i, (r - r % 2) * cols + c, (r - r % 2) * cols + c - c % 2):
+        walls[j] = 0
+
+
+def generate(grid, kind="noise", seed=None, density=0.3):
+    """Строит стены генератором kind и сбрасывает поиск.
+
+    Без seed зерно выбирается случайно; оно записывается в
+    grid.meta вместе с именем генератора и возвращается. Для backtracker
+    на карте больше BACKTRACKER_MAX_CELLS клеток - ValueError.
+    """
+    try:
+        generator = GENERATORS[kind]
+    except KeyError:
+        raise ValueError(f"Неизвестный генератор: {kind}") from None
+    if kind == "backtracker" and grid.size > BACKTRACKER_MAX_CELLS:
+        raise ValueError(
+            f"backtracker строит карты до {BACKTRACKER_MAX_CELLS} клеток; "
+            f"для {grid.rows}x{grid.cols} выберите prim"
+        )
+    if seed is None:
+        seed = random.randrange(2**32)
+
+    walls = generator(grid, random.Random(seed), density)
+    if kind in ("backtracker", "prim"):
+        _connect(walls, grid.cols, grid.start)
+        _connect(walls, grid.cols, grid.end)
+    grid.walls = walls
+    grid.set_endpoints(grid.start, grid.end)
+    grid.reset_search(full=True)
+    grid.meta = {"generator": kind, "seed": seed}
+    if kind in ("noise", "rooms"):
+        grid.meta["density"] = density
+    return seed
@@ -0,0 +1,213 @@
+"""Компактная модель сетки: плоские массивы вместо словаря объектов Node.
+
+Клетка (r, c) адресуется одним целым индексом ``r * cols + c``.
+
+Сброс между запусками не проходит по всей сетке. g и parent клетки
+действительны, только если stamp[i] равен номеру текущего поиска
+(generation), так что новый поиск объявляет их устаревшими за O(1).
+Клетки, которые показ поиска перекрасил, собираются в touched, и при
+сбросе восстанавливаются только они.
+"""
+
+from array import array
+
+# --- КОДЫ СОСТОЯНИЙ КЛЕТОК ---
+# Значение WALL совпадает с единицей в массиве стен, поэтому
+# визуальное состояние можно восстановить простым копированием walls.
+# OPEN_REV/CLOSED_REV - фронт обратного поиска двунаправленного A*.
+EMPTY, WALL, START, END, OPEN, CLOSED, PATH, OPEN_REV, CLOSED_REV = range(9)
+STATE_NAMES = (
+    "empty",
+    "wall",
+    "start",
+    "end",
+    "open",
+    "closed",
+    "path",
+    "open_rev",
+    "closed_rev",
+)
+STATE_CODES = {name: code for code, name in enumerate(STATE_NAMES)}
+
+INF = float("inf")
+# Наибольший номер поиска в array('I'); дальше отметки обнуляются
+MAX_GENERATION = 2**32 - 1
+
+
+class GridModel:
+    """Стены, состояния, g-стоимости и родители в плоских массивах.
+
+    touched - клетки, перекрашенные показом поиска со времени сброса
+    (None - их слишком много, сброс будет полным).
+    """
+
+    def __init__(self, rows, cols, start_pos=(0, 0), end_pos=None):
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+
+        self.walls = bytearray(self.size)  # 1 - стена, 0 - проход
+        self.state = bytearray(self.size)  # коды из STATE_NAMES
+        self.g = array("d", [INF]) * self.size
+        self.parent = array("i", [-1]) * self.size
+        self.stamp = array("I", [0]) * self.size
+        self.generation = 0
+        self.touched = array("i")
+
+        if end_pos is None:
+            end_pos = (rows - 1, cols - 1)
+        self.start = self.index(*start_pos)
+        self.end = self.index(*end_pos)
+        self.state[self.start] = START
+        self.state[self.end] = END
+        # Происхождение карты (генератор, зерно и т.п., см. maze.generators)
+        self.meta = {}
+
+    # --- Адресация ---
+    def index(self, r, c):
+        return r * self.cols + c
+
+    def pos(self, i):
+        return divmod(i, self.cols)
+
+    def in_bounds(self, r, c):
+        return 0 <= r < self.rows and 0 <= c < self.cols
+
+    @property
+    def start_pos(self):
+        return self.pos(self.start)
+
+    @property
+    def end_pos(self):
+        return self.pos(self.end)
+
+    # --- Редактирование ---
+    def is_endpoint(self, i):
+        return i == self.start or i == self.end
+
+    def set_wall(self, i, value):
+        """Ставит или убирает стену (старт и финиш не трогаем)"""
+        if self.is_endpoint(i):
+            return
+        self.walls[i] = 1 if value else 0
+        self.state[i] = WALL if value else EMPTY
+
+    def set_endpoints(self, start, end):
+        """Переносит старт и финиш на новые индексы"""
+        for i in (self.start, self.end):
+            self.state[i] = WALL if self.walls[i] else EMPTY
+        self.start, self.end = start, end
+        for i, code in ((start, START), (end, END)):
+            self.walls[i] = 0
+            self.state[i] = code
+
+    def begin_search(self):
+        """Новый номер поиска: g и parent всех клеток устаревают за O(1).
+
+        Движки, пишущие в g/parent, вызывают его в начале и отмечают
+        каждую записанную клетку: stamp[i] = номер поиска.
+        """
+        self.generation += 1
+        if self.generation > MAX_GENERATION:
+            self.stamp = array("I", [0]) * self.size
+            self.generation = 1
+        return self.generation
+
+    def touch(self, cells):
+        """Запоминает клетки, состояние которых изменил показ поиска"""
+        touched = self.touched
+        if touched is None:
+            return
+        # Дальше полный сброс копированием стен дешевле поклеточного
+        if len(touched) + len(cells) > self.size // 8:
+            self.touched = None
+        else:
+            touched.extend(cells)
+
+    def reset_search(self, keep_walls=True, full=False):
+        """Сброс g/parent и визуальных состояний поиска.
+
+        Восстанавливаются только клетки из touched, если их немного;
+        full=True (после замены стен целиком) сбрасывает все. Возвращает
+        восстановленные клетки или None, если сброс был полным.
+        """
+        touched = self.touched
+        self.touched = array("i")
+        if not keep_walls:
+            self.walls = bytearray(self.size)
+        if touched is None or full or not keep_walls:
+            touched = None
+            self.state[:] = self.walls
+        else:
+            state, walls = self.state, self.walls
+            for i in touched:
+                state[i] = walls[i]
+        self.state[self.start] = START
+        self.state[self.end] = END
+        self.begin_search()
+        return touched
+
+    # --- Совместимость со старым API ---
+    def node(self, r, c):
+        if not self.in_bounds(r, c):
+            return None
+        return Node(self, self.index(r, c))
+
+
+class Node:
+    """Тонкое представление клетки поверх GridModel (только там, где нужен объект)"""
+
+    __slots__ = ("grid", "index")
+
+    def __init__(self, grid, index):
+        self.grid = grid
+        self.index = index
+
+    @property
+    def row(self):
+        return self.index // self.grid.cols
+
+    @property
+    def col(self):
+        return self.index % self.grid.cols
+
+    @property
+    def is_wall(self):
+        return bool(self.grid.walls[self.index])
+
+    @is_wall.setter
+    def is_wall(self, value):
+        self.grid.set_wall(self.index, value)
+
+    @property
+    def state(self):
+        return STATE_NAMES[self.grid.state[self.index]]
+
+    @state.setter
+    def state(self, name):
+        self.grid.state[self.index] = STATE_CODES[name]
+        self.grid.touch((self.index,))
+
+    @property
+    def _current(self):
+        """g и parent клетки записаны последним поиском"""
+        return self.grid.stamp[self.index] == self.grid.generation
+
+    @property
+    def g_cost(self):
+        return self.grid.g[self.index] if self._current else INF
+
+    @property
+    def parent(self):
+        p = self.grid.parent[self.index] if self._current else -1
+        return Node(self.grid, p) if p >= 0 else None
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, Node)
+            and other.grid is self.grid
+            and other.index == self.index
+        )
+
+    def __hash__(self):
+        return hash(self.index)
@@ -0,0 +1,344 @@
+"""Иерархический поиск пути HPA* для очень больших карт.
+
+Сетка делится на квадратные кластеры. На общей границе соседних кластеров
+выбираются входы (пары свободных клеток по разные стороны границы), а
+внутри кластера считаются расстояния между его входами. Поиск идет сначала
+по этому абстрактному графу, и только найденные отрезки пути уточняются
+поиском по клеткам внутри одного кластера.
+
+Данные кластера строятся лениво, при первом обращении к нему, и хранятся
+до изменения стен: правка стены сбрасывает только свой кластер (и соседа,
+если клетка лежит на общей границе). Путь получается близким к
+кратчайшему, но не обязательно кратчайшим.
+"""
+
+import heapq
+import sys
+import time
+from collections import deque
+
+from .astar import SQRT2, SearchResult, get_neighbors, heuristic
+from .grid import CLOSED, INF, OPEN
+
+# Ширина участка границы, начиная с которой вход ставится на обоих концах
+WIDE_ENTRANCE = 6
+
+
+class HPAGraph:
+    """Абстрактный граф кластеров поверх GridModel.
+
+    _clusters[k] - смежность входов кластера k: {клетка: [(клетка, цена)]},
+    включая переходы в соседние кластеры. _borders[(k1, k2)] - пары клеток
+    входов на границе кластеров k1 < k2.
+    """
+
+    def __init__(self, grid, cluster_size=16, diagonal=False):
+        self.grid = grid
+        self.cluster_size = cluster_size
+        self.diagonal = diagonal
+        self.cluster_cols = -(-grid.cols // cluster_size)
+        self.cluster_rows = -(-grid.rows // cluster_size)
+        self._clusters = {}
+        self._borders = {}
+        self._bytes = {}
+        # Суммарное время построения кластеров (отдельно от времени поиска)
+        self.prep_time = 0.0
+
+    # --- Кластеры ---
+    def cluster_of(self, i):
+        r, c = divmod(i, self.grid.cols)
+        size = self.cluster_size
+        return (r // size) * self.cluster_cols + c // size
+
+    def _bounds(self, k):
+        """Границы кластера k: (r0, c0, r1, c1), r1 и c1 не включительно"""
+        size = self.cluster_size
+        cr, cc = divmod(k, self.cluster_cols)
+        r0, c0 = cr * size, cc * size
+        return r0, c0, min(r0 + size, self.grid.rows), min(c0 + size, self.grid.cols)
+
+    def _adjacent(self, k):
+        """Соседние по стороне кластеры"""
+        cr, cc = divmod(k, self.cluster_cols)
+        if cc + 1 < self.cluster_cols:
+            yield k + 1
+        if cc > 0:
+            yield k - 1
+        if cr + 1 < self.cluster_rows:
+            yield k + self.cluster_cols
+        if cr > 0:
+            yield k - self.cluster_cols
+
+    def _border(self, k1, k2):
+        """Входы на общей границе кластеров k1 < k2 (с кэшированием)"""
+        pairs = self._borders.get((k1, k2))
+        if pairs is not None:
+            return pairs
+
+        grid = self.grid
+        cols, walls = grid.cols, grid.walls
+        r0, c0, r1, c1 = self._bounds(k1)
+        if k1 // self.cluster_cols == k2 // self.cluster_cols:
+            # Вертикальная граница: клетки последнего столбца k1 и первого k2
+            line = [(r * cols + c1 - 1, r * cols + c1) for r in range(r0, r1)]
+        else:
+            line = [((r1 - 1) * cols + c, r1 * cols + c) for c in range(c0, c1)]
+
+        pairs = []
+        run = []
+        for a, b in line + [(-1, -1)]:
+            if a >= 0 and not walls[a] and not walls[b]:
+                run.append((a, b))
+                continue
+            if len(run) >= WIDE_ENTRANCE:
+                pairs += [run[0], run[-1]]
+            elif run:
+                pairs.append(run[len(run) // 2])
+            run = []
+        self._borders[(k1, k2)] = pairs
+        return pairs
+
+    def _cluster(self, k):
+        """Смежность входов кластера k (строится при первом обращении)"""
+        adj = self._clusters.get(k)
+        if adj is not None:
+            return adj
+
+        t0 = time.perf_counter()
+        adj = {}
+        for other in self._adjacent(k):
+            lo, hi = min(k, other), max(k, other)
+            for a, b in self._border(lo, hi):
+                inner, outer = (a, b) if lo == k else (b, a)
+                adj.setdefault(inner, []).append((outer, 1))
+
+        # Расстояния между входами - поиском внутри кластера от каждого входа
+        nodes = list(adj)
+        for n, source in enumerate(nodes):
+            dist, _ = self._local_search(source, k)
+            for target in nodes[n + 1 :]:
+                d = dist.get(target)
+                if d is not None:
+                    adj[source].append((target, d))
+                    adj[target].append((source, d))
+
+        self._clusters[k] = adj
+        self._bytes[k] = sys.getsizeof(adj) + sum(
+            sys.getsizeof(edges) + len(edges) * 64 for edges in adj.values()
+        )
+        self.prep_time += time.perf_counter() - t0
+        return adj
+
+    def _local_search(self, source, k, target=-1):
+        """Дейкстра (BFS без диагоналей) от source, не выходящая за кластер k.
+
+        Возвращает (dist, parent) - словари по клеткам кластера;
+        при заданном target останавливается, дойдя до него.
+        """
+        grid = self.grid
+        cols = grid.cols
+        r0, c0, r1, c1 = self._bounds(k)
+        diagonal = self.diagonal
+        dist = {source: 0}
+        parent = {source: -1}
+        if not diagonal:
+            # Единичные веса: обход в ширину дает те же расстояния
+            queue = deque([source])
+            while queue:
+                u = queue.popleft()
+                if u == target:
+                    break
+                d = dist[u] + 1
+                for v in get_neighbors(grid, u):
+                    if v not in dist and r0 <= v // cols < r1 and c0 <= v % cols < c1:
+                        dist[v] = d
+                        parent[v] = u
+                        queue.append(v)
+            return dist, parent
+
+        heap = [(0, source)]
+        done = set()
+        while heap:
+            d, u = heapq.heappop(heap)
+            if u in done:
+                continue
+            done.add(u)
+            if u == target:
+                break
+            ur, uc = divmod(u, cols)
+            for v in get_neighbors(grid, u, diagonal):
+                vr, vc = divmod(v, cols)
+                if not (r0 <= vr < r1 and c0 <= vc < c1):
+                    continue
+                nd = d + (SQRT2 if vr != ur and vc != uc else 1)
+                if nd < dist.get(v, INF):
+                    dist[v] = nd
+                    parent[v] = u
+                    heapq.heappush(heap, (nd, v))
+        return dist, parent
+
+    # --- Изменения стен ---
+    def on_wall_changed(self, i):
+        """Сбрасывает данные кластера клетки i (и соседа через границу)"""
+        size = self.cluster_size
+        r, c = divmod(i, self.grid.cols)
+        k = self.cluster_of(i)
+        self._drop(k)
+        touched = []
+        if c % size == 0 and c > 0:
+            touched.append(k - 1)
+        if c % size == size - 1 and c + 1 < self.grid.cols:
+            touched.append(k + 1)
+        if r % size == 0 and r > 0:
+            touched.append(k - self.cluster_cols)
+        if r % size == size - 1 and r + 1 < self.grid.rows:
+            touched.append(k + self.cluster_cols)
+        for other in touched:
+            self._borders.pop((min(k, other), max(k, other)), None)
+            self._drop(other)
+
+    def _drop(self, k):
+        self._clusters.pop(k, None)
+        self._bytes.pop(k, None)
+
+    def build(self):
+        """Строит все кластеры сразу (вместо ленивого построения)"""
+        for k in range(self.cluster_rows * self.cluster_cols):
+            self._cluster(k)
+
+    def stats(self):
+        """Размер построенной части графа и оценка занятой памяти"""
+        return {
+            "clusters": len(self._clusters),
+            "nodes": sum(len(adj) for adj in self._clusters.values()),
+            "edges": sum(
+                len(edges) for adj in self._clusters.values() for edges in adj.values()
+            ),
+            "prep_ms": round(self.prep_time * 1000, 3),
+            "memory_kb": round(sum(self._bytes.values()) / 1024, 1),
+        }
+
+    # --- Поиск ---
+    def search(self, listener=None, should_stop=None):
+        """Путь от grid.start до grid.end; интерфейс результата как у astar().
+
+        Входы кластеров, раскрытые абстрактным поиском, сообщаются listener
+        как открытые и закрытые клетки. Время построения кластеров во время
+        поиска не входит в elapsed и записывается в result.prep_time.
+        """
+        t0 = time.perf_counter()
+        prep0 = self.prep_time
+        grid = self.grid
+        start, end = grid.start, grid.end
+        diagonal = self.diagonal
+        k_start, k_end = self.cluster_of(start), self.cluster_of(end)
+
+        # Ребра от старта к входам его кластера и от входов кластера финиша
+        # к финишу (вход старта может совпадать с самим стартом)
+        start_dist, _ = self._local_search(start, k_start)
+        start_edges = [
+            (n, start_dist[n]) for n in self._cluster(k_start) if n in start_dist
+        ]
+        end_dist, _ = self._local_search(end, k_end)
+        to_end = {n: end_dist[n] for n in self._cluster(k_end) if n in end_dist}
+        if k_start == k_end and start in end_dist:
+            start_edges.append((end, end_dist[start]))
+
+        g = {start: 0}
+        parent = {start: -1}
+        closed = set()
+        # (f, h, g, клетка): при равных f раньше раскрывается более близкая к цели
+        h = heuristic(grid, start, end, diagonal)
+        heap = [(h, h, 0, start)]
+        pushes = 1
+        pops = 0
+        expanded = 0
+        while heap:
+            if should_stop is not None and should_stop():
+                return None
+            _, _, d, u = heapq.heappop(heap)
+            pops += 1
+            if u in closed:
+                continue
+            closed.add(u)
+            expanded += 1
+            if u == end:
+                break
+            if listener is not None and u != start:
+                listener(u, CLOSED)
+
+            if u == start:
+                edges = list(start_edges)
+                edges += [
+                    e
+                    for e in self._cluster(k_start).get(u, ())
+                    if self.cluster_of(e[0]) != k_start
+                ]
+            else:
+                edges = list(self._cluster(self.cluster_of(u))[u])
+            if u in to_end:
+                edges.append((end, to_end[u]))
+
+            for v, cost in edges:
+                nd = d + cost
+                if v in closed or nd >= g.get(v, INF):
+                    continue
+                first_visit = v not in g
+                g[v] = nd
+                parent[v] = u
+                h = heuristic(grid, v, end, diagonal)
+                heapq.heappush(heap, (nd + h, h, nd, v))
+                pushes += 1
+                if listener is not None and first_visit and v != end:
+                    listener(v, OPEN)
+
+        prep = self.prep_time - prep0
+        elapsed = time.perf_counter() - t0 - prep
+        heap_stats = {"pushes": pushes, "pops": pops, "stale_pops": pops - expanded}
+        if end not in closed:
+            return SearchResult(
+                [], expanded, elapsed, prep_time=prep, heap_stats=heap_stats
+            )
+
+        abstract = [end]
+        while parent[abstract[-1]] >= 0:
+            abstract.append(parent[abstract[-1]])
+        abstract.reverse()
+
+        t1 = time.perf_counter()
+        path = self.refine(abstract)
+        path_time = time.perf_counter() - t1
+        return SearchResult(
+            path,
+            expanded,
+            elapsed + path_time,
+            g[end],
+            prep_time=prep,
+            prep_bytes=sum(self._bytes.values()),
+            path_time=path_time,
+            heap_stats=heap_stats,
+        )
+
+    def refine(self, abstract):
+        """Разворачивает абстрактный путь в клетки.
+
+        Переходы между кластерами - соседние клетки, отрезки внутри
+        кластера уточняются поиском только в этом кластере.
+        """
+        path = [abstract[0]]
+        for a, b in zip(abstract, abstract[1:]):
+            k = self.cluster_of(a)
+            if k != self.cluster_of(b):
+                path.append(b)
+                continue
+            _, parent = self._local_search(a, k, b)
+            segment = [b]
+            while parent[segment[-1]] != a:
+                segment.append(parent[segment[-1]])
+            path.extend(reversed(segment))
+        return path
+
+
+def hpa(grid, listener=None, should_stop=None, diagonal=False, cluster_size=16):
+    """Разовый запуск HPA* с общим интерфейсом движков (см. maze.engines)"""
+    return HPAGraph(grid, cluster_size, diagonal).search(listener, should_stop)
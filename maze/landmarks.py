@@ -0,0 +1,353 @@
+"""Эвристика A* по ориентирам (ALT: A*, Landmarks, Triangle inequality).
+
+В извилистых лабиринтах манхэттенское расстояние сильно занижает длину
+пути, и A* раскрывает почти всю карту, как Дейкстра. ALT заранее считает
+расстояния от нескольких клеток-ориентиров L до всех клеток. По
+неравенству треугольника d(v, t) >= |d(L, t) - d(L, v)|, и максимум этой
+оценки по ориентирам (и манхэттенского расстояния) - согласованная
+эвристика, заметно более точная в коридорах.
+
+Ориентиры ставятся в каждой связной области карты (не меньше MIN_AREA
+клеток): расстояния из другой области бесконечны и запросу ничего не
+дают. Области не пересекаются, поэтому ориентиры одного раунда - по
+одному на область - помещаются в одну таблицу и считаются одним обходом.
+
+Таблицы расстояний можно сохранить рядом с файлом лабиринта (.mzlm) и
+загрузить при повторных запросах к той же карте: файл содержит хеш стен
+(WallHash) и подходит только к той карте, для которой построен.
+"""
+
+import os
+import struct
+import sys
+import time
+from array import array
+
+from .astar import DIAGONAL_EXTRA, astar
+from .cache import WallHash
+from .components import ComponentIndex
+from .flowfield import DistanceField
+
+LANDMARKS_SUFFIX = ".mzlm"
+LANDMARKS_MAGIC = b"MZLM"
+LANDMARKS_VERSION = 2
+# Сигнатура, версия, rows, cols, хеш стен, диагонали, расстановка,
+# запрошенное число ориентиров на область, число таблиц и число ориентиров
+_HEADER = struct.Struct("<4sB3xIIQBBHHI")
+
+PLACEMENTS = ("farthest", "border")
+DEFAULT_LANDMARKS = 8
+# Сколько лучших для запроса ориентиров участвует в эвристике
+ACTIVE_LANDMARKS = 4
+# Области меньше этого числа клеток остаются без ориентиров: в них A* и
+# с манхэттенской эвристикой раскрывает мало клеток
+MIN_AREA = 64
+
+
+class LandmarkTable:
+    """Ориентиры и расстояния от них до всех клеток.
+
+    tables[k][i] - расстояние до клетки i от k-го ориентира ее области
+    (-1 - стена или в области нет k-го ориентира); array('i') без
+    диагоналей и array('d') с диагоналями. landmarks - все ориентиры
+    подряд, в каждой области их не больше count. walls_key -
+    WallHash.value карты, на которой построены таблицы.
+    """
+
+    def __init__(
+        self,
+        rows,
+        cols,
+        walls_key,
+        diagonal=False,
+        placement="farthest",
+        count=DEFAULT_LANDMARKS,
+    ):
+        self.rows = rows
+        self.cols = cols
+        self.walls_key = walls_key
+        self.diagonal = diagonal
+        self.placement = placement
+        self.count = count
+        self.landmarks = []
+        self.tables = []
+        self.build_time = 0.0
+
+    @classmethod
+    def build(
+        cls,
+        grid,
+        count=DEFAULT_LANDMARKS,
+        diagonal=False,
+        placement="farthest",
+        walls_key=None,
+    ):
+        """Выбирает до count ориентиров в каждой области и считает таблицы.
+
+        farthest - каждый следующий ориентир в клетке области, самой
+        далекой от уже выбранных (первый - от старта или от первой клетки
+        области); border - клетки области на краю карты, равномерно по
+        его обходу (области без клеток на краю - как farthest).
+        """
+        if placement not in PLACEMENTS:
+            raise ValueError(f"Неизвестная расстановка ориентиров: {placement}")
+        t0 = time.perf_counter()
+        if walls_key is None:
+            walls_key = WallHash(grid).value
+        table = cls(grid.rows, grid.cols, walls_key, diagonal, placement, count)
+        labels = ComponentIndex(grid).labels
+        areas = _areas(labels)
+        if areas:
+            table._place(grid, count, labels, areas)
+        table.build_time = time.perf_counter() - t0
+        return table
+
+    def _place(self, grid, count, labels, areas):
+        """Раунды расстановки: в каждом по ориентиру на область и таблица"""
+        if self.placement == "border":
+            rings = _border(grid, count, labels, areas)
+        else:
+            rings = {}
+        start = labels[grid.start]
+        seeds = [grid.start if label == start else areas[label][0] for label in areas]
+        nearest = self._distances(grid, seeds)
+        for k in range(count):
+            picks = []
+            for label, cells in areas.items():
+                ring = rings.get(label)
+                if ring:
+                    if k < len(ring):
+                        picks.append(ring[k])
+                    continue
+                far = max(cells, key=nearest.__getitem__)
+                if nearest[far] > 0:
+                    picks.append(far)
+            if not picks:
+                break
+            dist = self._distances(grid, picks)
+            self.landmarks.extend(picks)
+            self.tables.append(dist)
+            nearest = array(dist.typecode, map(min, nearest, dist))
+
+    def _distances(self, grid, sources):
+        """Расстояния от ближайшего из sources (не больше одного на область)"""
+        field = DistanceField(grid, self.diagonal, goal=sources[0])
+        dist = field.dist
+        for i in sources[1:]:
+            # Область i еще не затронута - обход дописывает только ее
+            field.goal = i
+            if self.diagonal:
+                dist[i] = 0.0
+                field._relax([(0.0, i)])
+            else:
+                field._bfs()
+        return dist
+
+    def matches(self, grid, walls_key, diagonal):
+        """Подходят ли таблицы к карте grid с хешем стен walls_key"""
+        return (
+            self.rows == grid.rows
+            and self.cols == grid.cols
+            and self.walls_key == walls_key
+            and self.diagonal == diagonal
+        )
+
+    @property
+    def nbytes(self):
+        return sum(t.itemsize * len(t) for t in self.tables)
+
+    # --- Эвристика ---
+    def estimate(self, grid, end):
+        """Функция h(i) для astar(estimate=...): оценка расстояния до end.
+
+        Берутся ACTIVE_LANDMARKS ориентиров с наибольшей оценкой от старта
+        до финиша - остальные для этого запроса почти ничего не добавляют.
+        """
+        start = grid.start
+        bounds = []
+        for dist in self.tables:
+            d_end = dist[end]
+            if d_end >= 0 and dist[start] >= 0:
+                bounds.append((abs(d_end - dist[start]), dist, d_end))
+        bounds.sort(key=lambda b: b[0], reverse=True)
+        active = [(dist, d_end) for _, dist, d_end in bounds[:ACTIVE_LANDMARKS]]
+        cols = grid.cols
+        end_r, end_c = divmod(end, cols)
+        diagonal = self.diagonal
+
+        def h(i):
+            r, c = divmod(i, cols)
+            dr, dc = abs(r - end_r), abs(c - end_c)
+            best = dr + dc
+            if diagonal:
+                best += DIAGONAL_EXTRA * min(dr, dc)
+            for dist, d_end in active:
+                d = dist[i]
+                if d >= 0:
+                    bound = d_end - d if d_end > d else d - d_end
+                    if bound > best:
+                        best = bound
+            return best
+
+        return h
+
+    def search(self, grid, listener=None, should_stop=None):
+        """A* с эвристикой ALT; интерфейс результата как у astar()"""
+        result = astar(
+            grid, listener, should_stop, self.diagonal, self.estimate(grid, grid.end)
+        )
+        if result is not None:
+            result.prep_bytes = self.nbytes
+        return result
+
+    # --- Файл таблиц ---
+    def save(self, file_path):
+        header = _HEADER.pack(
+            LANDMARKS_MAGIC,
+            LANDMARKS_VERSION,
+            self.rows,
+            self.cols,
+            self.walls_key,
+            self.diagonal,
+            PLACEMENTS.index(self.placement),
+            self.count,
+            len(self.tables),
+            len(self.landmarks),
+        )
+        with open(file_path, "wb") as f:
+            f.write(header)
+            f.write(_little(array("i", self.landmarks)).tobytes())
+            for dist in self.tables:
+                f.write(_little(dist).tobytes())
+
+    @classmethod
+    def load(cls, file_path):
+        with open(file_path, "rb") as f:
+            data = f.read()
+        if len(data) < _HEADER.size:
+            raise ValueError("Файл слишком короткий для таблиц ориентиров.")
+        (
+            magic,
+            version,
+            rows,
+            cols,
+            walls_key,
+            diagonal,
+            placement,
+            wanted,
+            count,
+            landmarks,
+        ) = _HEADER.unpack_from(data)
+        if magic != LANDMARKS_MAGIC or version != LANDMARKS_VERSION:
+            raise ValueError("Неизвестный формат таблиц ориентиров.")
+        size = rows * cols
+        typecode = "d" if diagonal else "i"
+        offset = _HEADER.size + 4 * landmarks
+        step = array(typecode).itemsize * size
+        if placement >= len(PLACEMENTS) or len(data) != offset + step * count:
+            raise ValueError("Таблицы ориентиров повреждены или обрезаны.")
+
+        table = cls(
+            rows, cols, walls_key, bool(diagonal), PLACEMENTS[placement], wanted
+        )
+        cells = array("i", data[_HEADER.size : offset])
+        table.landmarks = list(_little(cells))
+        for k in range(count):
+            dist = array(typecode, data[offset + k * step : offset + (k + 1) * step])
+            table.tables.append(_little(dist))
+        return table
+
+    @classmethod
+    def for_maze(
+        cls,
+        maze_path,
+        grid,
+        count=DEFAULT_LANDMARKS,
+        diagonal=False,
+        placement="farthest",
+    ):
+        """Таблицы из файла рядом с maze_path или, если он не подходит, новые.
+
+        Новые таблицы сохраняются рядом с лабиринтом; если записать файл
+        не удалось (например, каталог только для чтения), они остаются в
+        памяти. Возвращает (таблицы, источник): "file" - загружены из
+        файла, "saved" - построены и сохранены, "memory" - построены, но
+        не сохранены.
+        """
+        path = landmarks_path(maze_path)
+        walls_key = WallHash(grid).value
+        if os.path.exists(path):
+            try:
+                table = cls.load(path)
+            except (OSError, ValueError):
+                table = None
+            if (
+                table is not None
+                and table.matches(grid, walls_key, diagonal)
+                and (table.count, table.placement) == (count, placement)
+            ):
+                return table, "file"
+        table = cls.build(grid, count, diagonal, placement, walls_key)
+        try:
+            table.save(path)
+        except OSError:
+            return table, "memory"
+        return table, "saved"
+
+
+def landmarks_path(maze_path):
+    """Файл таблиц ориентиров для файла лабиринта: maze.txt -> maze.mzlm"""
+    return os.path.splitext(maze_path)[0] + LANDMARKS_SUFFIX
+
+
+def _areas(labels):
+    """Метка -> клетки для связных областей не меньше MIN_AREA клеток"""
+    groups = {}
+    for i, label in enumerate(labels):
+        if label >= 0:
+            groups.setdefault(label, []).append(i)
+    return {label: cells for label, cells in groups.items() if len(cells) >= MIN_AREA}
+
+
+def _border(grid, count, labels, areas):
+    """Метка области -> до count ее клеток на краю, равномерно по обходу"""
+    rows, cols = grid.rows, grid.cols
+    ring = (
+        [c for c in range(cols)]
+        + [r * cols + cols - 1 for r in range(1, rows)]
+        + [(rows - 1) * cols + c for c in range(cols - 2, -1, -1)]
+        + [r * cols for r in range(rows - 2, 0, -1)]
+    )
+    rings = {}
+    for i in dict.fromkeys(ring):
+        if labels[i] in areas:
+            rings.setdefault(labels[i], []).append(i)
+    for label, cells in rings.items():
+        m = min(count, len(cells))
+        rings[label] = [cells[k * len(cells) // m] for k in range(m)]
+    return rings
+
+
+def _little(values):
+    """array в порядке байтов little-endian (в нем хранятся таблицы в файле)"""
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+def alt(grid, listener=None, should_stop=None, diagonal=False, landmarks=None):
+    """A* с ориентирами с общим интерфейсом движков (см. maze.engines).
+
+    Без готовых таблиц landmarks они строятся заново (DEFAULT_LANDMARKS ориентиров,
+    расстановка farthest); время построения - в result.prep_time.
+    """
+    if landmarks is None or landmarks.diagonal != diagonal:
+        landmarks = LandmarkTable.build(grid, diagonal=diagonal)
+        prep_time = landmarks.build_time
+    else:
+        prep_time = 0.0
+    result = landmarks.search(grid, listener, should_stop)
+    if result is not None:
+        result.prep_time = prep_time
+    return result
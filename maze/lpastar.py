@@ -0,0 +1,205 @@
+"""Lifelong Planning A* (LPA*): инкрементальный пересчет пути при правке стен.
+
+Старт и финиш фиксированы, меняются только стены. Планировщик хранит
+g и rhs для всех клеток между запусками; после изменения стены
+пересчитываются только клетки, чьи оценки действительно поменялись,
+а не вся карта заново.
+"""
+
+import heapq
+import time
+from array import array
+
+from .astar import SQRT2, SearchResult, get_neighbors, heuristic
+from .grid import CLOSED, INF
+
+# Допуск при сравнении ключей (суммы диагональных шагов sqrt(2) неточны)
+KEY_EPS = 1e-9
+# Куча пересобирается из живых записей, когда устаревших в ней больше,
+# чем вдвое живых (маленькая куча не пересобирается)
+COMPACT_MIN = 1024
+
+
+class LPAStar:
+    """Планировщик LPA* поверх GridModel (собственные массивы g и rhs)"""
+
+    def __init__(self, grid, diagonal=False):
+        self.grid = grid
+        self.diagonal = diagonal
+        size = grid.size
+        self.g = array("d", [INF]) * size
+        self.rhs = array("d", [INF]) * size
+        # Очередь с ленивым удалением: актуальный ключ клетки хранится
+        # в key1/key2, queued[i] == 1 пока клетка в очереди, live - число
+        # таких клеток
+        self.heap = []
+        self.counter = 0
+        self.live = 0
+        self.key1 = array("d", [INF]) * size
+        self.key2 = array("d", [INF]) * size
+        self.queued = bytearray(size)
+
+        self.rhs[grid.start] = 0
+        self._push(grid.start)
+
+    # --- Очередь ---
+    def _key(self, i):
+        m = min(self.g[i], self.rhs[i])
+        return m + heuristic(self.grid, i, self.grid.end, self.diagonal), m
+
+    def _push(self, i):
+        k1, k2 = self._key(i)
+        self.key1[i] = k1
+        self.key2[i] = k2
+        self.queued[i] = 1
+        self.live += 1
+        self.counter += 1
+        heapq.heappush(self.heap, (k1, k2, self.counter, i))
+        if len(self.heap) > 2 * self.live + COMPACT_MIN:
+            self._compact()
+
+    def _compact(self):
+        """Оставляет в куче по одной актуальной записи на клетку в очереди"""
+        queued, key1, key2 = self.queued, self.key1, self.key2
+        seen = set()
+        heap = []
+        for entry in self.heap:
+            k1, k2, _, i = entry
+            if queued[i] and k1 == key1[i] and k2 == key2[i] and i not in seen:
+                seen.add(i)
+                heap.append(entry)
+        heapq.heapify(heap)
+        self.heap = heap
+
+    def _top_key(self):
+        heap = self.heap
+        while heap:
+            k1, k2, _, i = heap[0]
+            if self.queued[i] and k1 == self.key1[i] and k2 == self.key2[i]:
+                return k1, k2
+            heapq.heappop(heap)
+        return INF, INF
+
+    # --- LPA* ---
+    def _cost(self, a, b):
+        cols = self.grid.cols
+        return SQRT2 if a % cols != b % cols and a // cols != b // cols else 1
+
+    def _update_vertex(self, u):
+        grid = self.grid
+        if u != grid.start:
+            best = INF
+            if not grid.walls[u]:
+                g = self.g
+                for p in get_neighbors(grid, u, self.diagonal):
+                    cand = g[p] + self._cost(p, u)
+                    if cand < best:
+                        best = cand
+            self.rhs[u] = best
+        if self.queued[u]:
+            self.queued[u] = 0
+            self.live -= 1
+        if self.g[u] != self.rhs[u]:
+            self._push(u)
+
+    def update_cell(self, i):
+        """Сообщает планировщику, что стена в клетке i поставлена или убрана"""
+        self._update_vertex(i)
+        for j in self._around(i):
+            self._update_vertex(j)
+
+    def _around(self, i):
+        """Все соседи клетки по сетке (включая стены - их ребра тоже меняются)"""
+        grid = self.grid
+        r, c = divmod(i, grid.cols)
+        steps = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+        if self.diagonal:
+            steps += [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+        return [
+            grid.index(r + dr, c + dc)
+            for dr, dc in steps
+            if grid.in_bounds(r + dr, c + dc)
+        ]
+
+    def compute(self, listener=None, should_stop=None):
+        """ComputeShortestPath: доводит оценки до согласованного состояния.
+
+        Возвращает SearchResult с путем и числом пересчитанных клеток
+        (None, если поиск прерван через should_stop).
+        """
+        t0 = time.perf_counter()
+        grid = self.grid
+        end = grid.end
+        g, rhs = self.g, self.rhs
+        expanded = 0
+        pushes = self.counter
+
+        while True:
+            top = self._top_key()
+            if top[0] == INF:
+                break  # очередь пуста
+            # Клетки с ключом, равным ключу финиша (с точностью до ошибки
+            # округления sqrt(2)), тоже обрабатываем: иначе путь может
+            # пройти через устаревшее g
+            if top[0] > self._key(end)[0] + KEY_EPS and rhs[end] == g[end]:
+                break
+            if should_stop is not None and should_stop():
+                return None
+
+            u = heapq.heappop(self.heap)[3]
+            self.queued[u] = 0
+            self.live -= 1
+            expanded += 1
+            if listener is not None and not grid.is_endpoint(u):
+                listener(u, CLOSED)
+
+            if g[u] > rhs[u]:
+                # Клетка стала дешевле: фиксируем и обновляем соседей
+                g[u] = rhs[u]
+                for s in get_neighbors(grid, u, self.diagonal):
+                    self._update_vertex(s)
+            else:
+                # Клетка подорожала: сбрасываем и пересчитываем ее и соседей
+                g[u] = INF
+                self._update_vertex(u)
+                for s in get_neighbors(grid, u, self.diagonal):
+                    self._update_vertex(s)
+
+        t1 = time.perf_counter()
+        path = self.path()
+        cost = g[end] if path else None
+        t2 = time.perf_counter()
+        return SearchResult(
+            path,
+            expanded,
+            t2 - t0,
+            cost,
+            path_time=t2 - t1,
+            heap_stats={"pushes": self.counter - pushes},
+        )
+
+    def path(self):
+        """Путь от старта к финишу: от финиша идем к самому дешевому соседу"""
+        grid = self.grid
+        g = self.g
+        if g[grid.end] == INF:
+            return []
+        path = [grid.end]
+        curr = grid.end
+        while curr != grid.start:
+            best, best_cost = -1, INF
+            for p in get_neighbors(grid, curr, self.diagonal):
+                cand = g[p] + self._cost(p, curr)
+                if cand < best_cost:
+                    best, best_cost = p, cand
+            if best < 0 or len(path) > grid.size:
+                return []
+            path.append(best)
+            curr = best
+        path.reverse()
+        return path
+
+
+def lpa_star(grid, listener=None, should_stop=None, diagonal=False):
+    """Разовый запуск LPA* с общим интерфейсом движков (см. maze.engines)"""
+    return LPAStar(grid, diagonal).compute(listener, should_stop)
@@ -0,0 +1,77 @@
+"""Открытый список A*: двоичная куча кортежей с ленивым удалением."""
+
+import heapq
+
+from .grid import INF
+
+
+class OpenSet:
+    """Очередь с приоритетом на кортежах (f, h, counter, index).
+
+    Улучшение g-стоимости клетки - это просто новый push: старая запись
+    остается в куче и отбрасывается при извлечении, если клетка уже
+    закрыта. counter разрешает равенство (f, h) в порядке добавления,
+    поэтому сравнение никогда не доходит до индекса.
+    """
+
+    __slots__ = ("heap", "closed", "counter", "pops", "stale", "peak")
+
+    def __init__(self, size):
+        self.heap = []
+        self.closed = bytearray(size)
+        self.counter = 0  # заодно число всех push
+        self.pops = 0
+        self.stale = 0
+        self.peak = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __bool__(self):
+        return bool(self.heap)
+
+    @property
+    def pushes(self):
+        return self.counter
+
+    def push(self, f, h, index):
+        self.counter += 1
+        heapq.heappush(self.heap, (f, h, self.counter, index))
+        if len(self.heap) > self.peak:
+            self.peak = len(self.heap)
+
+    def pop(self):
+        """Извлекает и закрывает клетку с минимальным (f, h); -1 если пусто"""
+        heap = self.heap
+        closed = self.closed
+        while heap:
+            index = heapq.heappop(heap)[3]
+            self.pops += 1
+            if closed[index]:
+                self.stale += 1
+                continue
+            closed[index] = 1
+            return index
+        return -1
+
+    def min_f(self):
+        """Минимальное f среди живых записей (устаревшие вершины выбрасываются)"""
+        heap = self.heap
+        closed = self.closed
+        while heap and closed[heap[0][3]]:
+            heapq.heappop(heap)
+            self.pops += 1
+            self.stale += 1
+        return heap[0][0] if heap else INF
+
+    def is_closed(self, index):
+        return self.closed[index]
+
+    def stats(self):
+        """Счетчики кучи для SearchResult.heap_stats"""
+        return {
+            "pushes": self.counter,
+            "pops": self.pops,
+            "stale_pops": self.stale,
+            "peak_open": self.peak,
+        }
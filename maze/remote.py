@@ -0,0 +1,297 @@
+"""Поиск пути в отдельном процессе.
+
+RemoteSolver держит один дочерний процесс, который живет между
+запусками. Стены передаются через multiprocessing.shared_memory (одно
+копирование в общий блок на запуск, дочерний процесс читает их прямо из
+блока), события поиска возвращаются пачками по каналу Pipe, а отмена -
+общий multiprocessing.Event. Родитель забирает сообщения методом poll()
+без блокировки, поэтому поток GUI не делит GIL с поиском.
+"""
+
+import contextlib
+import multiprocessing as mp
+import time
+from array import array
+from multiprocessing import shared_memory
+
+from .engines import solve
+from .grid import GridModel
+from .hpa import HPAGraph
+from .landmarks import DEFAULT_LANDMARKS, LandmarkTable
+from .stats import profile_call
+
+# Событий в одной пачке и наибольшая пауза между пачками (с)
+CHUNK_EVENTS = 65536
+CHUNK_INTERVAL = 0.05
+# Флаг отмены проверяется раз в столько вызовов should_stop
+CANCEL_CHECK_EVERY = 1024
+
+
+class RemoteSolver:
+    """Дочерний процесс-решатель и общий блок памяти со стенами"""
+
+    def __init__(self):
+        ctx = mp.get_context("spawn")
+        self._cancel = ctx.Event()
+        self._conn, child_conn = ctx.Pipe()
+        self._process = ctx.Process(
+            target=_serve, args=(child_conn, self._cancel), daemon=True
+        )
+        self._process.start()
+        child_conn.close()
+        self._shm = None
+        self.busy = False
+
+    def submit(
+        self,
+        grid,
+        algorithm="astar",
+        diagonal=False,
+        record=True,
+        profile=False,
+        cluster_size=16,
+        walls_key=None,
+        landmarks=DEFAULT_LANDMARKS,
+        placement="farthest",
+    ):
+        """Запускает поиск от grid.start до grid.end (стены копируются в общий блок).
+
+        walls_key - хеш стен (WallHash.value): при совпадении дочерний
+        процесс использует кластеры HPA* и таблицы ориентиров ALT,
+        построенные прошлыми запусками.
+        """
+        if self.busy:
+            raise RuntimeError("Решатель уже занят")
+        if self._shm is None or self._shm.size < grid.size:
+            self._release_shm()
+            self._shm = shared_memory.SharedMemory(create=True, size=grid.size)
+        self._shm.buf[: grid.size] = grid.walls
+        self._cancel.clear()
+        self._conn.send(
+            (
+                "solve",
+                self._shm.name,
+                grid.rows,
+                grid.cols,
+                grid.start,
+                grid.end,
+                algorithm,
+                diagonal,
+                record,
+                profile,
+                cluster_size,
+                walls_key,
+                landmarks,
+                placement,
+            )
+        )
+        self.busy = True
+
+    @property
+    def alive(self):
+        return self._process.is_alive()
+
+    def cancel(self):
+        """Просит прервать текущий поиск; подтверждение придет сообщением"""
+        self._cancel.set()
+
+    def poll(self, timeout=0.0):
+        """Сообщения дочернего процесса, уже стоящие в канале.
+
+        ("events", байты индексов int32, байты состояний) - очередная
+        пачка событий; ("done", SearchResult, отчет профилировщика или
+        None); ("cancelled",); ("error", текст). timeout - сколько ждать
+        первого сообщения.
+        """
+        messages = []
+        while True:
+            try:
+                if not self._conn.poll(timeout):
+                    break
+                message = self._conn.recv()
+            except (EOFError, OSError):
+                message = ("error", "процесс решателя завершился")
+            messages.append(message)
+            if message[0] != "events":
+                self.busy = False
+                break
+            timeout = 0.0
+        return messages
+
+    def close(self, timeout=2.0):
+        """Останавливает дочерний процесс и освобождает общий блок.
+
+        Если процесс не вышел за timeout секунд (завис в поиске), он
+        завершается принудительно; после close() решатель не занят и не жив.
+        """
+        self._cancel.set()
+        try:
+            self._conn.send(("quit",))
+        except (BrokenPipeError, OSError):
+            pass
+        self._process.join(timeout=timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+        self._conn.close()
+        self._release_shm()
+        self.busy = False
+
+    def _release_shm(self):
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+
+# --- ДОЧЕРНИЙ ПРОЦЕСС ---
+class _EventStream:
+    """listener, отправляющий события родителю пачками"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.cells = array("i")
+        self.states = bytearray()
+        self.last_send = time.perf_counter()
+
+    def __call__(self, i, state):
+        self.cells.append(i)
+        self.states.append(state)
+        if len(self.cells) >= CHUNK_EVENTS:
+            self.flush()
+
+    def record_many(self, cells, states):
+        self.cells.frombytes(cells.tobytes())
+        self.states.extend(states.tobytes())
+        if len(self.cells) >= CHUNK_EVENTS:
+            self.flush()
+
+    def flush(self):
+        if self.cells:
+            self.conn.send(("events", self.cells.tobytes(), bytes(self.states)))
+            self.cells = array("i")
+            self.states = bytearray()
+        self.last_send = time.perf_counter()
+
+
+def _serve(conn, cancel):
+    """Цикл дочернего процесса: запросы solve до команды quit"""
+    hierarchy = None
+    hierarchy_key = None
+    landmarks = None
+    landmarks_key = None
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request[0] == "quit":
+            return
+        (
+            _,
+            shm_name,
+            rows,
+            cols,
+            start,
+            end,
+            algorithm,
+            diagonal,
+            record,
+            profile,
+            cluster_size,
+            walls_key,
+            landmark_count,
+            placement,
+        ) = request
+
+        shm = shared_memory.SharedMemory(name=shm_name)
+        walls = shm.buf[: rows * cols]
+        try:
+            grid = GridModel(rows, cols, divmod(start, cols), divmod(end, cols))
+            # Стены читаются прямо из общего блока, без копии
+            grid.walls = walls
+            stream = _EventStream(conn) if record else None
+            should_stop = _cancel_checker(cancel, stream)
+
+            if algorithm == "hpa":
+                key = (rows, cols, walls_key, cluster_size, diagonal)
+                if walls_key is None or key != hierarchy_key:
+                    hierarchy = HPAGraph(grid, cluster_size, diagonal)
+                    hierarchy_key = key
+                else:
+                    hierarchy.grid = grid
+                run, args = hierarchy.search, (stream, should_stop)
+            elif algorithm == "alt":
+                key = (rows, cols, walls_key, diagonal, landmark_count, placement)
+                prep_time = 0.0
+                if walls_key is None or key != landmarks_key:
+                    landmarks = LandmarkTable.build(
+                        grid, landmark_count, diagonal, placement, walls_key
+                    )
+                    landmarks_key = key
+                    prep_time = landmarks.build_time
+                run, args = landmarks.search, (grid, stream, should_stop)
+            else:
+                run, args = solve, (grid, algorithm, stream, should_stop, diagonal)
+
+            report = None
+            if profile:
+                result, report = profile_call(run, *args)
+            else:
+                result = run(*args)
+
+            if result is None:
+                conn.send(("cancelled",))
+                continue
+            if algorithm == "alt":
+                result.prep_time = prep_time
+            if stream is not None:
+                stream.flush()
+            conn.send(("done", result, report))
+        except Exception as e:  # ошибка поиска не должна убивать процесс
+            hierarchy_key = None
+            landmarks_key = None
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+        finally:
+            # Ссылки на буфер блока нужно отпустить до close(); кластеры
+            # HPA* остаются, сетку им подставит следующий запуск
+            grid = None
+            if hierarchy is not None:
+                hierarchy.grid = None
+            _close_block(shm, walls)
+
+
+def _close_block(shm, walls):
+    """Отпускает срез стен и закрывает блок, не подменяя исходную ошибку.
+
+    Пока жив производный от среза вид (массив NumPy, memoryview - например,
+    в кадрах трассировки летящего исключения), release() и close() бросают
+    BufferError. Тогда отображение закроется вместе с последним видом, а
+    сам блок удаляет родитель (unlink), так что он не теряется.
+    """
+    try:
+        with contextlib.suppress(BufferError):
+            walls.release()
+    finally:
+        with contextlib.suppress(BufferError):
+            shm.close()
+
+
+def _cancel_checker(cancel, stream):
+    """should_stop: проверяет Event не на каждом шаге и заодно отправляет
+    накопившиеся события, если давно не отправляли"""
+    calls = 0
+
+    def should_stop():
+        nonlocal calls
+        calls += 1
+        if calls % CANCEL_CHECK_EVERY:
+            return False
+        if (
+            stream is not None
+            and time.perf_counter() - stream.last_send >= CHUNK_INTERVAL
+        ):
+            stream.flush()
+        return cancel.is_set()
+
+    return should_stop
@@ -0,0 +1,111 @@
+"""Структурированная статистика запусков поиска и профилирование.
+
+SearchStats собирает в одном объекте то, что раньше было только в
+строке "Готово! Путь: N шагов": счетчики кучи и разбивку времени. Показ
+в GUI (replay_ms - применение событий трассы в TracePlayer, render_ms -
+перерисовка клеток, cells_repainted - сколько клеток перерисовано, при
+полной перерисовке - вся карта) заполняет окно, когда воспроизведение
+дошло до конца; в консоли эти поля нулевые. Его
+можно вывести кратко, сохранить в JSONL и сравнивать между запусками.
+"""
+
+import cProfile
+import io
+import json
+import pstats
+import time
+
+
+class SearchStats:
+    """Статистика одного запуска"""
+
+    FIELDS = (
+        "timestamp",
+        "algorithm",
+        "diagonal",
+        "rows",
+        "cols",
+        "found",
+        "length",
+        "cost",
+        "expanded",
+        "pushes",
+        "pops",
+        "stale_pops",
+        "peak_open",
+        "search_ms",
+        "path_ms",
+        "prep_ms",
+        "cells_repainted",
+        "replay_ms",
+        "render_ms",
+    )
+
+    def __init__(self, **values):
+        for name in self.FIELDS:
+            setattr(self, name, values.get(name, 0))
+
+    @classmethod
+    def from_result(cls, result, grid, algorithm, diagonal=False):
+        """Статистика по SearchResult (время UI заполняет вызывающий код)"""
+        heap = result.heap_stats
+        return cls(
+            timestamp=time.strftime("%Y-%m-%dT%H:%M:%S"),
+            algorithm=algorithm,
+            diagonal=bool(diagonal),
+            rows=grid.rows,
+            cols=grid.cols,
+            found=result.found,
+            length=result.length,
+            cost=round(result.cost, 6),
+            expanded=result.expanded,
+            pushes=heap.get("pushes", 0),
+            pops=heap.get("pops", 0),
+            stale_pops=heap.get("stale_pops", 0),
+            peak_open=heap.get("peak_open", 0),
+            search_ms=round((result.elapsed - result.path_time) * 1000, 3),
+            path_ms=round(result.path_time * 1000, 3),
+            prep_ms=round(result.prep_time * 1000, 3),
+        )
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def summary(self):
+        """Краткая строка для строки состояния"""
+        parts = [f"раскрыто {self.expanded}"]
+        if self.pushes:
+            heap = f"куча +{self.pushes}"
+            if self.pops:
+                heap += f"/-{self.pops} (устар. {self.stale_pops})"
+            if self.peak_open:
+                heap += f", пик {self.peak_open}"
+            parts.append(heap)
+        times = f"поиск {self.search_ms:.1f} мс, путь {self.path_ms:.1f} мс"
+        if self.prep_ms:
+            times += f", подготовка {self.prep_ms:.1f} мс"
+        parts.append(times)
+        if self.cells_repainted:
+            parts.append(f"перерисовано {self.cells_repainted} клеток")
+        if self.replay_ms or self.render_ms:
+            parts.append(
+                f"показ {self.replay_ms:.1f} мс, отрисовка {self.render_ms:.1f} мс"
+            )
+        return " | ".join(parts)
+
+    def append_to(self, log_path):
+        """Дописывает статистику строкой JSONL"""
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.to_dict(), ensure_ascii=False) + "\n")
+
+
+def profile_call(func, *args, limit=25, **kwargs):
+    """Выполняет func под cProfile.
+
+    Возвращает (результат, текстовый отчет по limit самых дорогих функций).
+    """
+    profiler = cProfile.Profile()
+    result = profiler.runcall(func, *args, **kwargs)
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(limit)
+    return result, out.getvalue()
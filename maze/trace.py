@@ -0,0 +1,209 @@
+"""Запись хода поиска и его воспроизведение.
+
+Поиск идет на полной скорости, а listener только дописывает события
+(индекс клетки, новое состояние) в SearchTrace. Показ - отдельная задача
+TracePlayer: он применяет события к массиву состояний с любой скоростью,
+вперед и назад, и сообщает, какие клетки нужно перерисовать.
+
+Двоичный файл трассы (.mztr): заголовок, стены по одному биту на клетку
+(как в .mazb), индексы клеток событий (int32) и байты состояний.
+"""
+
+import struct
+import sys
+import time
+from array import array
+
+from .fileio import _make_grid, pack_bits, unpack_bits
+from .grid import PATH
+
+TRACE_SUFFIX = ".mztr"
+TRACE_MAGIC = b"MZTR"
+TRACE_VERSION = 1
+# Сигнатура, версия, rows, cols, старт, финиш, число событий, начало пути
+_HEADER = struct.Struct("<4sB3xIIIIII")
+
+
+class SearchTrace:
+    """События одного поиска и карта, на которой он шел.
+
+    cells и states - параллельные массивы событий; события с номера
+    path_start и дальше - клетки найденного пути.
+    """
+
+    def __init__(self, rows, cols, walls, start, end):
+        self.rows = rows
+        self.cols = cols
+        self.walls = bytes(walls)
+        self.start = start
+        self.end = end
+        self.cells = array("i")
+        self.states = bytearray()
+        self.path_start = 0
+
+    @classmethod
+    def for_grid(cls, grid):
+        """Пустая трасса для текущей карты grid (стены копируются)"""
+        return cls(grid.rows, grid.cols, grid.walls, grid.start, grid.end)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def record(self, i, state):
+        """listener для движков из maze.engines"""
+        self.cells.append(i)
+        self.states.append(state)
+
+    # Трасса сама является listener (так движок найдет и record_many)
+    __call__ = record
+
+    def record_many(self, cells, states):
+        """Пачка событий: cells - массив int32, states - байты состояний"""
+        self.cells.frombytes(cells.tobytes())
+        self.states.extend(states.tobytes())
+
+    def add_path(self, path):
+        """Дописывает клетки пути (без старта и финиша) событиями PATH"""
+        self.path_start = len(self.cells)
+        cells = [i for i in path if i != self.start and i != self.end]
+        self.cells.extend(cells)
+        self.states.extend(bytes([PATH]) * len(cells))
+
+    def make_grid(self):
+        """GridModel с картой трассы (для просмотра сохраненной трассы)"""
+        return _make_grid(
+            self.rows, self.cols, self.start, self.end, bytearray(self.walls)
+        )
+
+    # --- Файл трассы ---
+    def save(self, file_path):
+        header = _HEADER.pack(
+            TRACE_MAGIC,
+            TRACE_VERSION,
+            self.rows,
+            self.cols,
+            self.start,
+            self.end,
+            len(self.cells),
+            self.path_start,
+        )
+        cells = self.cells
+        if sys.byteorder != "little":
+            # В файле индексы всегда little-endian
+            cells = array("i", cells)
+            cells.byteswap()
+        with open(file_path, "wb") as f:
+            f.write(header)
+            f.write(pack_bits(self.walls))
+            f.write(cells.tobytes())
+            f.write(self.states)
+
+    @classmethod
+    def load(cls, file_path):
+        with open(file_path, "rb") as f:
+            data = f.read()
+        if len(data) < _HEADER.size:
+            raise ValueError("Файл слишком короткий для трассы поиска.")
+        magic, version, rows, cols, start, end, count, path_start = _HEADER.unpack_from(
+            data
+        )
+        if magic != TRACE_MAGIC or version != TRACE_VERSION:
+            raise ValueError("Неизвестный формат трассы поиска.")
+        size = rows * cols
+        walls_end = _HEADER.size + (size + 7) // 8
+        cells_end = walls_end + 4 * count
+        if size == 0 or len(data) < cells_end + count or path_start > count:
+            raise ValueError("Трасса поиска повреждена или обрезана.")
+        if not (0 <= start < size and 0 <= end < size):
+            raise ValueError("Старт или финиш вне лабиринта.")
+
+        trace = cls(rows, cols, unpack_bits(data, _HEADER.size, size), start, end)
+        trace.cells.frombytes(data[walls_end:cells_end])
+        if sys.byteorder != "little":
+            trace.cells.byteswap()
+        trace.states = bytearray(data[cells_end : cells_end + count])
+        trace.path_start = path_start
+        if count and not 0 <= min(trace.cells) <= max(trace.cells) < size:
+            raise ValueError("Трасса поиска ссылается на клетки вне лабиринта.")
+        return trace
+
+
+class TracePlayer:
+    """Воспроизведение SearchTrace поверх массива состояний клеток.
+
+    pos - число примененных событий. При применении события прежнее
+    состояние клетки запоминается, поэтому перемотка назад - тот же
+    проход по событиям в обратном порядке, без повторного проигрывания
+    с начала. Скорость задается в событиях в секунду отдельно для хода
+    поиска и для пути; step() продвигает по прошедшему времени, так что
+    при медленной отрисовке лишние события просто попадают в один кадр.
+    Трасса может расти во время воспроизведения (события поиска в
+    отдельном процессе приходят пачками): новые события просто
+    становятся доступны следующим шагам. elapsed - суммарное время
+    применения событий (для SearchStats.replay_ms).
+    """
+
+    def __init__(self, trace, state, rate=3000.0, path_rate=200.0):
+        self.trace = trace
+        self.state = state
+        self.rate = rate
+        self.path_rate = path_rate
+        self.speed = 1.0
+        self.pos = 0
+        self.elapsed = 0.0
+        self._prev = bytearray(len(trace))
+        # Дробная часть события, не уместившаяся в прошлый кадр
+        self._carry = 0.0
+
+    def __len__(self):
+        return len(self.trace)
+
+    @property
+    def at_end(self):
+        return self.pos >= len(self.trace)
+
+    def seek(self, target):
+        """Переходит к позиции target; возвращает array индексов измененных клеток"""
+        t0 = time.perf_counter()
+        target = max(0, min(target, len(self.trace)))
+        cells = self.trace.cells
+        state = self.state
+        prev = self._prev
+        if len(prev) < len(self.trace):
+            prev.extend(bytes(len(self.trace) - len(prev)))
+        pos = self.pos
+        if target > pos:
+            states = self.trace.states
+            for k in range(pos, target):
+                i = cells[k]
+                prev[k] = state[i]
+                state[i] = states[k]
+        else:
+            for k in range(pos - 1, target - 1, -1):
+                state[cells[k]] = prev[k]
+        self._carry = 0.0
+        changed = cells[min(pos, target) : max(pos, target)]
+        self.pos = target
+        self.elapsed += time.perf_counter() - t0
+        return changed
+
+    def step(self, seconds):
+        """Продвигает воспроизведение на seconds секунд"""
+        budget = seconds * self.speed
+        pos = self.pos
+        path_start = self.trace.path_start
+        end = float(pos) + self._carry
+        if pos < path_start:
+            # Сначала ход поиска, остаток времени - на путь
+            need = (path_start - end) / self.rate
+            if budget < need:
+                return self._advance(end + budget * self.rate)
+            budget -= need
+            end = path_start
+        return self._advance(min(end + budget * self.path_rate, len(self.trace)))
+
+    def _advance(self, end):
+        target = int(end)
+        changed = self.seek(target)
+        self._carry = end - target
+        return changed
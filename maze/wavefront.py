@@ -0,0 +1,153 @@
+"""Волновой поиск в ширину на массивах NumPy.
+
+Все ребра 4-связной сетки имеют вес 1, поэтому кратчайший путь дает
+обход в ширину, а его можно вести целыми фронтами: за один шаг NumPy
+из всех клеток текущего кольца получаются соседи, отбрасываются стены
+и уже посещенные клетки, и оставшиеся становятся следующим кольцом.
+Цикл Python выполняется раз на кольцо, а не раз на клетку.
+
+Сетка хранится с рамкой из стен шириной в одну клетку, так что соседи
+получаются сдвигом индекса на +-1 и +-ширину без проверки границ. Путь
+восстанавливается по массиву расстояний от финиша к старту.
+"""
+
+import time
+
+from .astar import SearchResult, astar
+from .grid import CLOSED, OPEN
+
+try:
+    import numpy as np
+except ImportError:  # NumPy необязателен
+    np = None
+
+# Сколько событий копить перед передачей listener
+EMIT_BATCH = 4096
+
+
+def wavefront(grid, listener=None, should_stop=None, diagonal=False):
+    """Волновой BFS от grid.start до grid.end; интерфейс такой же, как у astar().
+
+    Новые клетки кольца сообщаются listener как открытые, раскрытое
+    кольцо - как закрытые. События передаются пачками: если у listener
+    есть record_many(cells, states), - одним вызовом на пачку. С диагоналями веса
+    ребер уже не равны, и без NumPy векторизовать нечем - в этих случаях
+    поиск выполняет обычный A*.
+    """
+    if diagonal or np is None:
+        return astar(grid, listener, should_stop, diagonal)
+
+    t0 = time.perf_counter()
+    if grid.start == grid.end:
+        return SearchResult([grid.start], 1, time.perf_counter() - t0)
+    rows, cols = grid.rows, grid.cols
+    width = cols + 2
+    start = grid.start + width + 1 + 2 * (grid.start // cols)
+    end = grid.end + width + 1 + 2 * (grid.end // cols)
+
+    # free - свободные и еще не посещенные клетки сетки с рамкой
+    free = np.zeros((rows + 2) * width, dtype=bool)
+    free.reshape(rows + 2, width)[1:-1, 1:-1] = (
+        np.frombuffer(grid.walls, dtype=np.uint8, count=grid.size).reshape(rows, cols)
+        == 0
+    )
+    dist = np.full(free.size, -1, dtype=np.int32)
+    # owner - номер клетки в кандидатах кольца, для удаления повторов за O(k)
+    owner = np.empty(free.size, dtype=np.int32)
+    offsets = np.array([1, -1, width, -width], dtype=np.int64)
+
+    emit = None if listener is None else _Emitter(listener, width, cols, start, end)
+    free[start] = False
+    dist[start] = 0
+    frontier = np.array([start], dtype=np.int64)
+    expanded = 0
+    d = 0
+    while frontier.size:
+        if should_stop is not None and should_stop():
+            return None
+        expanded += frontier.size
+        if emit is not None:
+            emit(frontier, CLOSED)
+
+        d += 1
+        ring = (frontier[:, None] + offsets).ravel()
+        ring = ring[free[ring]]
+        # Клетку могут найти несколько соседей: оставляем первое вхождение
+        order = np.arange(ring.size, dtype=np.int32)
+        owner[ring] = order
+        ring = ring[owner[ring] == order]
+        free[ring] = False
+        dist[ring] = d
+        if emit is not None:
+            emit(ring, OPEN)
+        if dist[end] >= 0:
+            expanded += 1
+            break
+        frontier = ring
+    if emit is not None:
+        emit.flush()
+
+    if dist[end] < 0:
+        return SearchResult([], expanded, time.perf_counter() - t0)
+
+    t1 = time.perf_counter()
+    path = _trace_back(memoryview(dist), start, end, width, cols)
+    t2 = time.perf_counter()
+    return SearchResult(path, expanded, t2 - t0, d, path_time=t2 - t1)
+
+
+class _Emitter:
+    """Копит кольца клеток для listener и отдает их пачками.
+
+    На узких фронтах (коридоры лабиринта) кольцо - одна-две клетки, и
+    пересчет индексов на каждое кольцо стоил бы дороже самого поиска.
+    """
+
+    def __init__(self, listener, width, cols, start, end):
+        self.listener = listener
+        self.record_many = getattr(listener, "record_many", None)
+        self.width, self.cols = width, cols
+        self.start, self.end = start, end
+        self.rings = []
+        self.states = []
+        self.pending = 0
+
+    def __call__(self, cells, state):
+        self.rings.append(cells)
+        self.states.append(state)
+        self.pending += cells.size
+        if self.pending >= EMIT_BATCH:
+            self.flush()
+
+    def flush(self):
+        if not self.rings:
+            return
+        cells = np.concatenate(self.rings)
+        states = np.repeat(
+            np.array(self.states, dtype=np.uint8), [r.size for r in self.rings]
+        )
+        self.rings, self.states, self.pending = [], [], 0
+        keep = (cells != self.start) & (cells != self.end)
+        cells, states = cells[keep], states[keep]
+        width = self.width
+        cells = ((cells // width - 1) * self.cols + cells % width - 1).astype(np.int32)
+        if self.record_many is not None:
+            self.record_many(cells, states)
+        else:
+            for i, state in zip(cells.tolist(), states.tolist()):
+                self.listener(i, state)
+
+
+def _trace_back(dist, start, end, width, cols):
+    """Путь от старта к финишу: из финиша каждый раз в соседа на 1 ближе"""
+    path = [end]
+    p = end
+    while p != start:
+        d = dist[p] - 1
+        for q in (p + 1, p - 1, p + width, p - width):
+            if dist[q] == d:
+                p = q
+                break
+        path.append(p)
+    path.reverse()
+    return [(p // width - 1) * cols + p % width - 1 for p in path]
@@ -0,0 +1,94 @@
+"""Общие настройки и эталоны тестов.
+
+Пакет maze и лабиринты берутся из корня репозитория. Эталон без
+диагоналей - длина пути BFS, с диагоналями - стоимость пути простой
+Дейкстры по тем же правилам соседства (без срезания углов).
+"""
+
+import heapq
+import math
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from maze import APPROXIMATE, GridModel, generate, read_maze, solve
+from maze.astar import SQRT2, get_neighbors
+from maze.bfs import bfs
+
+BUNDLED_MAZES = ("labirint.txt", "labirint_66x66.txt", "maze.txt")
+
+
+def load(name):
+    return read_maze(str(ROOT / name))
+
+
+def noise_grid(size, seed, density=0.3):
+    grid = GridModel(size, size)
+    generate(grid, "noise", seed, density)
+    return grid
+
+
+def editable(grid):
+    """Клетки, в которых можно ставить и убирать стены (кроме старта и финиша)"""
+    return [i for i in range(grid.size) if not grid.is_endpoint(i)]
+
+
+def step_cost(grid, a, b):
+    ar, ac = divmod(a, grid.cols)
+    br, bc = divmod(b, grid.cols)
+    return SQRT2 if ar != br and ac != bc else 1.0
+
+
+def reference_cost(grid, diagonal):
+    """Стоимость кратчайшего пути от старта к финишу (-1 - пути нет)"""
+    if not diagonal:
+        return bfs(grid).cost
+    dist = {grid.start: 0.0}
+    heap = [(0.0, grid.start)]
+    while heap:
+        d, i = heapq.heappop(heap)
+        if i == grid.end:
+            return d
+        if d > dist[i]:
+            continue
+        for j in get_neighbors(grid, i, True):
+            nd = d + step_cost(grid, i, j)
+            if nd < dist.get(j, math.inf) - 1e-12:
+                dist[j] = nd
+                heapq.heappush(heap, (nd, j))
+    return -1
+
+
+def check_path(grid, result, diagonal):
+    """Путь идет от старта к финишу по разрешенным ходам и стоит result.cost"""
+    path = result.path
+    assert path[0] == grid.start and path[-1] == grid.end
+    cost = 0.0
+    for a, b in zip(path, path[1:]):
+        assert b in get_neighbors(grid, a, diagonal)
+        cost += step_cost(grid, a, b)
+    assert math.isclose(cost, result.cost, rel_tol=1e-9)
+
+
+def check_engine(make_grid, algorithm, diagonal):
+    """Движок находит путь тогда же, когда эталон, и той же стоимости.
+
+    make_grid() каждый раз строит новую сетку: эталон и движок получают
+    по своей копии. Приближенные движки (APPROXIMATE) могут вернуть путь
+    дороже эталона, но не дешевле.
+    """
+    expected = reference_cost(make_grid(), diagonal)
+    grid = make_grid()
+    result = solve(grid, algorithm, diagonal=diagonal)
+
+    assert result.found == (expected >= 0)
+    if not result.found:
+        return
+    check_path(grid, result, diagonal)
+    if algorithm in APPROXIMATE:
+        assert result.cost >= expected - 1e-9
+    else:
+        assert math.isclose(result.cost, expected, rel_tol=1e-9)
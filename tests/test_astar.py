@@ -0,0 +1,65 @@
+"""Проверки A* и его открытого списка: путь против эталона, порядок
+извлечения из кучи и счетчики heap_stats."""
+
+import random
+
+import pytest
+from conftest import BUNDLED_MAZES, check_engine, load, noise_grid
+
+from maze import solve
+from maze.openset import OpenSet
+
+
+# --- Открытый список ---
+def test_open_set_pops_in_priority_order():
+    rng = random.Random(1)
+    open_set = OpenSet(200)
+    entries = []
+    for index in range(200):
+        f = rng.randint(0, 20)
+        h = rng.randint(0, f)
+        open_set.push(f, h, index)
+        entries.append((f, h, index))
+    order = [open_set.pop() for _ in range(200)]
+    # Равные (f, h) выходят в порядке добавления
+    assert order == [index for _, _, index in sorted(entries)]
+    assert open_set.pop() == -1
+
+
+def test_open_set_skips_stale_entries():
+    open_set = OpenSet(3)
+    open_set.push(9, 4, 0)
+    open_set.push(5, 1, 1)
+    open_set.push(3, 2, 0)  # улучшение g клетки 0 - новая запись
+    assert open_set.min_f() == 3
+    assert [open_set.pop(), open_set.pop(), open_set.pop()] == [0, 1, -1]
+    assert open_set.is_closed(0) and open_set.is_closed(1)
+    assert open_set.stats() == {
+        "pushes": 3,
+        "pops": 3,
+        "stale_pops": 1,
+        "peak_open": 3,
+    }
+
+
+@pytest.mark.parametrize("diagonal", [False, True], ids=["4", "8"])
+@pytest.mark.parametrize("maze_file", BUNDLED_MAZES)
+def test_astar_heap_stats(maze_file, diagonal):
+    result = solve(load(maze_file), "astar", diagonal=diagonal)
+    stats = result.heap_stats
+    assert stats["pops"] - stats["stale_pops"] == result.expanded
+    assert stats["pops"] <= stats["pushes"]
+    assert stats["peak_open"] <= stats["pushes"]
+
+
+# --- Движки против эталона ---
+@pytest.mark.parametrize("diagonal", [False, True], ids=["4", "8"])
+@pytest.mark.parametrize("maze_file", BUNDLED_MAZES)
+def test_astar_matches_reference(maze_file, diagonal):
+    check_engine(lambda: load(maze_file), "astar", diagonal)
+
+
+@pytest.mark.parametrize("diagonal", [False, True], ids=["4", "8"])
+@pytest.mark.parametrize("seed", range(5))
+def test_astar_on_noise(seed, diagonal):
+    check_engine(lambda: noise_grid(40, seed), "astar", diagonal)
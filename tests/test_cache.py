@@ -0,0 +1,62 @@
+"""Проверки кэша путей: хеш стен после правок против пересчета и
+вытеснение из LRU по числу записей и суммарной длине путей."""
+
+import random
+
+import pytest
+from conftest import editable, load, noise_grid
+
+from maze import PathCache, SearchResult, WallHash, solve
+
+
+def test_wall_hash_matches_rebuild():
+    grid = noise_grid(30, 4)
+    wall_hash = WallHash(grid)
+    rng = random.Random(17)
+    cells = editable(grid)
+    for _ in range(200):
+        i = rng.choice(cells)
+        grid.set_wall(i, not grid.walls[i])
+        wall_hash.toggle(i)
+        assert wall_hash.value == WallHash(grid).value
+
+
+def test_wall_hash_without_numpy(monkeypatch):
+    pytest.importorskip("numpy")
+    import maze.cache
+
+    grid = noise_grid(50, 5)
+    fast = WallHash(grid).value
+    monkeypatch.setattr(maze.cache, "np", None)
+    assert fast == WallHash(grid).value
+
+
+def test_path_cache_key_follows_walls():
+    grid = load("maze.txt")
+    wall_hash = WallHash(grid)
+    cache = PathCache()
+    key = PathCache.make_key(grid, wall_hash, "astar", False)
+    cache.put(key, solve(grid, "astar"))
+    assert cache.get(PathCache.make_key(grid, wall_hash, "astar", False)) is not None
+    assert cache.get(PathCache.make_key(grid, wall_hash, "astar", True)) is None
+
+    i = next(i for i in editable(grid) if not grid.walls[i])
+    grid.set_wall(i, True)
+    wall_hash.toggle(i)
+    assert cache.get(PathCache.make_key(grid, wall_hash, "astar", False)) is None
+    grid.set_wall(i, False)
+    wall_hash.toggle(i)
+    assert cache.get(PathCache.make_key(grid, wall_hash, "astar", False)) is not None
+
+
+def test_path_cache_evicts_least_recently_used():
+    cache = PathCache(max_entries=3, max_cells=10)
+    for key in "abc":
+        cache.put(key, SearchResult([0, 1], 2, 0.0))
+    cache.get("a")
+    cache.put("d", SearchResult([0, 1], 2, 0.0))
+    assert cache.get("b") is None and cache.get("a") is not None
+    cache.put("e", SearchResult(list(range(6)), 6, 0.0))
+    assert cache.cells == 10 and len(cache) == 3
+    assert cache.get("c") is None
+    assert cache.stats()["evictions"] == 2
@@ -0,0 +1,53 @@
+"""Проверки разметки связных областей: инкрементальные правки против
+полной переразметки и разметка с NumPy против обхода в глубину."""
+
+import random
+
+import pytest
+from conftest import editable, noise_grid, reference_cost
+
+from maze import ComponentIndex, solve
+
+
+def _partition(index, grid):
+    """Области свободных клеток в виде, не зависящем от номеров меток"""
+    names = {}
+    return [
+        names.setdefault(index.component(i), len(names)) if not grid.walls[i] else -1
+        for i in range(grid.size)
+    ]
+
+
+def test_component_index_matches_rebuild():
+    grid = noise_grid(24, 1, 0.35)
+    index = ComponentIndex(grid)
+    rng = random.Random(7)
+    cells = editable(grid)
+    for step in range(300):
+        i = rng.choice(cells)
+        grid.set_wall(i, not grid.walls[i])
+        index.on_wall_changed(i)
+        if step % 10 == 0:
+            assert _partition(index, grid) == _partition(ComponentIndex(grid), grid)
+    assert _partition(index, grid) == _partition(ComponentIndex(grid), grid)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_component_labels_without_numpy(seed, monkeypatch):
+    pytest.importorskip("numpy")
+    import maze.components
+
+    grid = noise_grid(30, seed, 0.45)
+    fast = _partition(ComponentIndex(grid), grid)
+    monkeypatch.setattr(maze.components, "np", None)
+    assert fast == _partition(ComponentIndex(grid), grid)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_unreachable_answer_skips_search(seed):
+    grid = noise_grid(30, seed, 0.35)
+    index = ComponentIndex(grid)
+    result = solve(grid, "astar", components=index)
+    assert result.found == (reference_cost(grid, False) >= 0)
+    if not result.found:
+        assert result.expanded == 0
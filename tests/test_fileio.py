@@ -0,0 +1,60 @@
+"""Проверки форматов лабиринта: текст и .mazb туда и обратно, метаданные
+генератора и ошибки разбора текста."""
+
+import pytest
+from conftest import BUNDLED_MAZES, load, noise_grid
+
+from maze import read_maze, write_maze
+
+
+def _same(a, b):
+    return (a.rows, a.cols, a.start, a.end, bytes(a.walls), a.meta) == (
+        b.rows,
+        b.cols,
+        b.start,
+        b.end,
+        bytes(b.walls),
+        b.meta,
+    )
+
+
+@pytest.mark.parametrize("suffix", [".txt", ".mazb"])
+@pytest.mark.parametrize("maze_file", BUNDLED_MAZES)
+def test_round_trip(tmp_path, maze_file, suffix):
+    grid = load(maze_file)
+    path = str(tmp_path / f"maze{suffix}")
+    write_maze(grid, path)
+    assert _same(read_maze(path), grid)
+
+
+@pytest.mark.parametrize("suffix", [".txt", ".mazb"])
+def test_generator_meta_round_trip(tmp_path, suffix):
+    grid = noise_grid(33, 4, 0.25)
+    assert grid.meta
+    path = str(tmp_path / f"noise{suffix}")
+    write_maze(grid, path)
+    assert _same(read_maze(path), grid)
+
+
+def test_text_rejects_start_on_end(tmp_path):
+    grid = load("maze.txt")
+    grid.set_endpoints(grid.start, grid.start)
+    path = tmp_path / "same.txt"
+    with pytest.raises(ValueError):
+        write_maze(grid, str(path))
+    assert not path.exists()
+    # В .mazb старт и финиш хранятся индексами - там это допустимо
+    write_maze(grid, str(tmp_path / "same.mazb"))
+    assert _same(read_maze(str(tmp_path / "same.mazb")), grid)
+
+
+def test_text_comment_only_before_map(tmp_path):
+    path = tmp_path / "meta.txt"
+    path.write_text("; generator=noise seed=3\n\nS..\n.#.\n..E\n")
+    grid = read_maze(str(path))
+    assert grid.meta == {"generator": "noise", "seed": 3}
+    assert (grid.rows, grid.cols, grid.end) == (3, 3, 8)
+
+    path.write_text("S..\n; seed=3\n.#.\n..E\n")
+    with pytest.raises(ValueError):
+        read_maze(str(path))
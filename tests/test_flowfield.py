@@ -0,0 +1,41 @@
+"""Проверки поля расстояний до цели: пути от любых стартов против эталона
+и инкрементальные правки стен против пересчета."""
+
+import math
+import random
+
+import pytest
+from conftest import check_path, editable, load, noise_grid, reference_cost
+
+from maze import DistanceField
+
+
+@pytest.mark.parametrize("diagonal", [False, True], ids=["4", "8"])
+def test_distance_field_paths_from_many_starts(diagonal):
+    grid = load("labirint_66x66.txt")
+    field = DistanceField(grid, diagonal)
+    rng = random.Random(29)
+    free = [i for i in range(grid.size) if not grid.walls[i]]
+    for start in rng.sample(free, 20):
+        grid.set_endpoints(start, grid.end)
+        result = field.search()
+        expected = reference_cost(grid, diagonal)
+        assert result.found == (expected >= 0)
+        if result.found:
+            check_path(grid, result, diagonal)
+            assert math.isclose(result.cost, expected, rel_tol=1e-9)
+
+
+@pytest.mark.parametrize("diagonal", [False, True], ids=["4", "8"])
+def test_distance_field_matches_rebuild(diagonal):
+    grid = noise_grid(20, 3)
+    field = DistanceField(grid, diagonal)
+    rng = random.Random(13)
+    cells = editable(grid)
+    for _ in range(60):
+        i = rng.choice(cells)
+        grid.set_wall(i, not grid.walls[i])
+        field.on_wall_changed(i)
+        fresh = DistanceField(grid, diagonal).dist
+        for a, b in zip(field.dist, fresh):
+            assert (a < 0 and b < 0) or math.isclose(a, b, rel_tol=1e-9)
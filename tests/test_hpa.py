@@ -0,0 +1,49 @@
+"""Проверки HPA*: путь допустим и не короче эталона (движок приближенный),
+в том числе после правок стен с переразметкой кластеров."""
+
+import random
+
+import pytest
+from conftest import (
+    BUNDLED_MAZES,
+    check_engine,
+    check_path,
+    editable,
+    load,
+    noise_grid,
+    reference_cost,
+)
+
+from maze import HPAGraph
+
+
+@pytest.mark.parametrize("diagonal", [False, True], ids=["4", "8"])
+@pytest.mark.parametrize("maze_file", BUNDLED_MAZES)
+def test_hpa_matches_reference(maze_file, diagonal):
+    check_engine(lambda: load(maze_file), "hpa", diagonal)
+
+
+@pytest.mark.parametrize("diagonal", [False, True], ids=["4", "8"])
+@pytest.mark.parametrize("seed", range(5))
+def test_hpa_on_noise(seed, diagonal):
+    check_engine(lambda: noise_grid(40, seed), "hpa", diagonal)
+
+
+@pytest.mark.parametrize("diagonal", [False, True], ids=["4", "8"])
+def test_hpa_graph_after_wall_edits(diagonal):
+    grid = noise_grid(48, 6, 0.25)
+    graph = HPAGraph(grid, cluster_size=8, diagonal=diagonal)
+    graph.search()
+    rng = random.Random(23)
+    cells = editable(grid)
+    for _ in range(40):
+        i = rng.choice(cells)
+        grid.set_wall(i, not grid.walls[i])
+        graph.on_wall_changed(i)
+        grid.reset_search()
+        result = graph.search()
+        expected = reference_cost(grid, diagonal)
+        assert result.found == (expected >= 0)
+        if result.found:
+            check_path(grid, result, diagonal)
+            assert result.cost >= expected - 1e-9
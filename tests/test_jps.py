@@ -0,0 +1,16 @@
+"""Проверки Jump Point Search против эталона на 4- и 8-связной сетке."""
+
+import pytest
+from conftest import BUNDLED_MAZES, check_engine, load, noise_grid
+
+
+@pytest.mark.parametrize("diagonal", [False, True], ids=["4", "8"])
+@pytest.mark.parametrize("maze_file", BUNDLED_MAZES)
+def test_jps_matches_reference(maze_file, diagonal):
+    check_engine(lambda: load(maze_file), "jps", diagonal)
+
+
+@pytest.mark.parametrize("diagonal", [False, True], ids=["4", "8"])
+@pytest.mark.parametrize("seed", range(5))
+def test_jps_on_noise(seed, diagonal):
+    check_engine(lambda: noise_grid(40, seed), "jps", diagonal)
@@ -0,0 +1,88 @@
+"""Проверки ALT: движок против эталона, ориентиры в каждой связной
+области карты и файл таблиц."""
+
+import pytest
+from conftest import BUNDLED_MAZES, check_engine, load, noise_grid
+
+from maze import GridModel, LandmarkTable, generate, write_maze
+from maze.batch import solve_batch
+
+SIDE = 41
+
+
+def _two_regions(seed):
+    """Два лабиринта SIDE x SIDE рядом, разделенные сплошной стеной"""
+    grid = GridModel(SIDE, 2 * SIDE + 1)
+    for n in range(2):
+        part = GridModel(SIDE, SIDE)
+        generate(part, "backtracker", seed + n)
+        offset = n * (SIDE + 1)
+        for r in range(SIDE):
+            row = part.walls[r * SIDE : (r + 1) * SIDE]
+            grid.walls[r * grid.cols + offset : r * grid.cols + offset + SIDE] = row
+    for r in range(SIDE):
+        grid.walls[r * grid.cols + SIDE] = 1
+    grid.set_endpoints(0, grid.index(SIDE - 1, SIDE - 1))
+    return grid
+
+
+def _corners(grid):
+    """Запросы из угла в угол в каждой из двух областей"""
+    queries = []
+    for offset in (0, SIDE + 1):
+        for start, end in (
+            ((0, 0), (SIDE - 1, SIDE - 1)),
+            ((SIDE - 1, 0), (0, SIDE - 1)),
+        ):
+            queries.append(
+                {
+                    "start": [start[0], start[1] + offset],
+                    "end": [end[0], end[1] + offset],
+                }
+            )
+    return queries
+
+
+@pytest.mark.parametrize("diagonal", [False, True], ids=["4", "8"])
+def test_batch_alt_beats_astar_in_every_region(tmp_path, diagonal):
+    grid = _two_regions(3)
+    maze_path = str(tmp_path / "two.txt")
+    write_maze(grid, maze_path)
+    queries = _corners(grid)
+
+    astar = list(solve_batch(maze_path, queries, "astar", diagonal, workers=1))
+    alt = list(solve_batch(maze_path, queries, "alt", diagonal, workers=1))
+    for plain, fast in zip(astar, alt):
+        assert fast["found"] and fast["cost"] == plain["cost"]
+        assert fast["expanded"] < plain["expanded"]
+
+
+def test_landmarks_placed_in_every_region():
+    grid = _two_regions(5)
+    for placement in ("farthest", "border"):
+        table = LandmarkTable.build(grid, 4, placement=placement)
+        left = [i for i in table.landmarks if i % grid.cols < SIDE]
+        assert len(left) == 4 and len(table.landmarks) == 8
+
+
+def test_landmark_file_round_trip(tmp_path):
+    grid = _two_regions(7)
+    table = LandmarkTable.build(grid, 3, diagonal=True)
+    path = str(tmp_path / "two.mzlm")
+    table.save(path)
+    loaded = LandmarkTable.load(path)
+    assert loaded.landmarks == table.landmarks
+    assert loaded.tables == table.tables
+    assert loaded.matches(grid, table.walls_key, True)
+
+
+@pytest.mark.parametrize("diagonal", [False, True], ids=["4", "8"])
+@pytest.mark.parametrize("maze_file", BUNDLED_MAZES)
+def test_alt_matches_reference(maze_file, diagonal):
+    check_engine(lambda: load(maze_file), "alt", diagonal)
+
+
+@pytest.mark.parametrize("diagonal", [False, True], ids=["4", "8"])
+@pytest.mark.parametrize("seed", range(5))
+def test_alt_on_noise(seed, diagonal):
+    check_engine(lambda: noise_grid(40, seed), "alt", diagonal)
@@ -0,0 +1,102 @@
+"""Проверки LPA*: движок против эталона и перепланирование после правок
+стен против пересчета."""
+
+import math
+import random
+
+import pytest
+from conftest import (
+    BUNDLED_MAZES,
+    check_engine,
+    check_path,
+    editable,
+    load,
+    noise_grid,
+    reference_cost,
+)
+
+from maze import LPAStar
+
+
+@pytest.mark.parametrize("diagonal", [False, True], ids=["4", "8"])
+@pytest.mark.parametrize("maze_file", BUNDLED_MAZES)
+def test_lpa_matches_reference(maze_file, diagonal):
+    check_engine(lambda: load(maze_file), "lpa", diagonal)
+
+
+@pytest.mark.parametrize("diagonal", [False, True], ids=["4", "8"])
+@pytest.mark.parametrize("seed", range(5))
+def test_lpa_on_noise(seed, diagonal):
+    check_engine(lambda: noise_grid(40, seed), "lpa", diagonal)
+
+
+@pytest.mark.parametrize("diagonal", [False, True], ids=["4", "8"])
+def test_lpa_matches_rebuild(diagonal):
+    grid = noise_grid(20, 2)
+    planner = LPAStar(grid, diagonal)
+    planner.compute()
+    rng = random.Random(11)
+    cells = editable(grid)
+    for _ in range(60):
+        i = rng.choice(cells)
+        grid.set_wall(i, not grid.walls[i])
+        planner.update_cell(i)
+        result = planner.compute()
+        expected = reference_cost(grid, diagonal)
+        assert result.found == (expected >= 0)
+        if result.found:
+            check_path(grid, result, diagonal)
+            assert math.isclose(result.cost, expected, rel_tol=1e-9)
+
+
+@pytest.mark.parametrize("diagonal", [False, True], ids=["4", "8"])
+def test_lpa_heap_compaction(diagonal, monkeypatch):
+    import maze.lpastar
+
+    monkeypatch.setattr(maze.lpastar, "COMPACT_MIN", 8)
+    sizes = []
+    compact = LPAStar._compact
+
+    def checked_compact(planner):
+        compact(planner)
+        # После пересборки - ровно одна запись на клетку в очереди
+        sizes.append(len(planner.heap))
+        assert len(planner.heap) == planner.live == sum(planner.queued)
+
+    monkeypatch.setattr(LPAStar, "_compact", checked_compact)
+    grid = noise_grid(24, 8, 0.25)
+    planner = LPAStar(grid, diagonal)
+    planner.compute()
+    rng = random.Random(31)
+    cells = editable(grid)
+    for _ in range(80):
+        i = rng.choice(cells)
+        grid.set_wall(i, not grid.walls[i])
+        planner.update_cell(i)
+        result = planner.compute()
+        assert planner.live == sum(planner.queued)
+        expected = reference_cost(grid, diagonal)
+        assert result.found == (expected >= 0)
+        if result.found:
+            assert math.isclose(result.cost, expected, rel_tol=1e-9)
+    assert sizes
+
+
+def test_lpa_finds_path_once_a_passage_opens():
+    grid = noise_grid(20, 9, 0.2)
+    row = grid.rows // 2
+    wall = [grid.index(row, c) for c in range(grid.cols)]
+    for i in wall:
+        grid.set_wall(i, True)
+    grid.set_endpoints(grid.index(0, 0), grid.index(grid.rows - 1, grid.cols - 1))
+    planner = LPAStar(grid)
+    assert not planner.compute().found
+
+    grid.set_wall(wall[3], False)
+    planner.update_cell(wall[3])
+    result = planner.compute()
+    expected = reference_cost(grid, False)
+    assert result.found == (expected >= 0)
+    if result.found:
+        check_path(grid, result, False)
+        assert result.cost == expected
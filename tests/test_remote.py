@@ -0,0 +1,45 @@
+"""Проверки решателя в отдельном процессе: закрытие общего блока и поиск
+в дочернем процессе против эталона."""
+
+import math
+import time
+from multiprocessing import shared_memory
+
+import pytest
+from conftest import load, reference_cost
+
+from maze.remote import RemoteSolver, _close_block
+
+
+def test_close_block_with_live_view():
+    np = pytest.importorskip("numpy")
+    shm = shared_memory.SharedMemory(create=True, size=64)
+    try:
+        walls = shm.buf[:16]
+        view = np.frombuffer(walls, dtype=np.uint8)
+        # Живой вид не дает отпустить буфер - ошибка не должна вылететь
+        _close_block(shm, walls)
+        del view
+        _close_block(shm, walls)
+        assert shm.buf is None
+    finally:
+        shm.unlink()
+
+
+@pytest.mark.parametrize("algorithm", ["astar", "alt"])
+def test_remote_solver_matches_reference(algorithm):
+    grid = load("labirint_66x66.txt")
+    expected = reference_cost(load("labirint_66x66.txt"), False)
+    solver = RemoteSolver()
+    try:
+        solver.submit(grid, algorithm, record=True)
+        events, deadline = 0, time.monotonic() + 60
+        message = None
+        while solver.busy and time.monotonic() < deadline:
+            for message in solver.poll(0.1):
+                if message[0] == "events":
+                    events += len(message[2])
+        assert message[0] == "done"
+        assert math.isclose(message[1].cost, expected) and events > 0
+    finally:
+        solver.close()
@@ -0,0 +1,66 @@
+"""Проверки сброса поиска по номерам поколений: поиск после сброса как
+на новой сетке, переполнение счетчика поколений и восстановление только
+затронутых клеток."""
+
+import math
+import random
+
+import pytest
+from conftest import load, reference_cost
+
+from maze import solve
+from maze.grid import END, MAX_GENERATION, START
+
+
+def _endpoint_pairs(grid, count, seed):
+    rng = random.Random(seed)
+    free = [i for i in range(grid.size) if not grid.walls[i]]
+    return [(rng.choice(free), rng.choice(free)) for _ in range(count)]
+
+
+@pytest.mark.parametrize("algorithm", ["astar", "jps", "bidirectional", "alt"])
+def test_stamped_reset_matches_fresh_grid(algorithm):
+    grid = load("labirint_66x66.txt")
+    for start, end in _endpoint_pairs(grid, 15, 19):
+        grid.set_endpoints(start, end)
+        grid.reset_search()
+        result = solve(grid, algorithm)
+
+        fresh = load("labirint_66x66.txt")
+        fresh.set_endpoints(start, end)
+        assert math.isclose(result.cost, reference_cost(fresh, False))
+
+
+def test_generation_wraparound():
+    grid = load("maze.txt")
+    expected = reference_cost(load("maze.txt"), True)
+    grid.generation = MAX_GENERATION - 2
+    for _ in range(5):
+        grid.reset_search()
+        result = solve(grid, "astar", diagonal=True)
+        assert math.isclose(result.cost, expected, rel_tol=1e-9)
+    assert grid.generation < MAX_GENERATION
+
+
+@pytest.mark.parametrize("limit", [None, 10], ids=["all", "few"])
+def test_reset_restores_touched_cells(limit):
+    grid = load("labirint_66x66.txt")
+    shown = []
+
+    def listener(i, state):
+        if limit is None or len(shown) < limit:
+            grid.state[i] = state
+            shown.append(i)
+
+    solve(grid, "astar", listener)
+    grid.touch(shown)
+    restored = grid.reset_search()
+
+    expected = bytearray(grid.walls)
+    expected[grid.start] = START
+    expected[grid.end] = END
+    assert grid.state == expected
+    if len(shown) > grid.size // 8:
+        assert restored is None
+    else:
+        assert set(restored) == set(shown)
@@ -0,0 +1,24 @@
+"""Проверки волнового BFS на NumPy против эталона на 4- и 8-связной сетке
+(с диагоналями и без NumPy движок переходит на A*)."""
+
+import pytest
+from conftest import BUNDLED_MAZES, check_engine, load, noise_grid
+
+
+@pytest.mark.parametrize("diagonal", [False, True], ids=["4", "8"])
+@pytest.mark.parametrize("maze_file", BUNDLED_MAZES)
+def test_wavefront_matches_reference(maze_file, diagonal):
+    check_engine(lambda: load(maze_file), "wavefront", diagonal)
+
+
+@pytest.mark.parametrize("diagonal", [False, True], ids=["4", "8"])
+@pytest.mark.parametrize("seed", range(5))
+def test_wavefront_on_noise(seed, diagonal):
+    check_engine(lambda: noise_grid(40, seed), "wavefront", diagonal)
+
+
+def test_wavefront_without_numpy(monkeypatch):
+    import maze.wavefront
+
+    monkeypatch.setattr(maze.wavefront, "np", None)
+    check_engine(lambda: load("labirint_66x66.txt"), "wavefront", False)